@@ -0,0 +1,105 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse, HttpResponseNotAllowed
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+from core.api.renderers import ORJSONRenderer
+
+
+def _check_permissions(request, permission_classes):
+    for permission_class in permission_classes:
+        permission = permission_class()
+        if not permission.has_permission(request, None):
+            if request.authenticators and not request.successful_authenticator:
+                raise exceptions.NotAuthenticated()
+            raise exceptions.PermissionDenied(
+                detail=getattr(permission, 'message', None)
+            )
+
+
+def _handle_exception(request, exc):
+    """
+    Same status codes and payloads as ``APIView.handle_exception``.
+    """
+    headers = {}
+    if isinstance(
+        exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+    ):
+        authenticate_header = (
+            request.authenticators[0].authenticate_header(request)
+            if request.authenticators else None
+        )
+        if authenticate_header:
+            headers['WWW-Authenticate'] = authenticate_header
+        else:
+            exc.status_code = 403
+    response = exception_handler(exc, {'request': request})
+    if response is None:
+        raise exc
+    headers.update(
+        (header, value) for header, value in response.items()
+        if header.lower() != 'content-type'
+    )
+    return response.data, response.status_code, headers
+
+
+def async_api_view(methods, permission_classes):
+    """
+    Turns ``handler(request)`` into an async Django view for the ASGI stack.
+
+    ``handler`` is a plain function that gets an authenticated DRF request
+    and returns ``(data, status_code)``. Authentication, permission checks,
+    the handler and rendering run in one hop to a worker thread that is not
+    tied to the event loop, so the loop keeps serving other requests while
+    this one waits on the database.
+    """
+    def decorator(handler):
+
+        def process(django_request):
+            close_old_connections()
+            request = Request(
+                django_request,
+                parsers=[
+                    parser() for parser in api_settings.DEFAULT_PARSER_CLASSES
+                ],
+                authenticators=[
+                    authentication() for authentication
+                    in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+                ]
+            )
+            try:
+                _check_permissions(request, permission_classes)
+                data, status_code = handler(request)
+                headers = {}
+            except exceptions.APIException as exc:
+                data, status_code, headers = _handle_exception(request, exc)
+            finally:
+                close_old_connections()
+            return ORJSONRenderer().render(data), status_code, headers
+
+        process_in_thread = sync_to_async(process, thread_sensitive=False)
+
+        async def view(django_request, *args, **kwargs):
+            if django_request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            content, status_code, headers = await process_in_thread(
+                django_request
+            )
+            response = HttpResponse(
+                content,
+                status=status_code,
+                content_type='application/json'
+            )
+            for header, value in headers.items():
+                response[header] = value
+            return response
+
+        # Like APIView, leave CSRF to SessionAuthentication.
+        view.csrf_exempt = True
+        view.__name__ = handler.__name__
+        view.__doc__ = handler.__doc__
+        return view
+
+    return decorator
@@ -0,0 +1,87 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from core.api.response_cache import get_scope_changed_at, get_scope_version
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Answers ``If-None-Match`` and ``If-Modified-Since`` of ``list`` and
+    ``retrieve`` with ``304 Not Modified`` before anything is serialized,
+    and sends ``ETag`` and ``Last-Modified`` with the other responses.
+
+    A list is validated by ``MAX(modified_date)`` and ``COUNT(*)`` of the
+    filtered queryset, an object by its ``modified_date``. Counters and
+    nested relations change without touching ``modified_date``, so the
+    versions of ``validator_scopes`` (see ``invalidate_cached_responses``)
+    are part of the validators too.
+    """
+    validator_scopes = []
+
+    def get_validator_queryset(self):
+        """
+        The rows a list renders. Views whose queryset carries costly
+        annotations can return a plain one here.
+        """
+        return self.filter_queryset(self.get_queryset())
+
+    def get_list_validators(self):
+        """
+        Returns the validators of the list and its last modification
+        time, or ``None`` when only the scope versions tell.
+        """
+        validators = self.get_validator_queryset().order_by().aggregate(
+            last_modified=Max('modified_date'), count=Count('pk')
+        )
+        return [validators['count']], validators['last_modified']
+
+    def list(self, request, *args, **kwargs):
+        validators, last_modified = self.get_list_validators()
+        return self.conditional_response(
+            request,
+            validators,
+            last_modified,
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(
+            request,
+            [instance.pk],
+            instance.modified_date,
+            lambda: Response(self.get_serializer(instance).data)
+        )
+
+    def conditional_response(self, request, validators, last_modified,
+                             get_response):
+        last_modified = max(
+            [last_modified.timestamp() if last_modified else 0] + [
+                get_scope_changed_at(scope)
+                for scope in self.validator_scopes
+            ]
+        )
+        etag = quote_etag(hashlib.sha256('|'.join(map(str, [
+            request.user.pk,
+            request.accepted_renderer.format,
+            request.get_full_path(),
+            last_modified,
+            *validators,
+            *(get_scope_version(scope) for scope in self.validator_scopes),
+        ])).encode()).hexdigest())
+        last_modified = int(last_modified)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = get_response()
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
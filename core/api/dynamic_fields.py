@@ -0,0 +1,81 @@
+# Writes validate and save with the full serializer, whatever the query.
+READ_METHODS = ('GET', 'HEAD')
+
+
+def _split(value):
+    return {path for path in value.split(',') if path} if value else set()
+
+
+class DynamicFieldsMixin:
+    """
+    Lets the request pick the shape of a serializer tree.
+
+    ``?fields=id,num_of_votes,restaurant.name`` keeps only the listed
+    fields, at any depth; a nested field listed without children keeps
+    all of its own. ``?expand=restaurant,restaurant.owner`` embeds only
+    the listed relations and renders the others as primary keys. Without
+    ``expand`` every relation is embedded, and a field listed below a
+    relation in ``fields`` embeds it as well. Both only shape the
+    responses of reads; writes always use every field.
+
+    Serializers add their nested serializers in ``get_fields`` only when
+    ``is_expanded`` says so, so unrequested ones are never built, and
+    ``eager_loading_paths`` of the resulting tree loads only what is
+    rendered.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self._requested_fields()
+        if requested is not None:
+            for name in list(fields):
+                if name not in requested:
+                    fields.pop(name)
+        return fields
+
+    def is_expanded(self, name):
+        """ Whether the relation ``name`` of this serializer is embedded. """
+        expand = self._query_param('expand')
+        if expand is None:
+            return True
+        path = self._field_path() + name
+        return any(
+            requested == path or requested.startswith(path + '.')
+            for requested in _split(expand) | {
+                field.rpartition('.')[0]
+                for field in self._query_param_paths('fields')
+            }
+        )
+
+    def _requested_fields(self):
+        """
+        Names of the fields of this serializer listed in ``fields``, or
+        ``None`` when all of them are rendered.
+        """
+        fields = self._query_param_paths('fields')
+        prefix = self._field_path()
+        if not fields or prefix[:-1] in fields:
+            return None
+        return {
+            field[len(prefix):].split('.')[0]
+            for field in fields if field.startswith(prefix)
+        }
+
+    def _query_param_paths(self, name):
+        return _split(self._query_param(name))
+
+    def _query_param(self, name):
+        request = self.context.get('request')
+        if request is None or request.method not in READ_METHODS:
+            return None
+        return request.query_params.get(name)
+
+    def _field_path(self):
+        """ Dotted path of this serializer from the root, e.g. ``menu.``. """
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return ''.join(name + '.' for name in reversed(names))
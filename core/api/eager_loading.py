@@ -0,0 +1,69 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def eager_loading_paths(serializer):
+    """
+    Returns the ``(select_related, prefetch_related)`` lookups that load
+    every relation a serializer tree renders through nested serializers.
+
+    Forward foreign keys and one-to-ones are joined; reverse and
+    many-to-many relations, and everything nested below them, are
+    prefetched. Relations rendered as primary keys need neither.
+    """
+    select_related, prefetch_related = set(), set()
+    _collect(serializer, '', False, select_related, prefetch_related)
+    return sorted(select_related), sorted(prefetch_related)
+
+
+def _collect(serializer, prefix, prefetching, select_related,
+             prefetch_related):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return
+    for field in serializer.fields.values():
+        if field.write_only or not isinstance(
+            field, serializers.BaseSerializer
+        ):
+            continue
+        source = field.source
+        if source == '*' or '.' in source:
+            continue
+        try:
+            relation = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+        if not relation.is_relation:
+            continue
+        path = prefix + source
+        prefetch = (
+            prefetching or relation.one_to_many or relation.many_to_many
+        )
+        (prefetch_related if prefetch else select_related).add(path)
+        _collect(
+            field, path + '__', prefetch, select_related, prefetch_related
+        )
+
+
+def eager_load(queryset, serializer):
+    """
+    Applies ``eager_loading_paths`` of ``serializer`` to ``queryset``.
+    """
+    select_related, prefetch_related = eager_loading_paths(serializer)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """
+    Makes ``get_queryset`` load what the view's serializer renders, so a
+    list costs the same number of queries whatever its length.
+    """
+
+    def get_queryset(self):
+        return eager_load(super().get_queryset(), self.get_serializer())
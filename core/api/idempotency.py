@@ -0,0 +1,98 @@
+import hashlib
+import json
+
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+IN_PROGRESS = 'in-progress'
+# How long a key stays locked while its first request is being handled.
+IN_PROGRESS_TIMEOUT = 60
+
+
+def _fingerprint(data):
+    """
+    Digest of the request payload; uploaded files count by name and size.
+    """
+    items = data.lists() if hasattr(data, 'lists') else data.items()
+    payload = sorted(
+        (key, [
+            [item.name, item.size] if hasattr(item, 'size') else item
+            for item in (value if isinstance(value, list) else [value])
+        ])
+        for key, value in items
+    )
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """
+    Replays the stored response of a successful create when a client
+    retries it with the same ``Idempotency-Key`` header, so the retry does
+    not reach the database. Responses are kept per user in the
+    ``idempotency`` cache, which bounds and expires them.
+    """
+    idempotency_cache_alias = 'idempotency'
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > 255:
+            return Response(
+                {'detail': 'Idempotency-Key must be at most 255 characters.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        cache = caches[self.idempotency_cache_alias]
+        cache_key = 'idempotency:{}:{}:{}'.format(
+            request.user.pk,
+            request.path,
+            hashlib.sha256(key.encode()).hexdigest()
+        )
+        fingerprint = _fingerprint(request.data)
+        stored = cache.get(cache_key)
+        if stored is None and cache.add(
+            cache_key, IN_PROGRESS, timeout=IN_PROGRESS_TIMEOUT
+        ):
+            return self.create_and_store(
+                cache, cache_key, fingerprint, request, *args, **kwargs
+            )
+        if stored is None or stored == IN_PROGRESS:
+            return Response(
+                {'detail': 'A request with this Idempotency-Key is '
+                           'still being processed.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        if stored['fingerprint'] != fingerprint:
+            return Response(
+                {'detail': 'This Idempotency-Key was used with a '
+                           'different payload.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        headers = dict(stored['headers'], **{'Idempotent-Replayed': 'true'})
+        return Response(
+            stored['data'], status=stored['status'], headers=headers
+        )
+
+    def create_and_store(
+        self, cache, cache_key, fingerprint, request, *args, **kwargs
+    ):
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            # Failed attempts are not stored, a retry runs again.
+            cache.delete(cache_key)
+            raise
+        cache.set(cache_key, {
+            'fingerprint': fingerprint,
+            'status': response.status_code,
+            'data': response.data,
+            'headers': {
+                header: value for header, value in response.items()
+                if header.lower() != 'content-type'
+            },
+        })
+        return response
@@ -1,5 +1,15 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+TRUE_VALUES = {'1', 'true', 'True'}
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -30,3 +40,192 @@ class MediumResultsSetPagination(PageNumberPagination):
             'count': self.page.paginator.count,
             'results': data
         })
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over the full ``Meta.ordering`` of the model.
+
+    A cursor holds the ordering values of the last (or first) row of a
+    page, and the next page is read with a ``WHERE (a, b) > (x, y)`` style
+    filter, so a deep page costs as much as the first one and rows added
+    meanwhile never shift a page. ``id`` is appended to the ordering when
+    missing so that every position is unique. The total count costs a
+    ``COUNT(*)`` and is only returned with ``?count=true``.
+
+    Positions are only stable while the ordering fields of a row do not
+    change. Menus are ordered by ``-num_of_votes``, so while the voting of
+    their day is open a menu that gains votes can move to a page already
+    read, and clients may see it twice or miss it.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Also pages a list of dicts that is already in the ordering of the
+        view's model, e.g. a cached snapshot, in Python.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        is_list = isinstance(queryset, list)
+        self.model = view.queryset.model if is_list else queryset.model
+        self.ordering = self.get_ordering(self.model)
+        self.count = None
+        if request.query_params.get(self.count_query_param) in TRUE_VALUES:
+            self.count = len(queryset) if is_list else queryset.count()
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if reverse:
+            ordering = [_flip(field) for field in ordering]
+        if is_list:
+            rows = queryset[::-1] if reverse else queryset
+            if position is not None:
+                rows = [
+                    row for row in rows if _is_after(row, ordering, position)
+                ]
+            rows = rows[:self.page_size + 1]
+        else:
+            queryset = queryset.order_by(*ordering)
+            if position is not None:
+                queryset = queryset.filter(_after(ordering, position))
+            rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows and (has_more or reverse):
+            self.next_position = self.position_of(rows[-1])
+        if rows and (has_more if reverse else position is not None):
+            self.previous_position = self.position_of(rows[0])
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, model):
+        ordering = list(model._meta.ordering) or ['pk']
+        if not {'id', '-id', 'pk', '-pk'} & set(ordering):
+            ordering.append('id')
+        return ordering
+
+    def position_of(self, row):
+        if isinstance(row, dict):
+            # A row of a values() queryset.
+            return [row[field.lstrip('-')] for field in self.ordering]
+        return [
+            getattr(row, self.attname(field.lstrip('-')))
+            for field in self.ordering
+        ]
+
+    def attname(self, name):
+        """ A foreign key is ordered, and so paged, by its id. """
+        if name == 'pk':
+            return name
+        return self.model._meta.get_field(name).attname
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps(
+            {'p': position, 'r': int(reverse)}, default=str
+        ).encode()
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(payload).decode()
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor['p'], bool(cursor['r'])
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.to_python(field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (
+            TypeError, ValueError, KeyError, binascii.Error, ValidationError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def to_python(self, field, value):
+        """ Converts a value of a cursor like its ordering field would. """
+        name = field.lstrip('-')
+        model_field = (
+            self.model._meta.pk if name == 'pk'
+            else self.model._meta.get_field(name)
+        )
+        value = model_field.to_python(value)
+        if value is None:
+            raise ValueError
+        return value
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        response = {
+            'links': {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link()
+            },
+            'results': data
+        }
+        if self.count is not None:
+            response['count'] = self.count
+        return Response(response)
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _after(ordering, position):
+    """
+    Builds the filter for the rows that come after ``position`` in
+    ``ordering``: ``a > x OR (a = x AND b > y) OR ...``, with ``<`` for
+    descending fields.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def _is_after(row, ordering, position):
+    """ ``_after`` for a row that is a dict. """
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        if row[name] != value:
+            return (
+                row[name] < value if field.startswith('-')
+                else row[name] > value
+            )
+    return False
@@ -0,0 +1,32 @@
+from rest_framework.response import Response
+
+
+class ProjectedListMixin:
+    """
+    Serves ``list`` from a ``values()`` projection instead of model
+    instances and serializers.
+
+    ``projection_class`` is built with the request and provides
+    ``values(queryset)``, the projected queryset, and ``rows(rows)``,
+    which shapes the rows exactly as the serializer would. Requests that
+    reshape the response with ``fields`` or ``expand`` are left to the
+    serializer.
+    """
+    projection_class = None
+    serializer_query_params = ['fields', 'expand']
+
+    def list(self, request, *args, **kwargs):
+        if self.projection_class is None or any(
+            name in request.query_params
+            for name in self.serializer_query_params
+        ):
+            return super().list(request, *args, **kwargs)
+
+        projection = self.projection_class(request)
+        queryset = projection.values(
+            self.filter_queryset(self.queryset.all())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.rows(page))
+        return Response(projection.rows(queryset))
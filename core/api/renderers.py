@@ -0,0 +1,49 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+def _default(obj):
+    """
+    Types orjson does not write natively, and datetimes, which it writes
+    differently, go through the encoder of the stock renderer.
+    """
+    return encoders.JSONEncoder().default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` built on orjson. The output is byte for byte the same
+    as the stock renderer's in its default compact, non-ASCII form; pretty
+    printing with ``indent`` and values orjson rejects, such as integers
+    beyond 64 bits, are left to the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.ensure_ascii or not self.compact or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ) is not None:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        try:
+            ret = orjson.dumps(data, default=_default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        # Same escaping of the javascript line terminators as the stock
+        # renderer.
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028'
+        ).replace(
+            b'\xe2\x80\xa9', b'\\u2029'
+        )
@@ -0,0 +1,151 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from rest_framework import status
+from rest_framework.response import Response
+
+RESPONSE_CACHE_ALIAS = 'responses'
+
+
+def _version_key(scope):
+    return f'response-cache:version:{scope}'
+
+
+def _changed_key(scope):
+    return f'response-cache:changed:{scope}'
+
+
+def _stats_key(scope, outcome):
+    return f'response-cache:stats:{scope}:{outcome}'
+
+
+def get_scope_version(scope, cache=None):
+    """
+    Current version of ``scope``. A version that is missing, e.g. after
+    the cache was restarted, starts from the clock, so it never returns
+    to a value that older entries may still be stored under.
+    """
+    cache = cache or caches[RESPONSE_CACHE_ALIAS]
+    return cache.get_or_set(_version_key(scope), time.time_ns, timeout=None)
+
+
+def get_scope_changed_at(scope, cache=None):
+    """
+    Unix time of the last invalidation of ``scope``, or of its first use
+    when that is not known.
+    """
+    cache = cache or caches[RESPONSE_CACHE_ALIAS]
+    return cache.get_or_set(_changed_key(scope), time.time, timeout=None)
+
+
+def invalidate_cached_responses(*scopes):
+    """
+    Makes the cached responses of ``scopes`` unreachable by moving their
+    versions on, once the current transaction commits.
+    """
+    def bump():
+        cache = caches[RESPONSE_CACHE_ALIAS]
+        for scope in scopes:
+            try:
+                cache.incr(_version_key(scope))
+            except ValueError:
+                cache.set(_version_key(scope), time.time_ns(), timeout=None)
+            cache.set(_changed_key(scope), time.time(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def _count(cache, scope, outcome):
+    key = _stats_key(scope, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def response_cache_stats(scopes):
+    """
+    Returns ``{scope: {'hit': n, 'miss': n}}`` counted across processes.
+    """
+    cache = caches[RESPONSE_CACHE_ALIAS]
+    keys = {
+        (scope, outcome): _stats_key(scope, outcome)
+        for scope in scopes for outcome in ('hit', 'miss')
+    }
+    counts = cache.get_many(list(keys.values()))
+    return {
+        scope: {
+            outcome: counts.get(keys[(scope, outcome)], 0)
+            for outcome in ('hit', 'miss')
+        }
+        for scope in scopes
+    }
+
+
+def warm_cached_list(view, path, host, user):
+    """
+    Renders ``path``, query string included, through ``view`` for
+    ``user`` as JSON requested from ``host``, so that the list is in the
+    cache before the first client asks for it. Returns the response.
+    """
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path, _, query = path.partition('?')
+    request.path_info = request.path
+    request.META.update({
+        'HTTP_HOST': host,
+        'HTTP_ACCEPT': 'application/json',
+        'QUERY_STRING': query,
+    })
+    request.GET = QueryDict(query)
+    request.user = user
+    return view(request)
+
+
+class CachedListMixin:
+    """
+    Serves ``list`` from the ``responses`` cache.
+
+    Entries are keyed by ``cache_scope`` and its version, the host and
+    renderer (absolute urls and formats differ), the full query string
+    and ``get_cache_variant``, and are only stored for ``200`` responses.
+    Authentication and permissions run before the lookup as usual. Writes
+    call ``invalidate_cached_responses`` with the scopes they affect.
+    Responses carry ``X-Cache: HIT`` or ``MISS``.
+    """
+    cache_scope = None
+
+    def get_cache_variant(self):
+        """
+        Tells apart users that are shown different lists. Every
+        authenticated user is shown the same list by default.
+        """
+        return ''
+
+    def list(self, request, *args, **kwargs):
+        cache = caches[RESPONSE_CACHE_ALIAS]
+        cache_key = 'response-cache:{}:{}:{}'.format(
+            self.cache_scope,
+            get_scope_version(self.cache_scope, cache),
+            hashlib.sha256('|'.join([
+                request.get_host(),
+                request.accepted_renderer.format,
+                request.get_full_path(),
+                self.get_cache_variant(),
+            ]).encode()).hexdigest()
+        )
+        data = cache.get(cache_key)
+        if data is not None:
+            _count(cache, self.cache_scope, 'hit')
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        _count(cache, self.cache_scope, 'miss')
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
@@ -78,10 +78,62 @@ USE_TZ = True
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Use a shared backend (e.g. redis://) when running more than one process.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    # Responses stored for Idempotency-Key retries, evicted after a day.
+    'idempotency': env.cache(
+        'IDEMPOTENCY_CACHE_URL',
+        default='locmemcache://idempotency?TIMEOUT=86400&MAX_ENTRIES=10000'
+    ),
+    # Cached GET responses of restaurants, menus and results. Use a shared
+    # backend (e.g. redis) when running more than one process.
+    'responses': env.cache(
+        'RESPONSE_CACHE_URL',
+        default='locmemcache://responses?TIMEOUT=300&MAX_ENTRIES=1000'
+    ),
+}
+
 AUTH_USER_MODEL = 'user.CustomUser'
 ACCOUNT_ADAPTER = 'core.api.adapter.CustomAccountAdapter'
 TOKEN_EXPIRED_AFTER_SECONDS = 86400
 
+VOTING_BULK_MAX_VOTES = env.int('VOTING_BULK_MAX_VOTES', default=1000)
+# Number of counter rows a menu's votes are spread over, 0 to count votes
+# on the menu row itself. See voting.services.fold_vote_shards.
+VOTING_COUNTER_SHARDS = env.int('VOTING_COUNTER_SHARDS', default=0)
+# Buffer accepted votes in a local SQLite file and write them to the
+# database in batches. See voting.buffer.
+VOTING_WRITE_BEHIND = env.bool('VOTING_WRITE_BEHIND', default=False)
+VOTING_WRITE_BEHIND_PATH = env.str(
+    'VOTING_WRITE_BEHIND_PATH',
+    default=(BASE_DIR / 'vote_buffer.sqlite3').as_posix()
+)
+VOTING_WRITE_BEHIND_FLUSH_INTERVAL = env.float(
+    'VOTING_WRITE_BEHIND_FLUSH_INTERVAL', default=0.3
+)
+VOTING_WRITE_BEHIND_BATCH_SIZE = env.int(
+    'VOTING_WRITE_BEHIND_BATCH_SIZE', default=1000
+)
+# Seconds a process trusts its own copy of a day's voting state before
+# asking the cache again. See voting.state.
+VOTING_STATE_TTL = env.float('VOTING_STATE_TTL', default=5)
+# Local time (HH:MM, TIME_ZONE) at which voting closes every day, empty to
+# close only when the result is published. See run_voting_scheduler.
+VOTING_CUTOFF_TIME = env.str('VOTING_CUTOFF_TIME', default='')
+# Hosts, as clients send them in the Host header, whose cached result and
+# menu lists of a day run_voting_scheduler renders once it closed the day.
+VOTING_WARM_HOSTS = env.list('VOTING_WARM_HOSTS', default=['127.0.0.1:8000'])
+# Months of vote partitions created ahead of the current one, PostgreSQL
+# only. See voting.partitions.
+VOTING_PARTITIONS_AHEAD = env.int('VOTING_PARTITIONS_AHEAD', default=3)
+# Months of raw votes kept before archive_vote_partitions moves them to
+# VOTING_ARCHIVE_DIR.
+VOTING_RETENTION_MONTHS = env.int('VOTING_RETENTION_MONTHS', default=24)
+VOTING_ARCHIVE_DIR = env.str(
+    'VOTING_ARCHIVE_DIR', default=(BASE_DIR / 'archive').as_posix()
+)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
@@ -91,9 +143,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated'
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.api.renderers.ORJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer'
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser'
+    ],
     'DEFAULT_PAGINATION_CLASS': None,
     'DEFAULT_VERSIONING_CLASS':
         'rest_framework.versioning.NamespaceVersioning',
@@ -1,10 +1,16 @@
 from .default import *
-from .default import env
+from .default import env, REST_FRAMEWORK
 
 
 DEBUG = False
 ALLOWED_HOSTS = []
 
+# API only: no browsable api to render.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['core.api.renderers.ORJSONRenderer'],
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql_psycopg2',
@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from voting.models import Restaurant, Menu, Result, Vote
+from voting.models import (
+    Restaurant, Menu, Result, Vote, DailyRestaurantVotes
+)
+from voting.utils import rollup_daily_votes
 
 
 @admin.register(Restaurant)
@@ -20,6 +23,9 @@ class RestaurantAdmin(admin.ModelAdmin):
         'owner__last_name'
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_winning_streak()
+
 
 @admin.register(Menu)
 class MenuAdmin(admin.ModelAdmin):
@@ -71,13 +77,36 @@ class ResultAdmin(admin.ModelAdmin):
     list_display = [
         'winning_menu',
         'voting_date',
-        'is_voting_stopped'
+        'is_voting_stopped',
+        'winning_streak'
     ]
     raw_id_fields = [
         'winning_menu'
     ]
+    readonly_fields = ['winning_streak']
     search_fields = (
         'winning_menu__restaurant__name',
         'voting_date'
     )
     list_filter = ['is_voting_stopped']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        rollup_daily_votes(obj.voting_date, obj.voting_date)
+
+
+@admin.register(DailyRestaurantVotes)
+class DailyRestaurantVotesAdmin(admin.ModelAdmin):
+    list_display = [
+        'restaurant',
+        'voting_date',
+        'num_of_votes',
+        'rank',
+        'is_winner'
+    ]
+    raw_id_fields = ['restaurant']
+    search_fields = (
+        'restaurant__name',
+        'voting_date'
+    )
+    list_filter = ['is_winner']
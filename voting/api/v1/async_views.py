@@ -0,0 +1,70 @@
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from core.api.async_views import async_api_view
+from core.api.eager_loading import eager_load
+from core.api.permissions import IsUserEmployee
+from voting.models import Menu, Result
+from voting.api.v1.serializers import (
+    MenuSerializer, VoteSerializer, ResultSerializer
+)
+
+
+def _date_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return timezone.localdate()
+    try:
+        return serializers.DateField().to_internal_value(value)
+    except serializers.ValidationError as exc:
+        raise serializers.ValidationError({name: exc.detail})
+
+
+@async_api_view(
+    methods=['POST'],
+    permission_classes=[IsAuthenticated, IsUserEmployee]
+)
+def vote_create(request):
+    """
+    Async version of POST votes/, without replaying ``Idempotency-Key``
+    retries.
+    """
+    serializer = VoteSerializer(
+        data=request.data, context={'request': request}
+    )
+    serializer.is_valid(raise_exception=True)
+    vote = serializer.save()
+    if vote.pk is None:
+        """ The vote is buffered and will be written later. """
+        return serializer.data, status.HTTP_202_ACCEPTED
+    return serializer.data, status.HTTP_201_CREATED
+
+
+@async_api_view(methods=['GET'], permission_classes=[IsAuthenticated])
+def menu_list_today(request):
+    """
+    Async version of GET menus/?upload_date=, defaulting to today. Not
+    paginated: returns every menu of the day.
+    """
+    serializer = MenuSerializer(many=True, context={'request': request})
+    serializer.instance = eager_load(
+        Menu.objects.filter(upload_date=_date_param(request, 'upload_date')),
+        serializer
+    )
+    return serializer.data, status.HTTP_200_OK
+
+
+@async_api_view(methods=['GET'], permission_classes=[IsAuthenticated])
+def result_list(request):
+    """
+    Async version of GET result/?voting_date=, defaulting to today. Not
+    paginated: returns the day's results as a plain list.
+    """
+    serializer = ResultSerializer(many=True, context={'request': request})
+    serializer.instance = eager_load(
+        Result.objects.filter(
+            voting_date=_date_param(request, 'voting_date')
+        ),
+        serializer
+    )
+    return serializer.data, status.HTTP_200_OK
@@ -0,0 +1,125 @@
+import datetime
+
+from rest_framework.response import Response
+from user.api.v1.serializers import UserSerializer
+from voting.models import Menu, Result
+from voting.snapshots import get_menu_snapshot
+
+
+class RestaurantProjection:
+    """
+    ``RestaurantSerializer`` output read straight from ``values()`` rows,
+    with the owner joined in. Querysets need ``with_winning_streak``.
+    """
+    owner_fields = UserSerializer.Meta.fields
+    fields = ['id', 'name', 'address', 'contact_no']
+
+    def __init__(self, request, prefix=''):
+        self.request = request
+        self.prefix = prefix
+
+    def lookups(self):
+        return [self.prefix + field for field in self.fields] + [
+            f'{self.prefix}owner__{field}' for field in self.owner_fields
+        ]
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups(), 'winning_streak')
+
+    def rows(self, rows):
+        return [self.row(row, row['winning_streak']) for row in rows]
+
+    def row(self, row, winning_streak):
+        prefix = self.prefix
+        return {
+            'id': row[prefix + 'id'],
+            'owner': {
+                field: row[f'{prefix}owner__{field}']
+                for field in self.owner_fields
+            },
+            'name': row[prefix + 'name'],
+            'address': row[prefix + 'address'],
+            'contact_no': row[prefix + 'contact_no'],
+            'winning_streak': winning_streak,
+        }
+
+
+class MenuProjection:
+    """
+    ``MenuSerializer`` output (GET) read straight from ``values()`` rows,
+    with the restaurant and its owner joined in.
+    """
+    fields = ['id', 'menu_image', 'num_of_votes', 'upload_date']
+
+    def __init__(self, request):
+        self.request = request
+        self.restaurant = RestaurantProjection(request, 'restaurant__')
+        self.storage = Menu._meta.get_field('menu_image').storage
+
+    def values(self, queryset):
+        return queryset.values(*self.fields, *self.restaurant.lookups())
+
+    def rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return []
+        restaurant_id, streak = Result.objects.winning_run()
+        return [
+            {
+                'id': row['id'],
+                'restaurant': self.restaurant.row(
+                    row,
+                    streak if row['restaurant__id'] == restaurant_id else 0
+                ),
+                'menu_image': self.image_url(row['menu_image']),
+                'num_of_votes': row['num_of_votes'],
+                'upload_date': row['upload_date'].isoformat(),
+            }
+            for row in rows
+        ]
+
+    def image_url(self, name):
+        """ Same as ``ImageField.to_representation`` of the serializer. """
+        if not name:
+            return None
+        if self.request is None:
+            return self.storage.url(name)
+        return self.request.build_absolute_uri(self.storage.url(name))
+
+
+class MenuSnapshotListMixin:
+    """
+    Serves the menus of one day, ``?upload_date=`` with nothing but
+    paging next to it, from ``get_menu_snapshot`` instead of the database.
+    """
+    snapshot_query_params = {'upload_date', 'page_size', 'cursor', 'count'}
+
+    def get_snapshot_date(self, request):
+        params = request.query_params
+        if 'upload_date' not in params or not (
+            set(params) <= self.snapshot_query_params
+        ):
+            return None
+        try:
+            return datetime.date.fromisoformat(params['upload_date'])
+        except ValueError:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        upload_date = self.get_snapshot_date(request)
+        if upload_date is None:
+            return super().list(request, *args, **kwargs)
+
+        menus = [
+            {
+                **menu,
+                'menu_image': menu['menu_image'] and (
+                    request.build_absolute_uri(menu['menu_image'])
+                ),
+            }
+            for menu in get_menu_snapshot(upload_date)
+        ]
+        page = self.paginate_queryset(menus)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(menus)
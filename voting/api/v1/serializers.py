@@ -1,15 +1,22 @@
+from core.api.dynamic_fields import DynamicFieldsMixin
+from django.conf import settings
 from django.db import IntegrityError
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from user.api.v1.serializers import UserSerializer
+from voting.buffer import get_vote_buffer
 from voting.models import (
-    Restaurant, Menu, Result, Vote
+    Restaurant, Menu, Result, Vote, DailyRestaurantVotes
 )
+from voting.services import (
+    ALREADY_VOTED_MESSAGE, VOTING_DATE_MISMATCH_MESSAGE,
+    VOTING_STOPPED_MESSAGE, cast_vote
+)
+from voting.state import is_voting_stopped
 
 
-class RestaurantSerializer(serializers.ModelSerializer):
-    owner = UserSerializer(read_only=True)
-    winning_streak = serializers.ReadOnlyField()
+class RestaurantSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    winning_streak = serializers.SerializerMethodField()
 
     class Meta:
         model = Restaurant
@@ -21,6 +28,24 @@ class RestaurantSerializer(serializers.ModelSerializer):
             'contact_no',
             'winning_streak'
         ]
+        read_only_fields = ['owner']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'owner' in fields and self.is_expanded('owner'):
+            fields['owner'] = UserSerializer(read_only=True)
+        return fields
+
+    def get_winning_streak(self, restaurant):
+        if restaurant._winning_streak is not None:
+            return restaurant._winning_streak
+        # Nested under menus or results: look the latest run up once for
+        # the whole response instead of once per restaurant.
+        root = self.root
+        if not hasattr(root, '_winning_run'):
+            root._winning_run = Result.objects.winning_run()
+        restaurant_id, streak = root._winning_run
+        return streak if restaurant_id == restaurant.pk else 0
 
     def create(self, validated_data):
         user = self.context['request'].user
@@ -30,7 +55,7 @@ class RestaurantSerializer(serializers.ModelSerializer):
         )
 
 
-class MenuSerializer(serializers.ModelSerializer):
+class MenuSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     num_of_votes = serializers.ReadOnlyField()
 
     class Meta:
@@ -43,10 +68,14 @@ class MenuSerializer(serializers.ModelSerializer):
             'upload_date',
         ]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if self.context['request'].method == 'GET':
-            self.fields['restaurant'] = RestaurantSerializer(read_only=True)
+    def get_fields(self):
+        fields = super().get_fields()
+        if (
+            self.context['request'].method == 'GET'
+            and 'restaurant' in fields and self.is_expanded('restaurant')
+        ):
+            fields['restaurant'] = RestaurantSerializer(read_only=True)
+        return fields
 
     def create(self, validated_data):
         user = self.context['request'].user
@@ -76,7 +105,7 @@ class MenuSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class VoteSerializer(serializers.ModelSerializer):
+class VoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Vote
@@ -86,36 +115,42 @@ class VoteSerializer(serializers.ModelSerializer):
             'voting_date',
         ]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if self.context['request'].method == 'GET':
-            self.fields['menu'] = MenuSerializer(
-                read_only=True, context={'request': self.context['request']}
-            )
+    def get_fields(self):
+        fields = super().get_fields()
+        if (
+            self.context['request'].method == 'GET'
+            and 'menu' in fields and self.is_expanded('menu')
+        ):
+            fields['menu'] = MenuSerializer(read_only=True)
+        return fields
 
     def create(self, validated_data):
         user = self.context['request'].user
-        try:
-            result, _ = Result.objects.get_or_create(
-                            voting_date=validated_data['voting_date']
-                        )
-            if result.is_voting_stopped:
-                raise PermissionDenied(
-                    detail="Sorry! Voting is stopped for today."
-                )
-            if (
-                validated_data['voting_date']
-                != validated_data['menu'].upload_date
-            ):
-                raise ValidationError(
-                    detail="Voting date and menu upload date must be same."
-                )
-            return Vote.objects.create(
-                **validated_data,
-                employee=user
-            )
-        except IntegrityError:
-            raise ValidationError(detail='You have already voted.')
+        if settings.VOTING_WRITE_BEHIND:
+            return self.buffer_vote(validated_data, user)
+        vote, error = cast_vote(
+            user, validated_data['menu'], validated_data['voting_date']
+        )
+        if error == VOTING_STOPPED_MESSAGE:
+            raise PermissionDenied(detail=error)
+        if error:
+            raise ValidationError(detail=error)
+        return vote
+
+    def buffer_vote(self, validated_data, user):
+        """
+        Accepts the vote into the write-behind buffer. Nothing is written
+        to the database; the returned vote has no id until it is flushed.
+        """
+        voting_date = validated_data['voting_date']
+        menu = validated_data['menu']
+        if is_voting_stopped(voting_date):
+            raise PermissionDenied(detail=VOTING_STOPPED_MESSAGE)
+        if voting_date != menu.upload_date:
+            raise ValidationError(detail=VOTING_DATE_MISMATCH_MESSAGE)
+        if not get_vote_buffer().append(user.pk, menu.pk, voting_date):
+            raise ValidationError(detail=ALREADY_VOTED_MESSAGE)
+        return Vote(employee=user, menu=menu, voting_date=voting_date)
 
     def update(self, instance, validated_data):
         voting_date = validated_data.get('voting_date', None)
@@ -128,7 +163,25 @@ class VoteSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class ResultSerializer(serializers.ModelSerializer):
+class VoteBulkItemSerializer(serializers.Serializer):
+    employee = serializers.IntegerField(min_value=1)
+    menu = serializers.IntegerField(min_value=1)
+    voting_date = serializers.DateField()
+
+
+class VoteBulkCreateSerializer(serializers.Serializer):
+    votes = VoteBulkItemSerializer(many=True, allow_empty=False)
+
+    def validate_votes(self, votes):
+        if len(votes) > settings.VOTING_BULK_MAX_VOTES:
+            raise serializers.ValidationError(
+                f'At most {settings.VOTING_BULK_MAX_VOTES} votes '
+                'can be cast in one request.'
+            )
+        return votes
+
+
+class ResultSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Result
@@ -139,12 +192,28 @@ class ResultSerializer(serializers.ModelSerializer):
             'is_voting_stopped'
         ]
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if self.context['request'].method == 'GET':
-            self.fields['winning_menu'] = MenuSerializer(
-                context={'request': self.context['request']}
-            )
+    def get_fields(self):
+        fields = super().get_fields()
+        if (
+            self.context['request'].method == 'GET'
+            and 'winning_menu' in fields
+            and self.is_expanded('winning_menu')
+        ):
+            fields['winning_menu'] = MenuSerializer(read_only=True)
+        return fields
+
+
+class DailyRestaurantVotesSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = DailyRestaurantVotes
+        fields = [
+            'restaurant',
+            'voting_date',
+            'num_of_votes',
+            'rank',
+            'is_winner'
+        ]
 
 
 class PublishResultSerializer(serializers.Serializer):
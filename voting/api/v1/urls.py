@@ -1,8 +1,10 @@
 from django.urls import path
+from voting.api.v1 import async_views
 from voting.api.v1.views import (
     RestaurantListCreateAPIView, RestaurantRUDAPIView,
     MenuListCreateAPIView, MenuRUDAPIView, VoteListCreateAPIView,
-    VoteRUDAPIView, ResultAPIView, PublishResultAPIView
+    VoteBulkCreateAPIView, VoteRUDAPIView, ResultAPIView,
+    PublishResultAPIView, DailyRestaurantVotesAPIView
 )
 
 
@@ -22,6 +24,11 @@ urlpatterns = [
     path('menus/', MenuListCreateAPIView.as_view(), name='menu-list-create'),
     path('menus/<int:pk>/', MenuRUDAPIView.as_view(), name='menu-rud'),
     path('votes/', VoteListCreateAPIView.as_view(), name='vote-list-create'),
+    path(
+        'votes/bulk/',
+        VoteBulkCreateAPIView.as_view(),
+        name='vote-bulk-create'
+    ),
     path('votes/<int:pk>/', VoteRUDAPIView.as_view(), name='vote-rud'),
     path('result/', ResultAPIView.as_view(), name='result'),
     path(
@@ -29,4 +36,20 @@ urlpatterns = [
         PublishResultAPIView.as_view(),
         name='publish-result'
     ),
+    path(
+        'analytics/restaurant-votes/',
+        DailyRestaurantVotesAPIView.as_view(),
+        name='analytics-restaurant-votes'
+    ),
+    path(
+        'async/votes/',
+        async_views.vote_create,
+        name='async-vote-create'
+    ),
+    path(
+        'async/menus/today/',
+        async_views.menu_list_today,
+        name='async-menu-list-today'
+    ),
+    path('async/result/', async_views.result_list, name='async-result'),
 ]
@@ -6,23 +6,42 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from core.api.conditional import ConditionalGetMixin
+from core.api.eager_loading import EagerLoadingMixin
+from core.api.idempotency import IdempotentCreateMixin
+from core.api.response_cache import CachedListMixin
+from core.api.pagination import KeysetPagination
+from core.api.projection import ProjectedListMixin
 from core.api.permissions import (
     IsUserAdmin, IsUserEmployee, IsUserRestaurantOwner,
     IsUserOwnsRestaurant, IsUserOwnsMenu, IsUserOwnsVote
 )
 from voting.models import (
-    Restaurant, Menu, Vote, Result
+    Restaurant, Menu, Vote, Result, DailyRestaurantVotes
 )
 from voting.api.v1.serializers import (
     RestaurantSerializer, MenuSerializer, VoteSerializer,
-    ResultSerializer, PublishResultSerializer
+    VoteBulkCreateSerializer, ResultSerializer, PublishResultSerializer,
+    DailyRestaurantVotesSerializer
 )
+from voting.api.v1.projections import (
+    MenuProjection, MenuSnapshotListMixin, RestaurantProjection
+)
+from voting.services import bulk_cast_votes
+from voting.snapshots import menu_snapshot_version
 from voting.utils import update_result
 
 
-class RestaurantListCreateAPIView(ListCreateAPIView):
-    queryset = Restaurant.objects.all()
+class RestaurantListCreateAPIView(
+    ConditionalGetMixin, CachedListMixin, ProjectedListMixin,
+    EagerLoadingMixin, ListCreateAPIView
+):
+    cache_scope = 'restaurants'
+    validator_scopes = ['restaurants']
+    projection_class = RestaurantProjection
+    queryset = Restaurant.objects.with_winning_streak()
     serializer_class = RestaurantSerializer
+    pagination_class = KeysetPagination
     permission_classes = [IsAuthenticated, IsUserRestaurantOwner]
 
     def get_permissions(self):
@@ -31,9 +50,16 @@ class RestaurantListCreateAPIView(ListCreateAPIView):
             return [IsAuthenticated()]
         return super().get_permissions()
 
+    def get_validator_queryset(self):
+        """ The winning streaks are covered by the scope version. """
+        return self.filter_queryset(Restaurant.objects.all())
+
 
-class RestaurantRUDAPIView(RetrieveUpdateDestroyAPIView):
-    queryset = Restaurant.objects.all()
+class RestaurantRUDAPIView(
+    ConditionalGetMixin, EagerLoadingMixin, RetrieveUpdateDestroyAPIView
+):
+    validator_scopes = ['restaurants']
+    queryset = Restaurant.objects.with_winning_streak()
     serializer_class = RestaurantSerializer
     permission_classes = [IsAuthenticated, IsUserOwnsRestaurant]
 
@@ -44,9 +70,17 @@ class RestaurantRUDAPIView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
 
-class MenuListCreateAPIView(ListCreateAPIView):
+class MenuListCreateAPIView(
+    IdempotentCreateMixin, ConditionalGetMixin, CachedListMixin,
+    MenuSnapshotListMixin, ProjectedListMixin, EagerLoadingMixin,
+    ListCreateAPIView
+):
+    cache_scope = 'menus'
+    validator_scopes = ['menus']
+    projection_class = MenuProjection
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['restaurant', 'upload_date']
     permission_classes = [IsAuthenticated, IsUserRestaurantOwner]
@@ -57,8 +91,18 @@ class MenuListCreateAPIView(ListCreateAPIView):
             return [IsAuthenticated()]
         return super().get_permissions()
 
+    def get_list_validators(self):
+        upload_date = self.get_snapshot_date(self.request)
+        if upload_date is None:
+            return super().get_list_validators()
+        """ The snapshot version changes with every menu of the day. """
+        return list(menu_snapshot_version(upload_date)), None
 
-class MenuRUDAPIView(RetrieveUpdateDestroyAPIView):
+
+class MenuRUDAPIView(
+    ConditionalGetMixin, EagerLoadingMixin, RetrieveUpdateDestroyAPIView
+):
+    validator_scopes = ['menus']
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
     permission_classes = [IsAuthenticated, IsUserOwnsMenu]
@@ -70,30 +114,100 @@ class MenuRUDAPIView(RetrieveUpdateDestroyAPIView):
         return super().get_permissions()
 
 
-class VoteListCreateAPIView(ListCreateAPIView):
+class VoteListCreateAPIView(
+    IdempotentCreateMixin, ConditionalGetMixin, EagerLoadingMixin,
+    ListCreateAPIView
+):
+    validator_scopes = ['menus']
+    queryset = Vote.objects.all()
     serializer_class = VoteSerializer
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['voting_date']
     permission_classes = [IsAuthenticated, IsUserEmployee]
 
     def get_queryset(self):
-        return Vote.objects.filter(employee=self.request.user)
+        return super().get_queryset().filter(employee=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        if (
+            response.status_code == status.HTTP_201_CREATED
+            and response.data.get('id') is None
+        ):
+            """ The vote is buffered and will be written later. """
+            response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+
+class VoteBulkCreateAPIView(APIView):
+    """
+    Casts votes on behalf of many employees at once (kiosks, chat-bot relay).
+    Each vote is reported separately in the response.
+    """
+    serializer_class = VoteBulkCreateSerializer
+    permission_classes = [IsAuthenticated, IsUserAdmin]
+
+    def post(self, request, format=None):
+        serializer = VoteBulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_cast_votes(serializer.validated_data['votes'])
+        num_of_created = sum(
+            1 for result in results if result['status'] == 'created'
+        )
+        if num_of_created == len(results):
+            status_code = status.HTTP_201_CREATED
+        elif num_of_created:
+            status_code = status.HTTP_207_MULTI_STATUS
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST
+        json_res = {
+            'created': num_of_created,
+            'rejected': len(results) - num_of_created,
+            'results': results
+        }
+        return Response(json_res, status_code)
 
 
-class VoteRUDAPIView(RetrieveUpdateDestroyAPIView):
+class VoteRUDAPIView(
+    ConditionalGetMixin, EagerLoadingMixin, RetrieveUpdateDestroyAPIView
+):
+    validator_scopes = ['menus']
     queryset = Vote.objects.all()
     serializer_class = VoteSerializer
     permission_classes = [IsAuthenticated, IsUserOwnsVote]
 
 
-class ResultAPIView(ListAPIView):
+class ResultAPIView(
+    ConditionalGetMixin, CachedListMixin, EagerLoadingMixin, ListAPIView
+):
+    cache_scope = 'results'
+    validator_scopes = ['results']
     queryset = Result.objects.all()
     serializer_class = ResultSerializer
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['voting_date']
     permission_classes = [IsAuthenticated]
 
 
+class DailyRestaurantVotesAPIView(ListAPIView):
+    """
+    Daily votes, rank and wins per restaurant from the rollup that is
+    written when a result is published. Filter with ``restaurant``,
+    ``voting_date__gte`` and ``voting_date__lte``.
+    """
+    queryset = DailyRestaurantVotes.objects.all()
+    serializer_class = DailyRestaurantVotesSerializer
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        'restaurant': ['exact'],
+        'voting_date': ['gte', 'lte'],
+    }
+    permission_classes = [IsAuthenticated, IsUserAdmin]
+
+
 class PublishResultAPIView(APIView):
     serializer_class = PublishResultSerializer
     permission_classes = [IsAuthenticated, IsUserAdmin]
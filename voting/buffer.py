@@ -0,0 +1,245 @@
+"""
+Write-behind buffer for votes.
+
+With ``VOTING_WRITE_BEHIND`` on, an accepted vote is appended to a local
+SQLite database in WAL mode instead of being written to ``Vote``. The
+buffer file is shared by every worker process of the host and its unique
+``(employee_id, voting_date)`` key rejects duplicates across them, and
+votes that were flushed or written to ``Vote`` otherwise are looked up
+there, a read, before a vote is accepted. A
+flusher bulk-inserts the pending votes every
+``VOTING_WRITE_BEHIND_FLUSH_INTERVAL`` seconds and ``update_result``
+drains the buffer before a result is computed.
+
+A buffered vote has no id until it is flushed, so it cannot be changed or
+deleted through the API before then. Votes of a day whose voting stopped
+by the time they are flushed are dropped; ``update_result`` flushes again
+once it holds the day's result lock, so the votes accepted before then
+are counted.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from voting.models import Menu, Result, Vote
+
+
+logger = logging.getLogger(__name__)
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+class VoteBuffer:
+
+    def __init__(self, path, flush_interval=0, batch_size=1000):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._local = threading.local()
+        self._flush_lock = threading.RLock()
+        self._flusher = None
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS pending_vote ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'employee_id INTEGER NOT NULL, '
+            'menu_id INTEGER NOT NULL, '
+            'voting_date TEXT NOT NULL, '
+            'UNIQUE (employee_id, voting_date))'
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=FULL')
+            self._local.connection = connection
+        return connection
+
+    def _execute(self, sql, params=()):
+        return self._connection().execute(sql, params)
+
+    def append(self, employee_id, menu_id, voting_date):
+        """
+        Buffers a vote. Returns ``False`` if the employee already voted on
+        ``voting_date``.
+        """
+        params = (employee_id, voting_date.isoformat())
+        cursor = self._execute(
+            'INSERT OR IGNORE INTO pending_vote '
+            '(employee_id, menu_id, voting_date) VALUES (?, ?, ?)',
+            (employee_id, menu_id, voting_date.isoformat())
+        )
+        if cursor.rowcount != 1:
+            return False
+        # Looked up after buffering: a pending vote of the employee is
+        # only removed from the buffer once it is in ``Vote``.
+        if Vote.objects.filter(
+            employee_id=employee_id, voting_date=voting_date
+        ).exists():
+            self._execute(
+                'DELETE FROM pending_vote '
+                'WHERE employee_id = ? AND voting_date = ?',
+                params
+            )
+            return False
+        self._start_flusher()
+        return True
+
+    def pending(self):
+        return self._execute('SELECT COUNT(*) FROM pending_vote').fetchone()[0]
+
+    def flush(self):
+        """
+        Writes up to ``batch_size`` buffered votes into ``Vote`` and removes
+        them from the buffer. Votes that reached the table already (an
+        earlier flush that died before cleaning up), whose menu is gone or
+        whose day's voting stopped are dropped. Returns the number of votes
+        taken from the buffer.
+        """
+        with self._flush_lock:
+            rows = self._execute(
+                'SELECT id, employee_id, menu_id, voting_date '
+                'FROM pending_vote ORDER BY id LIMIT ?',
+                (self.batch_size,)
+            ).fetchall()
+            if not rows:
+                return 0
+            votes = [
+                Vote(
+                    employee_id=employee_id,
+                    menu_id=menu_id,
+                    voting_date=date.fromisoformat(voting_date)
+                )
+                for _, employee_id, menu_id, voting_date in rows
+            ]
+            try:
+                self._write_votes(votes)
+            except IntegrityError:
+                # A flusher in another process wrote some of them first,
+                # the second attempt skips those.
+                self._write_votes(votes)
+            self._execute(
+                'DELETE FROM pending_vote WHERE id <= ?', (rows[-1][0],)
+            )
+            return len(rows)
+
+    def flush_all(self):
+        total = 0
+        while True:
+            flushed = self.flush()
+            if not flushed:
+                return total
+            total += flushed
+
+    def _write_votes(self, votes):
+        existing = set(
+            Vote.objects
+            .filter(
+                employee_id__in={vote.employee_id for vote in votes},
+                voting_date__in={vote.voting_date for vote in votes}
+            )
+            .values_list('employee_id', 'voting_date')
+        )
+        menus = set(
+            Menu.objects
+            .filter(pk__in={vote.menu_id for vote in votes})
+            .values_list('pk', flat=True)
+        )
+        with transaction.atomic():
+            # Locked so that a result being published waits for the
+            # votes, or they wait for it and see it stopped.
+            stopped = {
+                voting_date
+                for voting_date, is_voting_stopped in (
+                    Result.objects
+                    .select_for_update()
+                    .filter(
+                        voting_date__in={vote.voting_date for vote in votes}
+                    )
+                    .order_by('voting_date')
+                    .values_list('voting_date', 'is_voting_stopped')
+                )
+                if is_voting_stopped
+            }
+            late = [vote for vote in votes if vote.voting_date in stopped]
+            if late:
+                logger.warning(
+                    'Dropped %d buffered votes cast after voting stopped.',
+                    len(late)
+                )
+            Vote.objects.bulk_create([
+                vote for vote in votes
+                if (vote.employee_id, vote.voting_date) not in existing
+                and vote.menu_id in menus
+                and vote.voting_date not in stopped
+            ])
+
+    def _start_flusher(self):
+        if not self.flush_interval or self._flusher is not None:
+            return
+        with self._flush_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run_flusher,
+                    name='vote-buffer-flusher',
+                    daemon=True
+                )
+                self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush_all()
+            except Exception:
+                logger.exception('Vote buffer flush failed.')
+            finally:
+                close_old_connections()
+
+
+def get_vote_buffer():
+    """
+    Returns the process-wide buffer for ``VOTING_WRITE_BEHIND_PATH``.
+    """
+    path = str(settings.VOTING_WRITE_BEHIND_PATH)
+    with _buffers_lock:
+        if path not in _buffers:
+            _buffers[path] = VoteBuffer(
+                path,
+                flush_interval=settings.VOTING_WRITE_BEHIND_FLUSH_INTERVAL,
+                batch_size=settings.VOTING_WRITE_BEHIND_BATCH_SIZE
+            )
+        return _buffers[path]
+
+
+def flush_vote_buffer():
+    """
+    Drains the buffer so that ``Vote`` and ``Menu.num_of_votes`` are exact.
+    Does nothing unless ``VOTING_WRITE_BEHIND`` is on.
+    """
+    if not settings.VOTING_WRITE_BEHIND:
+        return 0
+    return get_vote_buffer().flush_all()
+
+
+@contextmanager
+def holding_vote_buffer():
+    """
+    Keeps the flusher of this process waiting, so that a result can be
+    locked and the buffer flushed under it without the flusher waiting
+    for the same lock meanwhile.
+    """
+    if not settings.VOTING_WRITE_BEHIND:
+        yield
+        return
+    with get_vote_buffer()._flush_lock:
+        yield
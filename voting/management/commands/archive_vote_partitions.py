@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from voting.partitions import (
+    archive_vote_partition, create_vote_partitions,
+    expired_vote_partitions, is_vote_table_partitioned, vote_partitions
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes the votes of the months older than the retention period '
+        'to gzipped CSV files and drops their partitions. Menu counts, '
+        'results and the daily rollup keep their history. Also creates '
+        'the partitions of the coming months.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retain-months',
+            type=int,
+            default=settings.VOTING_RETENTION_MONTHS,
+            help='Number of months before the current one to keep.'
+        )
+        parser.add_argument(
+            '--archive-dir',
+            default=settings.VOTING_ARCHIVE_DIR,
+            help='Directory the archive files are written to.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list the partitions that would be archived.'
+        )
+
+    def handle(self, *args, **options):
+        if not is_vote_table_partitioned():
+            raise CommandError(
+                'The vote table is not partitioned, which needs PostgreSQL.'
+            )
+        if options['retain_months'] < 1:
+            raise CommandError('--retain-months must be at least 1.')
+
+        if not options['dry_run']:
+            for name in create_vote_partitions():
+                self.stdout.write(f'Created {name}.')
+        expired = expired_vote_partitions(
+            vote_partitions(), options['retain_months']
+        )
+        for partition in expired:
+            if options['dry_run']:
+                self.stdout.write(
+                    f'Would archive {partition.name} '
+                    f'({partition.start} to {partition.end}).'
+                )
+                continue
+            started = time.perf_counter()
+            path = archive_vote_partition(partition, options['archive_dir'])
+            self.stdout.write(
+                f'Archived {partition.name} to {path} in '
+                f'{time.perf_counter() - started:.2f}s.'
+            )
+        action = 'Found' if options['dry_run'] else 'Archived'
+        self.stdout.write(f'{action} {len(expired)} expired vote partitions.')
@@ -0,0 +1,59 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from voting.models import Menu
+from voting.services import fold_vote_shards
+from voting.utils import rollup_daily_votes
+
+
+class Command(BaseCommand):
+    help = (
+        'Fills the daily per-restaurant vote rollup used by the analytics '
+        'api, by default for every day that has menus.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=datetime.date.fromisoformat,
+            default=None,
+            help='First voting date to roll up (YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--end',
+            type=datetime.date.fromisoformat,
+            default=None,
+            help='Last voting date to roll up (YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=31,
+            help='Number of days rolled up per query.'
+        )
+
+    def handle(self, *args, **options):
+        bounds = Menu.objects.aggregate(
+            first=Min('upload_date'), last=Max('upload_date')
+        )
+        start = options['start'] or bounds['first']
+        end = options['end'] or bounds['last']
+        if start is None or end is None:
+            self.stdout.write('No menus to roll up.')
+            return
+        if start > end:
+            raise CommandError('--start must not be after --end.')
+
+        started = time.perf_counter()
+        fold_vote_shards()
+        num_of_rows = rollup_daily_votes(
+            start, end, chunk_days=options['chunk_days']
+        )
+        elapsed = time.perf_counter() - started
+        num_of_days = (end - start).days + 1
+        self.stdout.write(
+            f'Rolled up {num_of_rows} rows over {num_of_days} days in '
+            f'{elapsed:.2f}s ({num_of_days / elapsed:.1f} days/s).'
+        )
@@ -0,0 +1,272 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from core.api.pagination import KeysetPagination
+from user.models import CustomUser
+from voting.models import Menu, Restaurant
+from voting.state import clear_voting_states
+
+# The sync lists are paged, the async ones are not: the sync requests
+# ask for the largest page so that both render the same rows.
+SYNC_PAGE_SIZE = KeysetPagination.max_page_size
+DUMMY_CACHE = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares requests per second and p99 latency of the sync (WSGI) '
+        'and async (ASGI) menu and result endpoints for the same workload, '
+        'and of the vote endpoints in a throwaway database. Requests are '
+        'served in-process.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            required=True,
+            help='Existing user the list requests are made as.'
+        )
+        parser.add_argument(
+            '--date',
+            default=None,
+            help='Upload/voting date to query, defaults to today.'
+        )
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument(
+            '--votes',
+            type=int,
+            default=200,
+            help=(
+                'Votes cast on each stack, by as many new employees, in a '
+                'test database created for the run and destroyed after '
+                'it. 0 skips the vote workload.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = CustomUser.objects.get(username=options['username'])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"No user named {options['username']}.")
+        date = options['date'] or timezone.localdate().isoformat()
+        workloads = [
+            (
+                'menus',
+                reverse('api:voting-api-v1:menu-list-create'),
+                reverse('api:voting-api-v1:async-menu-list-today'),
+                {'upload_date': date}
+            ),
+            (
+                'result',
+                reverse('api:voting-api-v1:result'),
+                reverse('api:voting-api-v1:async-result'),
+                {'voting_date': date}
+            ),
+        ]
+        num_of_requests = options['requests']
+        concurrency = options['concurrency']
+
+        self.stdout.write(
+            f'{num_of_requests} requests, concurrency {concurrency}\n'
+            f"{'endpoint':<10}{'stack':<8}{'req/s':>10}"
+            f"{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}"
+        )
+        # The async lists read the database on every request: so do the
+        # sync ones, without the response cache and the menu snapshots.
+        with override_settings(CACHES={
+            **settings.CACHES, 'responses': DUMMY_CACHE
+        }):
+            for name, sync_url, async_url, params in workloads:
+                logged_in = Client()
+                logged_in.force_login(user)
+                sync_clients = [
+                    self.client_with(Client, logged_in.cookies)
+                    for _ in range(num_of_requests)
+                ]
+                async_clients = [
+                    self.client_with(AsyncClient, logged_in.cookies)
+                    for _ in range(num_of_requests)
+                ]
+                for stack, run, url, clients, data in [
+                    (
+                        'sync', self.run_sync, sync_url, sync_clients,
+                        {**params, 'page_size': SYNC_PAGE_SIZE}
+                    ),
+                    (
+                        'async', self.run_async, async_url, async_clients,
+                        params
+                    ),
+                ]:
+                    elapsed, latencies, errors = run(
+                        clients, 'get', url, data, concurrency
+                    )
+                    self.write_row(name, stack, elapsed, latencies, errors)
+        if options['votes']:
+            self.run_votes(options['votes'], concurrency)
+
+    def run_votes(self, num_of_votes, concurrency):
+        """
+        Casts ``num_of_votes`` votes on each stack in a new test database,
+        with caches of its own so that nothing of the run reaches the
+        configured ones, and the write-behind buffer off since it would
+        flush votes after the database is gone.
+        """
+        connection = connections[DEFAULT_DB_ALIAS]
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with override_settings(
+                CACHES={
+                    alias: {
+                        'BACKEND':
+                            'django.core.cache.backends.locmem.LocMemCache',
+                        'LOCATION': f'benchmark-votes-{alias}',
+                    }
+                    for alias in settings.CACHES
+                },
+                VOTING_WRITE_BEHIND=False,
+                VOTING_CUTOFF_TIME='',
+            ):
+                clear_voting_states()
+                menu, employees = self.seed_votes(2 * num_of_votes)
+                data = {'menu': menu.pk, 'voting_date': menu.upload_date}
+                for stack, run, url, client_class, voters in [
+                    (
+                        'sync', self.run_sync,
+                        reverse('api:voting-api-v1:vote-list-create'),
+                        Client, employees[:num_of_votes]
+                    ),
+                    (
+                        'async', self.run_async,
+                        reverse('api:voting-api-v1:async-vote-create'),
+                        AsyncClient, employees[num_of_votes:]
+                    ),
+                ]:
+                    clients = []
+                    for employee in voters:
+                        client = client_class(raise_request_exception=False)
+                        client.force_login(employee)
+                        clients.append(client)
+                    elapsed, latencies, errors = run(
+                        clients, 'post', url, data, concurrency
+                    )
+                    self.write_row('vote', stack, elapsed, latencies, errors)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            clear_voting_states()
+
+    def seed_votes(self, num_of_employees):
+        owner = CustomUser.objects.create(
+            username='benchmark_owner',
+            password=make_password(None),
+            user_type=CustomUser.UserType.RESTAURANT_OWNER
+        )
+        menu = Menu.objects.create(
+            restaurant=Restaurant.objects.create(
+                owner=owner, name='Benchmark Restaurant'
+            ),
+            upload_date=timezone.localdate()
+        )
+        password = make_password(None)
+        employees = CustomUser.objects.bulk_create(
+            CustomUser(
+                username=f'benchmark_employee_{i}',
+                password=password,
+                user_type=CustomUser.UserType.EMPLOYEE
+            )
+            for i in range(num_of_employees)
+        )
+        return menu, list(
+            CustomUser.objects.filter(
+                username__in=[employee.username for employee in employees]
+            ).order_by('pk')
+        )
+
+    def write_row(self, name, stack, elapsed, latencies, errors):
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{name:<10}{stack:<8}{len(latencies) / elapsed:>10.1f}'
+            f'{percentiles[49] * 1000:>10.1f}'
+            f'{percentiles[98] * 1000:>10.1f}{errors:>8}'
+        )
+
+    def client_with(self, client_class, cookies):
+        # Failed requests are counted as errors rather than raised.
+        client = client_class(raise_request_exception=False)
+        client.cookies = cookies
+        return client
+
+    def run_sync(self, clients, method, url, data, concurrency):
+        """ Sends one request per client from ``concurrency`` threads. """
+        def request(client):
+            started = time.perf_counter()
+            response = self.send(client, method, url, data)
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(request, clients))
+            elapsed = time.perf_counter() - started
+            self.close_worker_connections(pool, concurrency)
+        return self.summarize(elapsed, outcomes)
+
+    def run_async(self, clients, method, url, data, concurrency):
+        """ Sends one request per client, ``concurrency`` at a time. """
+        async def request(client, semaphore):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await self.send(client, method, url, data)
+                return time.perf_counter() - started, response.status_code
+
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+            outcomes = await asyncio.gather(*[
+                request(client, semaphore) for client in clients
+            ])
+            elapsed = time.perf_counter() - started
+            # Views run in the thread of sync_to_async, close it there.
+            await sync_to_async(connections.close_all)()
+            return elapsed, outcomes
+
+        started = time.perf_counter()
+        elapsed, outcomes = asyncio.run(run())
+        return self.summarize(elapsed, outcomes)
+
+    def send(self, client, method, url, data):
+        if method == 'get':
+            return client.get(url, data)
+        return client.post(url, data, content_type='application/json')
+
+    def close_worker_connections(self, pool, workers):
+        """
+        Closes the database connections of every thread of ``pool``, so
+        that the test database can be dropped: each of ``workers`` tasks
+        waits for the others and so runs on a thread of its own.
+        """
+        barrier = threading.Barrier(workers)
+
+        def close(_):
+            barrier.wait()
+            connections.close_all()
+
+        list(pool.map(close, range(workers)))
+
+    def summarize(self, elapsed, outcomes):
+        latencies = [latency for latency, _ in outcomes]
+        errors = sum(1 for _, status_code in outcomes if status_code >= 400)
+        return elapsed, latencies, errors
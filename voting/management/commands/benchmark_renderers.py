@@ -0,0 +1,98 @@
+import statistics
+import time
+
+from core.api.renderers import ORJSONRenderer
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from user.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares throughput and latency of the stock and orjson renderers '
+        'on the menu and vote list payloads of the configured database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--username',
+            required=True,
+            help='Existing user the payloads are fetched as.'
+        )
+        parser.add_argument(
+            '--date',
+            default=None,
+            help='Upload/voting date to query, defaults to today.'
+        )
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Number of rows per payload.'
+        )
+        parser.add_argument('--iterations', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            user = CustomUser.objects.get(username=options['username'])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f"No user named {options['username']}.")
+        date = options['date'] or timezone.localdate().isoformat()
+        client = Client()
+        client.force_login(user)
+        workloads = [
+            (
+                'menus',
+                reverse('api:voting-api-v1:menu-list-create'),
+                {'upload_date': date}
+            ),
+            (
+                'votes',
+                reverse('api:voting-api-v1:vote-list-create'),
+                {'voting_date': date}
+            ),
+        ]
+        renderers = [('stock', JSONRenderer()), ('orjson', ORJSONRenderer())]
+
+        self.stdout.write(
+            f"{options['iterations']} renders per payload\n"
+            f"{'payload':<10}{'renderer':<10}{'bytes':>10}{'MB/s':>10}"
+            f"{'p50 us':>10}{'p99 us':>10}"
+        )
+        for name, url, params in workloads:
+            response = client.get(
+                url, {**params, 'page_size': options['page_size']}
+            )
+            if response.status_code != 200:
+                raise CommandError(
+                    f'GET {url} returned {response.status_code}.'
+                )
+            outputs = set()
+            for renderer_name, renderer in renderers:
+                latencies, rendered = self.run(
+                    renderer, response.data, options['iterations']
+                )
+                outputs.add(rendered)
+                self.write_row(name, renderer_name, rendered, latencies)
+            if len(outputs) > 1:
+                self.stderr.write(f'The {name} payloads differ.')
+
+    def run(self, renderer, data, iterations):
+        latencies = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            rendered = renderer.render(data, 'application/json')
+            latencies.append(time.perf_counter() - started)
+        return latencies, rendered
+
+    def write_row(self, name, renderer_name, rendered, latencies):
+        percentiles = statistics.quantiles(latencies, n=100)
+        throughput = len(rendered) * len(latencies) / sum(latencies)
+        self.stdout.write(
+            f'{name:<10}{renderer_name:<10}{len(rendered):>10}'
+            f'{throughput / 1e6:>10.1f}'
+            f'{percentiles[49] * 1e6:>10.1f}{percentiles[98] * 1e6:>10.1f}'
+        )
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from voting.partitions import (
+    create_vote_partitions, is_vote_table_partitioned
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Creates the monthly vote partitions missing from the current '
+        'month on. The voting scheduler runs it every day.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=settings.VOTING_PARTITIONS_AHEAD,
+            help='Number of months after the current one to create.'
+        )
+
+    def handle(self, *args, **options):
+        if not is_vote_table_partitioned():
+            raise CommandError(
+                'The vote table is not partitioned, which needs PostgreSQL.'
+            )
+        if options['months_ahead'] < 0:
+            raise CommandError('--months-ahead must not be negative.')
+        created = create_vote_partitions(options['months_ahead'])
+        for name in created:
+            self.stdout.write(f'Created {name}.')
+        self.stdout.write(f'Created {len(created)} vote partitions.')
@@ -0,0 +1,208 @@
+import datetime
+import random
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from user.models import CustomUser
+from voting.models import Menu, Restaurant, Result, Vote
+
+# Indexes added for the queries below by 0011_voting_query_indexes.
+QUERY_INDEXES = [
+    'menu_date_votes_idx',
+    'vote_employee_id_idx',
+    'result_published_date_idx',
+    'restaurant_name_trgm_idx',
+]
+SEED_START_DATE = datetime.date(2022, 1, 3)
+
+
+class Command(BaseCommand):
+    help = (
+        'Prints the query plans (EXPLAIN ANALYZE on PostgreSQL) of the hot '
+        'voting queries, optionally next to the plans without the indexes '
+        'of 0011_voting_query_indexes and on a seeded synthetic dataset.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help=(
+                'Also explain each query with the voting query indexes '
+                'dropped in a transaction that is rolled back. This locks '
+                'the tables meanwhile, do not use it on a live database.'
+            )
+        )
+        parser.add_argument(
+            '--seed',
+            action='store_true',
+            help='Fill an empty database with a synthetic dataset first.'
+        )
+        parser.add_argument('--employees', type=int, default=20000)
+        parser.add_argument('--restaurants', type=int, default=20)
+        parser.add_argument('--days', type=int, default=250)
+        parser.add_argument(
+            '--random-seed',
+            type=int,
+            default=0,
+            help='Seed of the synthetic dataset, for reproducible reports.'
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(
+                options['employees'], options['restaurants'],
+                options['days'], random.Random(options['random_seed'])
+            )
+        upload_date = (
+            Menu.objects.order_by('-upload_date')
+            .values_list('upload_date', flat=True).first()
+        )
+        employee_id = (
+            Vote.objects.order_by('-id')
+            .values_list('employee_id', flat=True).first()
+        )
+        if upload_date is None or employee_id is None:
+            raise CommandError('No votes to explain, see --seed.')
+
+        self.stdout.write(
+            f'{Vote.objects.count()} votes, {Menu.objects.count()} menus, '
+            f'{connection.vendor}'
+        )
+        for name, queryset in [
+            (
+                'menus of a day',
+                Menu.objects.filter(upload_date=upload_date)
+                .order_by('-num_of_votes', 'id')[:11]
+            ),
+            (
+                'votes of an employee',
+                Vote.objects.filter(employee_id=employee_id)
+                .order_by('id')[:11]
+            ),
+            (
+                'vote of an employee on a day',
+                Vote.objects.filter(
+                    employee_id=employee_id, voting_date=upload_date
+                )
+            ),
+            (
+                'result of a day',
+                Result.objects.filter(voting_date=upload_date)
+            ),
+            (
+                'latest published result',
+                Result.objects.filter(is_voting_stopped=True)
+                .order_by('-voting_date')
+                .values_list('winning_menu__restaurant_id', 'winning_streak')
+                [:1]
+            ),
+            (
+                'restaurant search',
+                Restaurant.objects.filter(name__icontains='restaurant 1')
+            ),
+        ]:
+            if options['compare']:
+                self.write_plan(
+                    f'{name} (without indexes)',
+                    self.explain_without_indexes(queryset)
+                )
+            self.write_plan(name, self.explain(queryset))
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def explain_without_indexes(self, queryset):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for index in QUERY_INDEXES:
+                    cursor.execute(
+                        'DROP INDEX IF EXISTS '
+                        + connection.ops.quote_name(index)
+                    )
+            plan = self.explain(queryset)
+            transaction.set_rollback(True)
+        return plan
+
+    def write_plan(self, name, plan):
+        self.stdout.write(f'\n== {name}\n{plan}')
+
+    def seed(self, num_of_employees, num_of_restaurants, num_of_days, rng):
+        if Vote.objects.exists() or Menu.objects.exists():
+            raise CommandError('--seed needs a database without menus.')
+        self.stdout.write(
+            f'Seeding {num_of_employees} employees, {num_of_restaurants} '
+            f'restaurants and {num_of_days} days.'
+        )
+        password = make_password(None)
+        with transaction.atomic():
+            owner = CustomUser.objects.create(
+                username='explain_owner',
+                user_type=CustomUser.UserType.RESTAURANT_OWNER,
+                password=password
+            )
+            Restaurant.objects.bulk_create([
+                Restaurant(owner=owner, name=f'Restaurant {i}')
+                for i in range(num_of_restaurants)
+            ])
+            restaurants = list(Restaurant.objects.order_by('id'))
+            CustomUser.objects.bulk_create([
+                CustomUser(
+                    username=f'explain_employee_{i}',
+                    user_type=CustomUser.UserType.EMPLOYEE,
+                    password=password
+                )
+                for i in range(num_of_employees)
+            ], batch_size=5000)
+            employee_ids = list(
+                CustomUser.objects.filter(
+                    user_type=CustomUser.UserType.EMPLOYEE
+                ).values_list('id', flat=True)
+            )
+
+        for day in range(num_of_days):
+            self.seed_day(
+                SEED_START_DATE + datetime.timedelta(days=day),
+                restaurants, employee_ids, rng,
+                is_last=day == num_of_days - 1
+            )
+
+    def seed_day(self, upload_date, restaurants, employee_ids, rng,
+                 is_last):
+        # Counts are set up front and votes written without adjusting
+        # them, one bulk insert per day instead of a counter update each.
+        choices = [rng.randrange(len(restaurants)) for _ in employee_ids]
+        counts = Counter(choices)
+        with transaction.atomic():
+            Menu.objects.bulk_create([
+                Menu(
+                    restaurant=restaurant,
+                    upload_date=upload_date,
+                    menu_image=f'menu/{upload_date}/{restaurant.pk}.jpg',
+                    num_of_votes=counts[i]
+                )
+                for i, restaurant in enumerate(restaurants)
+            ])
+            menu_ids = dict(
+                Menu.objects.filter(upload_date=upload_date)
+                .values_list('restaurant_id', 'id')
+            )
+            Vote._base_manager.bulk_create([
+                Vote(
+                    employee_id=employee_id,
+                    menu_id=menu_ids[restaurants[choice].pk],
+                    voting_date=upload_date
+                )
+                for employee_id, choice in zip(employee_ids, choices)
+            ], batch_size=5000)
+            if not is_last:
+                winner, _ = counts.most_common(1)[0]
+                Result.objects.bulk_create([Result(
+                    voting_date=upload_date,
+                    winning_menu_id=menu_ids[restaurants[winner].pk],
+                    is_voting_stopped=True
+                )])
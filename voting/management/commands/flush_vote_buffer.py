@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from voting.buffer import get_vote_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes the votes of the write-behind buffer into the database. '
+        'Run it with --interval as a dedicated flusher worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep running and flush every INTERVAL seconds.'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        vote_buffer = get_vote_buffer()
+        while True:
+            num_of_votes = vote_buffer.flush_all()
+            if options['verbosity'] > 1 or not interval:
+                self.stdout.write(f'Flushed {num_of_votes} votes.')
+            if not interval:
+                break
+            time.sleep(interval)
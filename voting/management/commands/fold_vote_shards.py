@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from voting.services import fold_vote_shards
+
+
+class Command(BaseCommand):
+    help = (
+        'Folds the sharded vote counters back into Menu.num_of_votes. '
+        'Run it with --interval as a worker when VOTING_COUNTER_SHARDS '
+        'is set.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep running and fold every INTERVAL seconds.'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            num_of_menus = fold_vote_shards()
+            if options['verbosity'] > 1 or not interval:
+                self.stdout.write(f'Folded votes of {num_of_menus} menus.')
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,76 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from voting.partitions import votes_retained_since
+from voting.utils import recompute_results
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the results of a date range from the votes, e.g. after '
+        'data repairs. Days are replayed in order, so winning streaks come '
+        'out as if every day was published in turn.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=datetime.date.fromisoformat,
+            required=True,
+            help='First voting date to recompute (YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--end',
+            type=datetime.date.fromisoformat,
+            default=None,
+            help=(
+                'Last voting date to recompute, before today. Defaults to '
+                'yesterday.'
+            )
+        )
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=31,
+            help='Number of days whose menus are loaded per query.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows per bulk insert or update.'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        start = options['start']
+        end = options['end'] or today - datetime.timedelta(days=1)
+        if start > end:
+            raise CommandError('--start must not be after --end.')
+        if end >= today:
+            # Recomputing stops the voting of every day in the range.
+            raise CommandError(
+                'Cannot recompute results of today or later days, '
+                'their voting is not over.'
+            )
+        retained_since = votes_retained_since()
+        if retained_since and start < retained_since:
+            raise CommandError(
+                f'The votes before {retained_since} are archived, '
+                'recompute from then on.'
+            )
+
+        started = time.perf_counter()
+        num_of_days = recompute_results(
+            start,
+            end,
+            chunk_days=options['chunk_days'],
+            batch_size=options['batch_size']
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Recomputed {num_of_days} results in {elapsed:.2f}s '
+            f'({num_of_days / elapsed:.1f} days/s).'
+        )
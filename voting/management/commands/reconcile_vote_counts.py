@@ -0,0 +1,76 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from voting.services import reconcile_vote_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares Menu.num_of_votes with the votes of each menu and fixes '
+        'the counters that drifted. Safe to run while votes are cast.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=datetime.date.fromisoformat,
+            default=None,
+            help='First upload date to check (YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--end',
+            type=datetime.date.fromisoformat,
+            default=None,
+            help='Last upload date to check (YYYY-MM-DD).'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Check only the menus of the last DAYS days.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of menus counted per query.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the drift, change nothing.'
+        )
+
+    def handle(self, *args, **options):
+        start, end = options['start'], options['end']
+        if options['days'] is not None:
+            if start is not None:
+                raise CommandError('Use either --days or --start.')
+            start = timezone.localdate() - datetime.timedelta(
+                days=options['days']
+            )
+        if start and end and start > end:
+            raise CommandError('--start must not be after --end.')
+
+        started = time.perf_counter()
+        num_of_menus = total_drift = 0
+        for drift in reconcile_vote_counts(
+            start=start,
+            end=end,
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run']
+        ):
+            num_of_menus += 1
+            total_drift += abs(drift.actual - drift.stored)
+            self.stdout.write(
+                f'Menu {drift.menu_id} ({drift.upload_date}): '
+                f'{drift.stored} counted, {drift.actual} votes.'
+            )
+        elapsed = time.perf_counter() - started
+        action = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(
+            f'{action} {num_of_menus} drifted menus, {total_drift} votes '
+            f'off in total, in {elapsed:.2f}s.'
+        )
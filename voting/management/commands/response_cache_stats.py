@@ -0,0 +1,17 @@
+from core.api.response_cache import response_cache_stats
+from django.core.management.base import BaseCommand
+
+SCOPES = ['restaurants', 'menus', 'results']
+
+
+class Command(BaseCommand):
+    help = 'Reports hits and misses of the cached list responses.'
+
+    def handle(self, *args, **options):
+        for scope, counts in response_cache_stats(SCOPES).items():
+            total = counts['hit'] + counts['miss']
+            ratio = counts['hit'] / total if total else 0
+            self.stdout.write(
+                f"{scope}: {counts['hit']} hits, {counts['miss']} misses "
+                f'({ratio:.0%} hit ratio)'
+            )
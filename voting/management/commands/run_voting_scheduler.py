@@ -0,0 +1,111 @@
+import datetime
+import time
+
+from core.api.response_cache import warm_cached_list
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.urls import reverse
+from django.utils import timezone
+from user.models import CustomUser
+from voting.api.v1.views import MenuListCreateAPIView, ResultAPIView
+from voting.partitions import create_vote_partitions
+from voting.state import get_voting_state, is_past_cutoff, voting_cutoff
+from voting.utils import update_result
+
+
+class Command(BaseCommand):
+    help = (
+        'Closes the voting every day at VOTING_CUTOFF_TIME by publishing '
+        'the result and warming the cached result and menu lists of the '
+        'day for VOTING_WARM_HOSTS. Meant to run as a long-lived worker; '
+        'a cutoff that passed while it was not running is caught up on '
+        'start. Also creates the vote partitions of the coming months '
+        'once a day.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Publish today's result if its cutoff passed, then exit."
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=60,
+            help='Longest time in seconds to sleep between clock checks.'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.VOTING_CUTOFF_TIME:
+            raise CommandError('VOTING_CUTOFF_TIME is not set.')
+        closed_date = partitioned_date = None
+        while True:
+            today = timezone.localdate()
+            if partitioned_date != today:
+                self.create_partitions()
+                partitioned_date = today
+            if closed_date != today and is_past_cutoff(today):
+                self.close_voting(today)
+                closed_date = today
+            if options['once']:
+                break
+            next_cutoff = voting_cutoff(today)
+            if closed_date == today:
+                next_cutoff = voting_cutoff(today + datetime.timedelta(1))
+            remaining = (next_cutoff - timezone.now()).total_seconds()
+            time.sleep(max(0, min(remaining, options['poll'])))
+
+    def create_partitions(self):
+        try:
+            for name in create_vote_partitions():
+                self.stdout.write(f'Created vote partition {name}.')
+        finally:
+            close_old_connections()
+
+    def close_voting(self, voting_date):
+        try:
+            success, result = update_result(voting_date)
+            # Have the state ready for the votes that keep coming in.
+            get_voting_state(voting_date)
+            self.warm_lists(voting_date)
+        finally:
+            close_old_connections()
+        if success:
+            self.stdout.write(
+                f'Voting on {voting_date} closed, '
+                f'winner: {result.winning_menu}.'
+            )
+        else:
+            self.stdout.write(
+                f'Voting on {voting_date} closed, no menu found.'
+            )
+
+    def warm_lists(self, voting_date):
+        """
+        Renders the lists everyone polls once the day is closed, as any
+        employee gets them.
+        """
+        user = CustomUser(
+            username='voting-scheduler',
+            user_type=CustomUser.UserType.EMPLOYEE
+        )
+        for view, url_name, date_param in [
+            (ResultAPIView, 'result', 'voting_date'),
+            (MenuListCreateAPIView, 'menu-list-create', 'upload_date'),
+        ]:
+            path = '{}?{}={}'.format(
+                reverse(f'api:voting-api-v1:{url_name}'),
+                date_param,
+                voting_date.isoformat()
+            )
+            for host in settings.VOTING_WARM_HOSTS:
+                try:
+                    warm_cached_list(view.as_view(), path, host, user)
+                except DisallowedHost:
+                    self.stderr.write(
+                        f'Cannot warm {path} for {host}, it is not in '
+                        'ALLOWED_HOSTS.'
+                    )
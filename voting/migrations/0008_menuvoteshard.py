@@ -0,0 +1,34 @@
+# Generated by Django 3.2.13 on 2026-10-18 13:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0007_alter_menu_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuVoteShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('shard', models.PositiveSmallIntegerField(verbose_name='Shard')),
+                ('num_of_votes', models.IntegerField(default=0, verbose_name='Number of Votes')),
+                ('menu', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vote_shards', to='voting.menu', verbose_name='Menu')),
+            ],
+            options={
+                'verbose_name': 'Menu Vote Shard',
+                'verbose_name_plural': 'Menu Vote Shards',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='menuvoteshard',
+            constraint=models.UniqueConstraint(fields=('menu', 'shard'), name='unique_menu_vote_shard'),
+        ),
+    ]
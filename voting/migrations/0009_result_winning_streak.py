@@ -0,0 +1,49 @@
+# Generated by Django 3.2.13 on 2026-10-18 13:51
+
+from django.db import migrations, models
+
+
+def build_winning_streaks(apps, schema_editor):
+    Result = apps.get_model('voting', 'Result')
+    run = (None, 0)
+    changed = []
+    for pk, restaurant_id in (
+        Result.objects
+        .filter(is_voting_stopped=True)
+        .order_by('voting_date')
+        .values_list('pk', 'winning_menu__restaurant_id')
+    ):
+        if restaurant_id is None:
+            streak = 0
+        elif restaurant_id == run[0]:
+            streak = run[1] + 1
+        else:
+            streak = 1
+        run = (restaurant_id, streak)
+        if streak:
+            changed.append(Result(pk=pk, winning_streak=streak))
+    Result.objects.bulk_update(changed, ['winning_streak'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0008_menuvoteshard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='winning_streak',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Winning Streak'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['voting_date', 'winning_menu'], name='result_date_winning_menu_idx'),
+        ),
+        migrations.RunPython(build_winning_streaks, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='restaurant',
+            name='winning_streak',
+        ),
+    ]
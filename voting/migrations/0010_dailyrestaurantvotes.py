@@ -0,0 +1,40 @@
+# Generated by Django 3.2.13 on 2026-10-18 13:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0009_result_winning_streak'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRestaurantVotes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('modified_date', models.DateTimeField(auto_now=True)),
+                ('voting_date', models.DateField(verbose_name='Voting Date')),
+                ('num_of_votes', models.PositiveIntegerField(default=0, verbose_name='Number of Votes')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Rank')),
+                ('is_winner', models.BooleanField(default=False, verbose_name='Is Winner')),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_votes', to='voting.restaurant', verbose_name='Restaurant')),
+            ],
+            options={
+                'verbose_name': 'Daily Restaurant Votes',
+                'verbose_name_plural': 'Daily Restaurant Votes',
+                'ordering': ['restaurant', 'voting_date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dailyrestaurantvotes',
+            index=models.Index(fields=['voting_date', 'restaurant'], name='daily_votes_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrestaurantvotes',
+            constraint=models.UniqueConstraint(fields=('restaurant', 'voting_date'), name='unique_restaurant_daily_votes'),
+        ),
+    ]
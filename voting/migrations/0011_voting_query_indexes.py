@@ -0,0 +1,57 @@
+# Generated by Django 3.2.13 on 2026-10-18 14:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_restaurant_name_trigram_index(apps, schema_editor):
+    """
+    Serves the admin's name search, which icontains turns into
+    ``UPPER(name) LIKE UPPER('%...%')``. PostgreSQL only.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS restaurant_name_trgm_idx '
+        'ON voting_restaurant USING gin ((UPPER(name)) gin_trgm_ops)'
+    )
+
+
+def drop_restaurant_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS restaurant_name_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('voting', '0010_dailyrestaurantvotes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='menu',
+            index=models.Index(fields=['upload_date', '-num_of_votes', 'id'], name='menu_date_votes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(condition=models.Q(('is_voting_stopped', True)), fields=['-voting_date'], name='result_published_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['employee', 'id'], name='vote_employee_id_idx'),
+        ),
+        migrations.AlterField(
+            model_name='vote',
+            name='employee',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='votes', to=settings.AUTH_USER_MODEL, verbose_name='Employee'),
+        ),
+        migrations.RunPython(
+            create_restaurant_name_trigram_index,
+            drop_restaurant_name_trigram_index
+        ),
+    ]
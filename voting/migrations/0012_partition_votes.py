@@ -0,0 +1,93 @@
+import datetime
+
+from django.db import migrations
+
+# Partitions created ahead of the current month; the voting scheduler
+# keeps VOTING_PARTITIONS_AHEAD of them from then on.
+MONTHS_AHEAD = 3
+
+
+def add_months(date, months):
+    month = date.month - 1 + months
+    return datetime.date(date.year + month // 12, month % 12 + 1, 1)
+
+
+def rebuild_vote_table(apps, schema_editor, partitioned):
+    """
+    Copies the votes into a new ``voting_vote`` table, partitioned by
+    month of ``voting_date`` or not, and recreates its keys, constraints
+    and indexes under their names. The primary key of a partitioned table
+    has to contain the partition key, ids stay unique through their
+    sequence.
+    """
+    Vote = apps.get_model('voting', 'Vote')
+    connection = schema_editor.connection
+    execute = schema_editor.execute
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_get_serial_sequence('voting_vote', 'id')")
+        sequence, = cursor.fetchone()
+        cursor.execute('SELECT MIN(voting_date) FROM voting_vote')
+        first_voting_date, = cursor.fetchone()
+
+    execute(f'ALTER SEQUENCE {sequence} OWNED BY NONE')
+    execute('ALTER TABLE voting_vote RENAME TO voting_vote_old')
+    execute(
+        'CREATE TABLE voting_vote (LIKE voting_vote_old INCLUDING DEFAULTS)'
+        + (' PARTITION BY RANGE (voting_date)' if partitioned else '')
+    )
+    if partitioned:
+        today = datetime.date.today()
+        start = add_months(min(first_voting_date or today, today), 0)
+        while start <= add_months(today, MONTHS_AHEAD):
+            end = add_months(start, 1)
+            execute(
+                f'CREATE TABLE voting_vote_{start:%Y_%m} '
+                'PARTITION OF voting_vote FOR VALUES FROM (%s) TO (%s)',
+                [start.isoformat(), end.isoformat()]
+            )
+            start = end
+        # Catches the votes of months whose partition is missing.
+        execute(
+            'CREATE TABLE voting_vote_default PARTITION OF voting_vote DEFAULT'
+        )
+    execute('INSERT INTO voting_vote SELECT * FROM voting_vote_old')
+    execute('DROP TABLE voting_vote_old')
+    execute(f'ALTER SEQUENCE {sequence} OWNED BY voting_vote.id')
+
+    execute(
+        'ALTER TABLE voting_vote ADD CONSTRAINT voting_vote_pkey '
+        + ('PRIMARY KEY (id, voting_date)' if partitioned
+           else 'PRIMARY KEY (id)')
+    )
+    for constraint in Vote._meta.constraints:
+        schema_editor.add_constraint(Vote, constraint)
+    for sql in schema_editor._model_indexes_sql(Vote):
+        execute(sql)
+    for field in Vote._meta.local_fields:
+        if field.remote_field:
+            execute(schema_editor._create_fk_sql(
+                Vote, field, '_fk_%(to_table)s_%(to_column)s'
+            ))
+
+
+def partition_votes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    rebuild_vote_table(apps, schema_editor, partitioned=True)
+
+
+def unpartition_votes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    rebuild_vote_table(apps, schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voting', '0011_voting_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_votes, unpartition_votes),
+    ]
@@ -1,10 +1,36 @@
-from django.db import models
+import datetime
+
+from django.db import models, router, transaction
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from core.models import ModelWithTimestamp
 from user.models import CustomUser
 
 
+class RestaurantQuerySet(models.QuerySet):
+
+    def with_winning_streak(self):
+        """
+        Annotates ``winning_streak`` in the same query, so that listing
+        restaurants does not look the streak up once per restaurant.
+        """
+        published = Result.objects.filter(
+            is_voting_stopped=True
+        ).order_by('-voting_date')
+        return self.annotate(winning_streak=Coalesce(
+            models.Subquery(
+                published.filter(
+                    voting_date=models.Subquery(
+                        published.values('voting_date')[:1]
+                    ),
+                    winning_menu__restaurant=models.OuterRef('pk')
+                ).values('winning_streak')[:1]
+            ),
+            0
+        ))
+
+
 class Restaurant(ModelWithTimestamp):
     owner = models.ForeignKey(
         verbose_name=_('Owner'),
@@ -27,10 +53,11 @@ class Restaurant(ModelWithTimestamp):
         blank=True,
         default=""
     )
-    winning_streak = models.PositiveIntegerField(
-        verbose_name=_('Winning Streak'),
-        default=0
-    )
+
+    objects = RestaurantQuerySet.as_manager()
+
+    # Set by RestaurantQuerySet.with_winning_streak or assigned directly.
+    _winning_streak = None
 
     class Meta:
         ordering = ['id']
@@ -40,13 +67,24 @@ class Restaurant(ModelWithTimestamp):
     def __str__(self):
         return self.name
 
-    def increment_winning_streak(self):
-        self.winning_streak = models.F('winning_streak') + 1
-        self.save()
+    @property
+    def winning_streak(self):
+        """
+        Number of consecutive published results, up to the latest one,
+        won by this restaurant.
+        """
+        if self._winning_streak is not None:
+            return self._winning_streak
+        restaurant_id, streak = Result.objects.winning_run()
+        return streak if restaurant_id == self.pk else 0
 
-    def reset_winning_streak(self):
-        self.winning_streak = 0
-        self.save()
+    @winning_streak.setter
+    def winning_streak(self, value):
+        self._winning_streak = value
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._winning_streak = None
 
 
 def menu_image_upload_path(instance, filename):
@@ -83,25 +121,156 @@ class Menu(ModelWithTimestamp):
                 name='unique_restaurant_menu_per_day'
             )
         ]
+        indexes = [
+            # The menus of a day in list order.
+            models.Index(
+                fields=['upload_date', '-num_of_votes', 'id'],
+                name='menu_date_votes_idx'
+            )
+        ]
 
     def __str__(self):
         return f'{self.restaurant}_{self.id}'
 
     def increment_num_of_votes(self):
-        self.num_of_votes = models.F('num_of_votes') + 1
-        self.save()
+        from voting.services import adjust_num_of_votes
+        adjust_num_of_votes({(self.pk, None): 1}, using=self._state.db)
 
     def decrement_num_of_votes(self):
-        self.num_of_votes = models.F('num_of_votes') - 1
-        self.save()
+        from voting.services import adjust_num_of_votes
+        adjust_num_of_votes({(self.pk, None): -1}, using=self._state.db)
+
+
+class MenuVoteShard(ModelWithTimestamp):
+    """
+    One of ``VOTING_COUNTER_SHARDS`` partial vote counters of a menu.
+
+    Spreads the counter updates of a popular menu over several rows so
+    they do not queue up behind one row lock. The shards are folded back
+    into ``Menu.num_of_votes`` periodically and before a result is
+    published, so a shard may go negative in between.
+    """
+    menu = models.ForeignKey(
+        verbose_name=_('Menu'),
+        to=Menu,
+        related_name='vote_shards',
+        on_delete=models.CASCADE
+    )
+    shard = models.PositiveSmallIntegerField(
+        verbose_name=_('Shard')
+    )
+    num_of_votes = models.IntegerField(
+        verbose_name=_('Number of Votes'),
+        default=0
+    )
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = _('Menu Vote Shard')
+        verbose_name_plural = _('Menu Vote Shards')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['menu', 'shard'],
+                name='unique_menu_vote_shard'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.menu}_{self.shard}'
+
+
+class VoteQuerySet(models.QuerySet):
+    """
+    Keeps ``Menu.num_of_votes`` in step for the bulk paths that bypass
+    ``Vote.save``/``Vote.delete`` (admin actions, scripts, services).
+    ``bulk_update`` is covered through ``update``.
+    """
+
+    def _lock_vote_keys(self):
+        return {
+            pk: (menu_id, employee_id)
+            for pk, menu_id, employee_id in (
+                self.select_for_update()
+                .values_list('pk', 'menu_id', 'employee_id')
+            )
+        }
+
+    def update(self, **kwargs):
+        if 'menu' not in kwargs and 'menu_id' not in kwargs:
+            return super().update(**kwargs)
+        from voting.services import adjust_num_of_votes, vote_deltas
+        with transaction.atomic(using=self.db, savepoint=False):
+            previous_keys = self._lock_vote_keys()
+            votes = (
+                self.model._base_manager.using(self.db)
+                .filter(pk__in=previous_keys)
+            )
+            updated = models.QuerySet.update(votes, **kwargs)
+            new_menu_id = kwargs.get('menu', kwargs.get('menu_id'))
+            if isinstance(new_menu_id, Menu):
+                new_menu_id = new_menu_id.pk
+            if isinstance(new_menu_id, int):
+                new_keys = [
+                    (new_menu_id, employee_id)
+                    for _, employee_id in previous_keys.values()
+                ]
+            else:
+                # An expression such as the Case built by bulk_update.
+                new_keys = votes.values_list('menu_id', 'employee_id')
+            adjust_num_of_votes(
+                vote_deltas(added=new_keys, removed=previous_keys.values()),
+                using=self.db
+            )
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        from voting.services import adjust_num_of_votes, vote_deltas
+        with transaction.atomic(using=self.db, savepoint=False):
+            keys = self._lock_vote_keys()
+            deleted = (
+                self.model._base_manager.using(self.db)
+                .filter(pk__in=keys)
+                .delete()
+            )
+            adjust_num_of_votes(
+                vote_deltas(removed=keys.values()),
+                using=self.db
+            )
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False):
+        if ignore_conflicts:
+            raise ValueError(
+                'Votes cannot be bulk created with ignore_conflicts, '
+                'the skipped rows would still be counted.'
+            )
+        from voting.services import adjust_num_of_votes, vote_deltas
+        objs = list(objs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = super().bulk_create(objs, batch_size=batch_size)
+            adjust_num_of_votes(
+                vote_deltas(added=[vote.vote_key for vote in objs]),
+                using=self.db
+            )
+        for vote in created:
+            vote._loaded_menu_id = vote.menu_id
+        return created
 
 
 class Vote(ModelWithTimestamp):
+    # Looked up through unique_employee_vote_per_day and
+    # vote_employee_id_idx, which both start with the employee.
     employee = models.ForeignKey(
         verbose_name=_('Employee'),
         to=CustomUser,
         related_name='votes',
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
     menu = models.ForeignKey(
         verbose_name=_('Menu'),
@@ -113,6 +282,12 @@ class Vote(ModelWithTimestamp):
         verbose_name=_('Voting Date')
     )
 
+    objects = VoteQuerySet.as_manager()
+
+    # menu_id as last read from or written to the database, so that a
+    # changed vote can move its count without re-reading the row.
+    _loaded_menu_id = None
+
     class Meta:
         ordering = ['id']
         verbose_name = _('Vote')
@@ -123,6 +298,119 @@ class Vote(ModelWithTimestamp):
                 name='unique_employee_vote_per_day'
             )
         ]
+        indexes = [
+            # The vote list of an employee, paged by id.
+            models.Index(
+                fields=['employee', 'id'],
+                name='vote_employee_id_idx'
+            )
+        ]
+
+    @property
+    def vote_key(self):
+        return self.menu_id, self.employee_id
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_menu_id = instance.__dict__.get('menu_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        from voting.services import adjust_num_of_votes, vote_deltas
+        using = kwargs.get('using') or router.db_for_write(
+            Vote, instance=self
+        )
+        update_fields = kwargs.get('update_fields')
+        adding = self._state.adding
+        with transaction.atomic(using=using, savepoint=False):
+            if adding:
+                deltas = vote_deltas(added=[self.vote_key])
+            elif update_fields is not None and not (
+                {'menu', 'menu_id'} & set(update_fields)
+            ):
+                deltas = {}
+            else:
+                previous_menu_id = self._loaded_menu_id
+                if previous_menu_id is None:
+                    previous_menu_id = (
+                        Vote.objects.using(using)
+                        .select_for_update()
+                        .values_list('menu_id', flat=True)
+                        .get(pk=self.pk)
+                    )
+                deltas = vote_deltas(
+                    added=[self.vote_key],
+                    removed=[(previous_menu_id, self.employee_id)]
+                )
+            super().save(*args, **kwargs)
+            adjust_num_of_votes(
+                deltas, using=using,
+                upload_dates=[self.voting_date] if adding else None
+            )
+        self._loaded_menu_id = self.menu_id
+
+    def delete(self, *args, **kwargs):
+        from voting.services import adjust_num_of_votes, vote_deltas
+        using = kwargs.get('using') or router.db_for_write(
+            Vote, instance=self
+        )
+        menu_id = self._loaded_menu_id or self.menu_id
+        with transaction.atomic(using=using, savepoint=False):
+            deleted = super().delete(*args, **kwargs)
+            if deleted[0]:
+                adjust_num_of_votes(
+                    vote_deltas(removed=[(menu_id, self.employee_id)]),
+                    using=using, upload_dates=[self.voting_date]
+                )
+        return deleted
+
+
+def next_winning_streak(run, restaurant_id):
+    """
+    Returns the streak of ``restaurant_id`` winning right after the run
+    ``(restaurant_id, streak)`` of the previous published result.
+    """
+    if restaurant_id is None:
+        return 0
+    previous_restaurant_id, streak = run
+    return streak + 1 if restaurant_id == previous_restaurant_id else 1
+
+
+class ResultQuerySet(models.QuerySet):
+
+    def winning_run(self, before=None):
+        """
+        Returns ``(restaurant_id, winning_streak)`` of the latest published
+        result, optionally before the ``before`` date, or ``(None, 0)``.
+        """
+        published = self.filter(is_voting_stopped=True)
+        if before is not None:
+            published = published.filter(voting_date__lt=before)
+        return published.order_by('-voting_date').values_list(
+            'winning_menu__restaurant_id', 'winning_streak'
+        ).first() or (None, 0)
+
+    def rebuild_winning_streaks(self, since, run=None):
+        """
+        Recomputes ``winning_streak`` of the published results from the
+        ``since`` date on, following the run of the result before it.
+        Returns the number of results that changed.
+        """
+        if run is None:
+            run = self.winning_run(before=since)
+        changed = []
+        for pk, restaurant_id, stored_streak in (
+            self.filter(is_voting_stopped=True, voting_date__gte=since)
+            .order_by('voting_date')
+            .values_list('pk', 'winning_menu__restaurant_id', 'winning_streak')
+        ):
+            streak = next_winning_streak(run, restaurant_id)
+            run = (restaurant_id, streak)
+            if streak != stored_streak:
+                changed.append(Result(pk=pk, winning_streak=streak))
+        self.bulk_update(changed, ['winning_streak'])
+        return len(changed)
 
 
 class Result(ModelWithTimestamp):
@@ -142,11 +430,32 @@ class Result(ModelWithTimestamp):
         verbose_name=_('Is Voting Stopped'),
         default=False
     )
+    # Consecutive published results, up to this one, won by the
+    # restaurant of winning_menu. Kept in step by save().
+    winning_streak = models.PositiveIntegerField(
+        verbose_name=_('Winning Streak'),
+        default=0,
+        editable=False
+    )
+
+    objects = ResultQuerySet.as_manager()
 
     class Meta:
         ordering = ['id']
         verbose_name = _('Result')
         verbose_name_plural = _('Results')
+        indexes = [
+            models.Index(
+                fields=['voting_date', 'winning_menu'],
+                name='result_date_winning_menu_idx'
+            ),
+            # The latest published results, for the winning streaks.
+            models.Index(
+                fields=['-voting_date'],
+                condition=models.Q(is_voting_stopped=True),
+                name='result_published_date_idx'
+            )
+        ]
 
     def stop_voting(self):
         self.is_voting_stopped = True
@@ -160,8 +469,75 @@ class Result(ModelWithTimestamp):
             )
 
     def save(self, *args, **kwargs):
+        from voting.state import invalidate_voting_state
         if self.is_voting_stopped and self.winning_menu is None:
             raise ValidationError(
                 message='Voting cannot be stopped without a winning menu.'
             )
-        super(Result, self).save(*args, **kwargs)
+        run = Result.objects.winning_run(before=self.voting_date)
+        if self.is_voting_stopped:
+            self.winning_streak = next_winning_streak(
+                run, self.winning_menu.restaurant_id
+            )
+            run = (self.winning_menu.restaurant_id, self.winning_streak)
+        else:
+            self.winning_streak = 0
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'winning_streak'}
+        with transaction.atomic(savepoint=False):
+            super(Result, self).save(*args, **kwargs)
+            # An edited past result changes the streaks after it.
+            Result.objects.rebuild_winning_streaks(
+                self.voting_date + datetime.timedelta(days=1), run=run
+            )
+        invalidate_voting_state(self.voting_date)
+
+
+class DailyRestaurantVotes(ModelWithTimestamp):
+    """
+    Votes of one restaurant on one voting day, for analytics.
+
+    Rolled up from the menus and results when a day is published, so that
+    trends over long periods are read without touching ``Vote``.
+    """
+    restaurant = models.ForeignKey(
+        verbose_name=_('Restaurant'),
+        to=Restaurant,
+        related_name='daily_votes',
+        on_delete=models.CASCADE
+    )
+    voting_date = models.DateField(
+        verbose_name=_('Voting Date')
+    )
+    num_of_votes = models.PositiveIntegerField(
+        verbose_name=_('Number of Votes'),
+        default=0
+    )
+    rank = models.PositiveSmallIntegerField(
+        verbose_name=_('Rank')
+    )
+    is_winner = models.BooleanField(
+        verbose_name=_('Is Winner'),
+        default=False
+    )
+
+    class Meta:
+        ordering = ['restaurant', 'voting_date']
+        verbose_name = _('Daily Restaurant Votes')
+        verbose_name_plural = _('Daily Restaurant Votes')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['restaurant', 'voting_date'],
+                name='unique_restaurant_daily_votes'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['voting_date', 'restaurant'],
+                name='daily_votes_date_idx'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.restaurant}_{self.voting_date}'
@@ -0,0 +1,210 @@
+"""
+Monthly partitions of the vote table, PostgreSQL only.
+
+``0012_partition_votes`` turns ``voting_vote`` into a table partitioned by
+range of ``voting_date``, one partition per month named
+``voting_vote_YYYY_MM``. ``create_vote_partitions`` adds the missing
+ones up to ``VOTING_PARTITIONS_AHEAD`` months ahead; the voting scheduler
+and ``archive_vote_partitions`` run it. Votes of a month that has no
+partition yet go to the default partition ``voting_vote_default``, and
+are moved to their month's partition when it is created.
+
+``archive_vote_partition`` writes the votes of a month to a gzipped CSV
+file and drops its partition. The history of the month stays queryable
+without them: menus keep their ``num_of_votes``, results are left alone
+and the month is rolled up into ``DailyRestaurantVotes`` first.
+
+On other databases the votes are not partitioned and nothing here does
+anything.
+"""
+import datetime
+import gzip
+import os
+import re
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+VOTE_TABLE = 'voting_vote'
+DEFAULT_PARTITION = 'voting_vote_default'
+
+VotePartition = namedtuple('VotePartition', ['name', 'start', 'end'])
+
+_RANGE_BOUND = re.compile(
+    r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)"
+)
+
+
+def add_months(date, months):
+    """ First day of the month ``months`` months after that of ``date``. """
+    month = date.month - 1 + months
+    return datetime.date(date.year + month // 12, month % 12 + 1, 1)
+
+
+def vote_partition_name(start):
+    return f'{VOTE_TABLE}_{start:%Y_%m}'
+
+
+def is_vote_table_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table '
+            'WHERE partrelid = to_regclass(%s)',
+            [VOTE_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def vote_partitions():
+    """
+    The ``VotePartition`` of every month with votes, oldest first. The
+    default partition is not one of them.
+    """
+    if not is_vote_table_partitioned():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname, '
+            'pg_get_expr(child.relpartbound, child.oid) '
+            'FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s)',
+            [VOTE_TABLE]
+        )
+        rows = cursor.fetchall()
+    partitions = []
+    for name, bound in rows:
+        match = _RANGE_BOUND.search(bound)
+        if match:
+            partitions.append(VotePartition(
+                name,
+                datetime.date.fromisoformat(match[1]),
+                datetime.date.fromisoformat(match[2])
+            ))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def votes_retained_since():
+    """
+    First voting date whose votes were not archived, ``None`` when the
+    votes are not partitioned and so never archived.
+    """
+    partitions = vote_partitions()
+    return partitions[0].start if partitions else None
+
+
+def create_vote_partitions(months_ahead=None, today=None):
+    """
+    Creates the missing partitions of the current month and of the
+    ``months_ahead`` (default ``VOTING_PARTITIONS_AHEAD``) next ones,
+    moving their votes out of the default partition. Returns the names
+    of the partitions created.
+    """
+    if not is_vote_table_partitioned():
+        return []
+    if months_ahead is None:
+        months_ahead = settings.VOTING_PARTITIONS_AHEAD
+    this_month = add_months(today or timezone.localdate(), 0)
+    existing = {partition.start for partition in vote_partitions()}
+    created = []
+    for months in range(months_ahead + 1):
+        start = add_months(this_month, months)
+        if start not in existing:
+            _create_vote_partition(start)
+            created.append(vote_partition_name(start))
+    return created
+
+
+def _create_vote_partition(start):
+    """
+    Creates the partition of the month of ``start``. A new partition may
+    not cover rows of the default one, so when the default partition
+    holds votes of the month it is detached while they are moved over.
+    Inserts wait for the transaction meanwhile.
+    """
+    quote_name = connection.ops.quote_name
+    table = quote_name(VOTE_TABLE)
+    name = quote_name(vote_partition_name(start))
+    default = quote_name(DEFAULT_PARTITION)
+    bounds = [start.isoformat(), add_months(start, 1).isoformat()]
+    in_range = 'voting_date >= %s AND voting_date < %s'
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})',
+            bounds
+        )
+        has_default_votes, = cursor.fetchone()
+        if has_default_votes:
+            cursor.execute(
+                f'ALTER TABLE {table} DETACH PARTITION {default}'
+            )
+        cursor.execute(
+            f'CREATE TABLE {name} PARTITION OF {table} '
+            'FOR VALUES FROM (%s) TO (%s)',
+            bounds
+        )
+        if has_default_votes:
+            cursor.execute(
+                f'INSERT INTO {name} SELECT * FROM {default} '
+                f'WHERE {in_range}',
+                bounds
+            )
+            cursor.execute(f'DELETE FROM {default} WHERE {in_range}', bounds)
+            cursor.execute(
+                f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT'
+            )
+
+
+def expired_vote_partitions(partitions, retain_months, today=None):
+    """
+    The ``partitions`` that ended more than ``retain_months`` months
+    before the current one started.
+    """
+    cutoff = add_months(today or timezone.localdate(), -retain_months)
+    return [partition for partition in partitions if partition.end <= cutoff]
+
+
+def archive_vote_partition(partition, archive_dir=None):
+    """
+    Rolls the month of ``partition`` up, writes its votes to
+    ``<archive_dir>/<partition name>.csv.gz`` and drops the partition.
+    Votes are locked against changes while they are written, and the
+    file is only in place once the partition is gone, so a failed
+    archive can be run again. Returns the path of the file.
+    """
+    from voting.services import fold_vote_shards
+    from voting.utils import rollup_daily_votes
+
+    archive_dir = archive_dir or settings.VOTING_ARCHIVE_DIR
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f'{partition.name}.csv.gz')
+    partial_path = path + '.partial'
+    fold_vote_shards()
+    rollup_daily_votes(
+        partition.start, partition.end - datetime.timedelta(days=1)
+    )
+
+    name = connection.ops.quote_name(partition.name)
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'LOCK TABLE {name} IN SHARE MODE')
+            with gzip.open(partial_path, 'wb') as archive:
+                cursor.copy_expert(
+                    f'COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)',
+                    archive
+                )
+            cursor.execute('ALTER TABLE {} DETACH PARTITION {}'.format(
+                connection.ops.quote_name(VOTE_TABLE), name
+            ))
+            cursor.execute(f'DROP TABLE {name}')
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    os.replace(partial_path, path)
+    return path
@@ -0,0 +1,497 @@
+"""
+Vote counting service.
+
+Every path that creates, moves or removes a vote (serializers, admin,
+``Vote.save``/``Vote.delete`` and the ``VoteQuerySet`` bulk methods) ends
+up in ``adjust_num_of_votes``, which changes ``Menu.num_of_votes`` with
+targeted ``UPDATE ... SET num_of_votes = num_of_votes + n`` statements
+inside the caller's transaction. With ``VOTING_COUNTER_SHARDS`` set the
+updates land on per-menu shard rows instead and ``fold_vote_shards`` sums
+them back into the menu.
+"""
+from collections import Counter, defaultdict, namedtuple
+
+from core.api.response_cache import invalidate_cached_responses
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from user.models import CustomUser
+from voting.models import Menu, MenuVoteShard, Result, Vote
+from voting.partitions import votes_retained_since
+from voting.snapshots import (
+    invalidate_menu_snapshot, invalidate_menu_snapshots
+)
+from voting.state import is_past_cutoff, is_voting_stopped
+
+
+VOTING_STOPPED_MESSAGE = 'Sorry! Voting is stopped for today.'
+VOTING_DATE_MISMATCH_MESSAGE = (
+    'Voting date and menu upload date must be same.'
+)
+ALREADY_VOTED_MESSAGE = 'You have already voted.'
+INVALID_EMPLOYEE_MESSAGE = 'Not an employee.'
+INVALID_MENU_MESSAGE = 'Menu does not exist.'
+
+
+def vote_shard(employee_id):
+    """
+    Returns the counter shard of a vote by ``employee_id``, or ``None``
+    when sharding is off and the vote is counted on the menu row itself.
+    """
+    shards = settings.VOTING_COUNTER_SHARDS
+    if shards <= 1 or employee_id is None:
+        return None
+    return employee_id % shards
+
+
+def vote_deltas(added=(), removed=()):
+    """
+    Builds the ``{(menu_id, shard): delta}`` mapping for the
+    ``(menu_id, employee_id)`` pairs of added and removed votes.
+    """
+    deltas = Counter(
+        (menu_id, vote_shard(employee_id)) for menu_id, employee_id in added
+    )
+    deltas.subtract(
+        (menu_id, vote_shard(employee_id))
+        for menu_id, employee_id in removed
+    )
+    return deltas
+
+
+def adjust_num_of_votes(deltas, using=None, upload_dates=None):
+    """
+    Applies ``{(menu_id, shard): delta}`` to the vote counters.
+
+    Unsharded deltas go to ``Menu.num_of_votes``; menus sharing the same
+    delta are updated by one statement, so a single vote costs one UPDATE,
+    a changed vote two and a bulk insert one per distinct per-menu count.
+    Sharded deltas go to the matching ``MenuVoteShard`` row, which is
+    created on first use.
+
+    Changed counters outdate the menu snapshots of ``upload_dates``, the
+    days of the menus when the caller knows them, else of every day.
+    """
+    menus_per_delta = defaultdict(list)
+    for (menu_id, shard), delta in deltas.items():
+        if not delta:
+            continue
+        if shard is None:
+            menus_per_delta[delta].append(menu_id)
+        else:
+            _adjust_vote_shard(menu_id, shard, delta, using)
+    manager = Menu.objects.db_manager(using)
+    for delta, menu_ids in menus_per_delta.items():
+        num_of_votes = F('num_of_votes') + delta
+        if delta < 0:
+            # A drifted counter must not fail the delete that takes a
+            # vote back; reconcile_vote_counts repairs it later.
+            num_of_votes = Greatest(num_of_votes, 0)
+        manager.filter(pk__in=menu_ids).update(num_of_votes=num_of_votes)
+    if menus_per_delta:
+        invalidate_cached_responses('menus', 'results')
+        if upload_dates is None:
+            invalidate_menu_snapshots()
+        else:
+            for upload_date in set(upload_dates):
+                invalidate_menu_snapshot(upload_date)
+
+
+def _adjust_vote_shard(menu_id, shard, delta, using):
+    shards = MenuVoteShard.objects.db_manager(using).filter(
+        menu_id=menu_id, shard=shard
+    )
+    if shards.update(num_of_votes=F('num_of_votes') + delta):
+        return
+    try:
+        with transaction.atomic(using=using):
+            MenuVoteShard.objects.db_manager(using).create(
+                menu_id=menu_id, shard=shard, num_of_votes=delta
+            )
+    except IntegrityError:
+        # Another vote created the shard first.
+        shards.update(num_of_votes=F('num_of_votes') + delta)
+
+
+def fold_vote_shards(upload_date=None):
+    """
+    Moves the counts collected in ``MenuVoteShard`` rows into
+    ``Menu.num_of_votes``, optionally only for the menus of one day.
+    Returns the number of menus whose counter changed.
+    """
+    shards = MenuVoteShard.objects.exclude(num_of_votes=0)
+    if upload_date is not None:
+        shards = shards.filter(menu__upload_date=upload_date)
+    with transaction.atomic():
+        folded = list(
+            shards.select_for_update().values_list(
+                'pk', 'menu_id', 'num_of_votes'
+            )
+        )
+        shards_per_delta = defaultdict(list)
+        menu_deltas = Counter()
+        for pk, menu_id, num_of_votes in folded:
+            shards_per_delta[num_of_votes].append(pk)
+            menu_deltas[(menu_id, None)] += num_of_votes
+        for num_of_votes, pks in shards_per_delta.items():
+            MenuVoteShard.objects.filter(pk__in=pks).update(
+                num_of_votes=F('num_of_votes') - num_of_votes
+            )
+        adjust_num_of_votes(menu_deltas)
+    return sum(1 for delta in menu_deltas.values() if delta)
+
+
+VoteCountDrift = namedtuple(
+    'VoteCountDrift', ['menu_id', 'upload_date', 'stored', 'actual']
+)
+
+
+def reconcile_vote_counts(
+    start=None, end=None, chunk_size=500, dry_run=False
+):
+    """
+    Compares ``Menu.num_of_votes`` (plus the menu's shards) with the
+    number of ``Vote`` rows of every menu uploaded from ``start`` to
+    ``end`` and, unless ``dry_run``, fixes the counters that drifted.
+
+    Menus are walked in keyset order of ``(upload_date, id)``, one chunk
+    per grouped count. Only the drifted menus of a chunk are locked, and
+    they are counted again under the lock before the fix, so votes cast
+    meanwhile are neither lost nor counted twice. Yields a
+    ``VoteCountDrift`` per drifted menu. Menus of months whose votes
+    were archived are skipped.
+    """
+    # The votes of archived months are gone, their counters are history.
+    retained_since = votes_retained_since()
+    if retained_since and (start is None or start < retained_since):
+        start = retained_since
+    menus = Menu.objects.order_by('upload_date', 'id')
+    if start is not None:
+        menus = menus.filter(upload_date__gte=start)
+    if end is not None:
+        menus = menus.filter(upload_date__lte=end)
+    last = None
+    while True:
+        chunk = menus
+        if last is not None:
+            chunk = chunk.filter(
+                Q(upload_date__gt=last[0])
+                | Q(upload_date=last[0], pk__gt=last[1])
+            )
+        chunk = list(
+            chunk.values_list('pk', 'upload_date', 'num_of_votes')[
+                :chunk_size
+            ]
+        )
+        if not chunk:
+            return
+        last = chunk[-1][1], chunk[-1][0]
+        actual = _count_votes([pk for pk, _, _ in chunk])
+        drifted = {
+            pk: upload_date for pk, upload_date, stored in chunk
+            if stored != actual[pk]
+        }
+        if not drifted:
+            continue
+        if dry_run:
+            for pk, upload_date, stored in chunk:
+                if pk in drifted:
+                    yield VoteCountDrift(pk, upload_date, stored, actual[pk])
+            continue
+        yield from _fix_vote_counts(drifted)
+
+
+def _count_votes(menu_ids):
+    """
+    Returns ``{menu_id: votes not yet counted in any shard}``, i.e. what
+    ``Menu.num_of_votes`` should be.
+    """
+    actual = dict.fromkeys(menu_ids, 0)
+    actual.update(
+        Vote.objects
+        .filter(menu_id__in=menu_ids)
+        .order_by()
+        .values('menu_id')
+        .annotate(num_of_votes=Count('id'))
+        .values_list('menu_id', 'num_of_votes')
+    )
+    for menu_id, num_of_votes in (
+        MenuVoteShard.objects
+        .filter(menu_id__in=menu_ids)
+        .order_by()
+        .values('menu_id')
+        .annotate(num_of_votes=Sum('num_of_votes'))
+        .values_list('menu_id', 'num_of_votes')
+    ):
+        actual[menu_id] -= num_of_votes
+    return actual
+
+
+def _fix_vote_counts(drifted):
+    with transaction.atomic():
+        menus = list(
+            Menu.objects
+            .select_for_update()
+            .filter(pk__in=drifted)
+            .order_by('pk')
+            .only('pk', 'num_of_votes')
+        )
+        list(
+            MenuVoteShard.objects
+            .select_for_update()
+            .filter(menu_id__in=drifted)
+            .order_by('pk')
+            .values_list('pk')
+        )
+        actual = _count_votes(list(drifted))
+        fixed = []
+        for menu in menus:
+            if menu.num_of_votes == actual[menu.pk]:
+                continue
+            drift = VoteCountDrift(
+                menu.pk, drifted[menu.pk], menu.num_of_votes, actual[menu.pk]
+            )
+            menu.num_of_votes = max(actual[menu.pk], 0)
+            fixed.append((menu, drift))
+        Menu.objects.bulk_update(
+            [menu for menu, _ in fixed], ['num_of_votes']
+        )
+        if fixed:
+            invalidate_cached_responses('menus', 'results')
+            for upload_date in {drift.upload_date for _, drift in fixed}:
+                invalidate_menu_snapshot(upload_date)
+    for _, drift in fixed:
+        yield drift
+
+
+def release_votes(votes):
+    """
+    Takes back the votes of ``votes`` from their menus without deleting
+    them. Used before a cascade deletes votes behind the ORM's back.
+    """
+    adjust_num_of_votes(
+        vote_deltas(removed=votes.values_list('menu_id', 'employee_id')),
+        using=votes.db
+    )
+
+
+def cast_vote(employee, menu, voting_date):
+    """
+    Casts the vote of ``employee`` for ``menu`` on ``voting_date``.
+
+    Returns ``(vote, None)`` on success and ``(None, message)`` with one of
+    the rejection messages above otherwise. On PostgreSQL the checks, the
+    insert and the counter increment are a single statement (see
+    ``_cast_vote_in_database``); other backends, and sharded counters,
+    check in Python and rely on the unique constraint for duplicates.
+    """
+    if is_past_cutoff(voting_date):
+        return None, VOTING_STOPPED_MESSAGE
+    if connection.vendor == 'postgresql' and vote_shard(employee.pk) is None:
+        return _cast_vote_in_database(employee, menu, voting_date)
+    if is_voting_stopped(voting_date):
+        return None, VOTING_STOPPED_MESSAGE
+    if voting_date != menu.upload_date:
+        return None, VOTING_DATE_MISMATCH_MESSAGE
+    try:
+        with transaction.atomic():
+            vote = Vote.objects.create(
+                employee=employee, menu=menu, voting_date=voting_date
+            )
+    except IntegrityError:
+        return None, ALREADY_VOTED_MESSAGE
+    return vote, None
+
+
+_CAST_VOTE_SQL = """
+WITH candidate AS (
+    SELECT
+        menu.id AS menu_id,
+        menu.upload_date = %(voting_date)s AS same_date,
+        EXISTS (
+            SELECT 1 FROM {result} result
+            WHERE result.voting_date = %(voting_date)s
+            AND result.is_voting_stopped
+        ) AS stopped
+    FROM {menu} menu
+    WHERE menu.id = %(menu_id)s
+), inserted AS (
+    INSERT INTO {vote}
+        (created_date, modified_date, employee_id, menu_id, voting_date)
+    SELECT %(now)s, %(now)s, %(employee_id)s, menu_id, %(voting_date)s
+    FROM candidate
+    WHERE same_date AND NOT stopped
+    ON CONFLICT ON CONSTRAINT unique_employee_vote_per_day DO NOTHING
+    RETURNING id, menu_id
+), counted AS (
+    UPDATE {menu} SET num_of_votes = num_of_votes + 1
+    WHERE id IN (SELECT menu_id FROM inserted)
+)
+SELECT
+    (SELECT id FROM inserted),
+    (SELECT stopped FROM candidate),
+    (SELECT same_date FROM candidate)
+"""
+
+
+def _cast_vote_in_database(employee, menu, voting_date):
+    """
+    Casts a vote with one conditional ``INSERT ... ON CONFLICT DO NOTHING``
+    that also bumps ``Menu.num_of_votes``, then tells from the returned
+    flags why nothing was inserted, in the order the Python path checks.
+    """
+    now = timezone.now()
+    sql = _CAST_VOTE_SQL.format(
+        menu=connection.ops.quote_name(Menu._meta.db_table),
+        result=connection.ops.quote_name(Result._meta.db_table),
+        vote=connection.ops.quote_name(Vote._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {
+            'employee_id': employee.pk,
+            'menu_id': menu.pk,
+            'voting_date': voting_date,
+            'now': now,
+        })
+        vote_id, stopped, same_date = cursor.fetchone()
+    if vote_id is None:
+        if stopped is None:
+            return None, INVALID_MENU_MESSAGE
+        if stopped:
+            return None, VOTING_STOPPED_MESSAGE
+        if not same_date:
+            return None, VOTING_DATE_MISMATCH_MESSAGE
+        return None, ALREADY_VOTED_MESSAGE
+    invalidate_cached_responses('menus', 'results')
+    invalidate_menu_snapshot(menu.upload_date)
+    vote = Vote(
+        pk=vote_id,
+        employee=employee,
+        menu=menu,
+        voting_date=voting_date,
+        created_date=now,
+        modified_date=now
+    )
+    vote._state.adding = False
+    vote._state.db = connection.alias
+    vote._loaded_menu_id = menu.pk
+    return vote, None
+
+
+def bulk_cast_votes(items):
+    """
+    Casts many votes at once.
+
+    ``items`` is a sequence of dicts with ``employee``, ``menu`` (both ids)
+    and ``voting_date``. The whole batch is validated with a fixed number
+    of queries and accepted votes are inserted with one ``bulk_create``.
+    Returns one outcome dict per item, in input order.
+    """
+    outcomes = [
+        {'index': index, 'status': 'rejected', 'id': None, 'error': None}
+        for index in range(len(items))
+    ]
+    employee_ids = {item['employee'] for item in items}
+    menu_ids = {item['menu'] for item in items}
+    voting_dates = {item['voting_date'] for item in items}
+
+    employees = set(
+        CustomUser.objects
+        .filter(pk__in=employee_ids, user_type=CustomUser.UserType.EMPLOYEE)
+        .values_list('pk', flat=True)
+    )
+    menu_dates = dict(
+        Menu.objects
+        .filter(pk__in=menu_ids)
+        .values_list('pk', 'upload_date')
+    )
+    stopped_dates = {
+        voting_date for voting_date in voting_dates
+        if is_voting_stopped(voting_date)
+    }
+    voted = set(
+        Vote.objects
+        .filter(employee_id__in=employee_ids, voting_date__in=voting_dates)
+        .values_list('employee_id', 'voting_date')
+    )
+
+    accepted = []
+    for outcome, item in zip(outcomes, items):
+        key = (item['employee'], item['voting_date'])
+        if item['employee'] not in employees:
+            outcome['error'] = INVALID_EMPLOYEE_MESSAGE
+        elif item['menu'] not in menu_dates:
+            outcome['error'] = INVALID_MENU_MESSAGE
+        elif item['voting_date'] in stopped_dates:
+            outcome['error'] = VOTING_STOPPED_MESSAGE
+        elif item['voting_date'] != menu_dates[item['menu']]:
+            outcome['error'] = VOTING_DATE_MISMATCH_MESSAGE
+        elif key in voted:
+            outcome['error'] = ALREADY_VOTED_MESSAGE
+        else:
+            voted.add(key)
+            accepted.append((outcome, Vote(
+                employee_id=item['employee'],
+                menu_id=item['menu'],
+                voting_date=item['voting_date']
+            )))
+
+    with transaction.atomic():
+        created = _insert_votes(accepted)
+
+    _fill_vote_ids(created)
+    for outcome, vote in created:
+        outcome['status'] = 'created'
+        outcome['id'] = vote.pk
+    return outcomes
+
+
+def _insert_votes(accepted):
+    """
+    Inserts the accepted votes in one statement. If a concurrent request
+    won the race for some ``(employee, voting_date)`` pair, falls back to
+    inserting them one by one so that only the losers are rejected.
+    """
+    if not accepted:
+        return []
+    try:
+        with transaction.atomic():
+            Vote.objects.bulk_create([vote for _, vote in accepted])
+        return accepted
+    except IntegrityError:
+        pass
+
+    created = []
+    for outcome, vote in accepted:
+        try:
+            with transaction.atomic():
+                Vote.objects.bulk_create([vote])
+            created.append((outcome, vote))
+        except IntegrityError:
+            outcome['error'] = ALREADY_VOTED_MESSAGE
+    return created
+
+
+def _fill_vote_ids(created):
+    """
+    Backends that cannot return ids from a bulk insert leave ``pk`` unset,
+    so look the new rows up by their unique ``(employee, voting_date)``.
+    """
+    missing = [vote for _, vote in created if vote.pk is None]
+    if not missing:
+        return
+    ids = {
+        (employee_id, voting_date): pk
+        for pk, employee_id, voting_date in (
+            Vote.objects
+            .filter(
+                employee_id__in={vote.employee_id for vote in missing},
+                voting_date__in={vote.voting_date for vote in missing}
+            )
+            .values_list('pk', 'employee_id', 'voting_date')
+        )
+    }
+    for vote in missing:
+        vote.pk = ids.get((vote.employee_id, vote.voting_date))
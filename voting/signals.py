@@ -1,19 +1,64 @@
-from django.db.models.signals import pre_save, pre_delete
+from core.api.response_cache import invalidate_cached_responses
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_delete
+)
 from django.dispatch import receiver
-from voting.models import Vote
+from user.models import CustomUser
+from voting.models import Menu, Restaurant, Result
+from voting.services import release_votes
+from voting.snapshots import (
+    invalidate_menu_snapshot, invalidate_menu_snapshots
+)
+from voting.state import clear_voting_states, invalidate_voting_state
+from voting.utils import rollup_daily_votes
 
 
-@receiver(pre_save, sender=Vote)
-def adjust_num_of_votes_of_menu(sender, instance: Vote, **kwargs):
-    if instance.id is None:
-        instance.menu.increment_num_of_votes()
+@receiver(pre_delete, sender=CustomUser)
+def release_votes_of_employee(sender, instance: CustomUser, **kwargs):
+    """
+    Deleting a user cascades to their votes without going through
+    ``VoteQuerySet.delete``, so take the votes back from their menus first.
+    """
+    release_votes(instance.votes.all())
+
+
+@receiver(post_delete, sender=Result)
+def invalidate_voting_state_of_result(sender, instance: Result, **kwargs):
+    invalidate_voting_state(instance.voting_date)
+    Result.objects.rebuild_winning_streaks(instance.voting_date)
+    # The rollup of the day must not keep its winner.
+    rollup_daily_votes(instance.voting_date, instance.voting_date)
+
+
+# Cached list responses that render each model, directly or nested.
+# Results also change the winning streaks shown with every restaurant,
+# and users are embedded as restaurant owners.
+CACHED_RESPONSE_SCOPES = {
+    Restaurant: ('restaurants', 'menus', 'results'),
+    Menu: ('menus', 'results'),
+    Result: ('restaurants', 'menus', 'results'),
+    CustomUser: ('restaurants', 'menus', 'results'),
+}
+
+
+@receiver([post_save, post_delete], sender=Restaurant)
+@receiver([post_save, post_delete], sender=Menu)
+@receiver([post_save, post_delete], sender=Result)
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_cached_responses_of(sender, instance, **kwargs):
+    if kwargs.get('update_fields') == {'last_login'}:
+        # Saved on every login, last_login is not rendered.
+        return
+    invalidate_cached_responses(*CACHED_RESPONSE_SCOPES[sender])
+    if sender is Menu:
+        invalidate_menu_snapshot(instance.upload_date)
     else:
-        previous_instance = Vote.objects.get(id=instance.id)
-        if instance.menu != previous_instance.menu:
-            previous_instance.menu.decrement_num_of_votes()
-            instance.menu.increment_num_of_votes()
+        invalidate_menu_snapshots()
 
 
-@receiver(pre_delete, sender=Vote)
-def decrement_num_of_votes_of_menu(sender, instance: Vote, **kwargs):
-    instance.menu.decrement_num_of_votes()
+@receiver(post_migrate)
+def clear_cached_voting_states(sender, **kwargs):
+    """ Tables were created or flushed, cached states are meaningless. """
+    clear_voting_states()
+    invalidate_cached_responses('restaurants', 'menus', 'results')
+    invalidate_menu_snapshots()
@@ -0,0 +1,98 @@
+"""
+Per-date snapshots of the menu list.
+
+Everyone polls the menus of the same day at lunchtime, so the rendered
+rows of a day are kept in the ``responses`` cache together with the
+version they were built at. A snapshot is only served while its version
+is the current one of its day and of the global generation:
+
+* creating, changing or deleting a menu, and casting or taking back a
+  vote, moves the version of its day on (``invalidate_menu_snapshot``);
+* restaurant and result changes, which show up in every day, and bulk
+  counter changes move the generation on (``invalidate_menu_snapshots``).
+
+Votes only move the version on, a cache increment after the commit,
+rather than patching the snapshot: a snapshot built right after a vote
+committed already contains it, and adding its delta again would count it
+twice. The next read of the day rebuilds its snapshot instead.
+"""
+import time
+
+from django.core.cache import caches
+from django.db import connection, transaction
+
+SNAPSHOT_CACHE_ALIAS = 'responses'
+
+_GENERATION_KEY = 'menu-snapshot:generation'
+
+
+def _version_key(upload_date):
+    return f'menu-snapshot:version:{upload_date.isoformat()}'
+
+
+def _snapshot_key(generation, upload_date):
+    return f'menu-snapshot:{generation}:{upload_date.isoformat()}'
+
+
+def _bump(cache, key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def menu_snapshot_version(upload_date):
+    """
+    Returns ``(generation, version)`` of the menus of ``upload_date``,
+    which change whenever the list of that day does.
+    """
+    cache = caches[SNAPSHOT_CACHE_ALIAS]
+    versions = cache.get_many([_GENERATION_KEY, _version_key(upload_date)])
+    return tuple(
+        versions.get(key) or cache.get_or_set(key, time.time_ns, None)
+        for key in (_GENERATION_KEY, _version_key(upload_date))
+    )
+
+
+def get_menu_snapshot(upload_date):
+    """
+    Returns the menus of ``upload_date`` as ``MenuSerializer`` renders
+    them, with image urls relative to the site, building the snapshot
+    when the cached one is missing or outdated.
+    """
+    cache = caches[SNAPSHOT_CACHE_ALIAS]
+    generation, version = menu_snapshot_version(upload_date)
+    key = _snapshot_key(generation, upload_date)
+    snapshot = cache.get(key)
+    if snapshot is not None and snapshot['version'] == version:
+        return snapshot['menus']
+
+    menus = _build_menus(upload_date)
+    if not connection.in_atomic_block:
+        cache.set(key, {'version': version, 'menus': menus})
+    return menus
+
+
+def _build_menus(upload_date):
+    from voting.api.v1.projections import MenuProjection
+    from voting.models import Menu
+    projection = MenuProjection(request=None)
+    return projection.rows(
+        projection.values(Menu.objects.filter(upload_date=upload_date))
+    )
+
+
+def invalidate_menu_snapshot(upload_date):
+    """ Outdates the snapshot of ``upload_date`` once committed. """
+    transaction.on_commit(lambda: _bump(
+        caches[SNAPSHOT_CACHE_ALIAS], _version_key(upload_date)
+    ))
+
+
+def invalidate_menu_snapshots():
+    """ Outdates the snapshots of every day once the transaction commits. """
+    transaction.on_commit(lambda: _bump(
+        caches[SNAPSHOT_CACHE_ALIAS], _GENERATION_KEY
+    ))
@@ -0,0 +1,148 @@
+"""
+Cached per-day voting state.
+
+Casting a vote only needs to know whether voting is stopped for the day,
+so the state is kept in process memory for ``VOTING_STATE_TTL`` seconds
+and in the default cache, instead of reading ``Result`` on every vote.
+
+``Result.save`` and ``update_result`` call ``invalidate_voting_state``,
+which drops the local copy and moves the day's version in the cache on,
+and once the transaction commits does both again and sends
+``voting_state_changed``. A state read from the database is stored under
+the version seen before the read, so a read racing an invalidation never
+outlives it. Cached states also expire after ``VOTING_STATE_TTL``
+seconds, which bounds how long other processes, including those with a
+cache of their own, see an outdated state. A deployment can
+shorten that by relaying the signal (e.g. over pub/sub) and calling
+``invalidate_voting_state(voting_date, broadcast=False)`` in the workers.
+
+With ``VOTING_CUTOFF_TIME`` set, a day is also closed once its cutoff has
+passed, which is decided from the clock alone.
+"""
+import datetime
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+VotingState = namedtuple(
+    'VotingState', ['is_voting_stopped', 'winning_menu_id']
+)
+OPEN = VotingState(is_voting_stopped=False, winning_menu_id=None)
+
+# Sent with ``voting_date`` after the state of that day changed.
+voting_state_changed = Signal()
+
+_local_states = {}
+_local_states_lock = threading.Lock()
+
+
+def _version_key(voting_date):
+    return f'voting-state:version:{voting_date.isoformat()}'
+
+
+def _cache_key(voting_date, version):
+    return f'voting-state:{version}:{voting_date.isoformat()}'
+
+
+def get_voting_state(voting_date):
+    now = time.monotonic()
+    entry = _local_states.get(voting_date)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    ttl = settings.VOTING_STATE_TTL
+    version = cache.get_or_set(
+        _version_key(voting_date), time.time_ns, timeout=None
+    )
+    key = _cache_key(voting_date, version)
+    entry = cache.get(key)
+    if entry is not None:
+        state, expires_at = VotingState(*entry[0]), entry[1]
+        # Do not keep the state locally for longer than it is cached.
+        ttl = min(ttl, expires_at - time.time())
+    else:
+        from voting.models import Result
+        row = (
+            Result.objects
+            .filter(voting_date=voting_date)
+            .values_list('is_voting_stopped', 'winning_menu_id')
+            .first()
+        )
+        state = VotingState(*row) if row else OPEN
+        if connection.in_atomic_block:
+            # Might be uncommitted, do not let anyone else see it.
+            return state
+        # Stored under the version seen before the read: an invalidation
+        # committed meanwhile moved the version on and this entry is
+        # never read.
+        cache.add(
+            key, (tuple(state), time.time() + ttl), timeout=ttl
+        )
+
+    with _local_states_lock:
+        _local_states[voting_date] = (now + ttl, state)
+    return state
+
+
+def voting_cutoff(voting_date):
+    """
+    Returns the aware datetime at which voting on ``voting_date`` closes,
+    or ``None`` when no ``VOTING_CUTOFF_TIME`` is configured.
+    """
+    if not settings.VOTING_CUTOFF_TIME:
+        return None
+    return timezone.make_aware(datetime.datetime.combine(
+        voting_date,
+        datetime.time.fromisoformat(settings.VOTING_CUTOFF_TIME)
+    ))
+
+
+def is_past_cutoff(voting_date, now=None):
+    cutoff = voting_cutoff(voting_date)
+    return cutoff is not None and (now or timezone.now()) >= cutoff
+
+
+def is_voting_stopped(voting_date):
+    return (
+        is_past_cutoff(voting_date)
+        or get_voting_state(voting_date).is_voting_stopped
+    )
+
+
+def _bump(voting_date):
+    try:
+        cache.incr(_version_key(voting_date))
+    except ValueError:
+        cache.set(_version_key(voting_date), time.time_ns(), timeout=None)
+
+
+def _forget(voting_date):
+    with _local_states_lock:
+        _local_states.pop(voting_date, None)
+    _bump(voting_date)
+
+
+def invalidate_voting_state(voting_date, broadcast=True):
+    _forget(voting_date)
+
+    def on_commit():
+        # Drop anything cached from a read racing the transaction.
+        _forget(voting_date)
+        if broadcast:
+            voting_state_changed.send(sender=None, voting_date=voting_date)
+
+    transaction.on_commit(on_commit)
+
+
+def clear_voting_states():
+    with _local_states_lock:
+        voting_dates = list(_local_states)
+        _local_states.clear()
+    for voting_date in voting_dates:
+        _bump(voting_date)
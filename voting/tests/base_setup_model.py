@@ -1,4 +1,5 @@
 import tempfile
+from datetime import timedelta
 from django.core.files import File
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -58,6 +59,19 @@ class SetUpModel:
             voting_date=voting_date
         )
 
+    def create_winning_streak(self, restaurant, voting_date, length):
+        """
+        Publishes results won by ``restaurant`` for the ``length`` days
+        before ``voting_date``.
+        """
+        for days in range(length, 0, -1):
+            upload_date = voting_date - timedelta(days=days)
+            Result.objects.create(
+                voting_date=upload_date,
+                winning_menu=self.create_menu(restaurant, upload_date),
+                is_voting_stopped=True
+            )
+
     def create_file(self, filename='test.jpeg', filepath=None):
         if filepath is None:
             filepath = settings.BASE_DIR / 'test_file/test.jpeg'
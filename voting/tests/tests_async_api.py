@@ -0,0 +1,118 @@
+from datetime import datetime
+from unittest import mock
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+from django.core.management import call_command
+from django.urls import reverse
+from core.api.response_cache import response_cache_stats
+from voting.models import Vote
+from voting.tests.base_setup_model import SetUpModel
+
+
+class AsyncAPITest(APITransactionTestCase):
+    """ Test module for the async vote, menu and result APIs. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.admin = setUpObj.create_admin_type_user()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee = setUpObj.create_employee_type_user()
+        self.restaurant = setUpObj.create_restaurant(owner=self.owner)
+        self.voting_date = datetime.now().date()
+        self.menu = setUpObj.create_menu(
+            restaurant=self.restaurant,
+            upload_date=self.voting_date
+        )
+
+    def create_vote_using_api(self, menu):
+        payload = {
+            'menu': menu.pk,
+            'voting_date': self.voting_date
+        }
+        return self.client.post(
+            reverse('api:voting-api-v1:async-vote-create'),
+            data=payload
+        )
+
+    def test_unauthenticated_user_can_not_get_menus(self):
+        res = self.client.get(
+            reverse('api:voting-api-v1:async-menu-list-today')
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_async_menus_match_sync_menus(self):
+        self.client.login(username=self.employee.username, password='password')
+        async_res = self.client.get(
+            reverse('api:voting-api-v1:async-menu-list-today'),
+            {'upload_date': self.voting_date}
+        )
+        sync_res = self.client.get(
+            reverse('api:voting-api-v1:menu-list-create'),
+            {'upload_date': self.voting_date}
+        )
+        self.client.logout()
+
+        self.assertEqual(async_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_res.json(), sync_res.json()['results'])
+
+    def test_invalid_date_is_rejected(self):
+        self.client.login(username=self.employee.username, password='password')
+        res = self.client.get(
+            reverse('api:voting-api-v1:async-result'),
+            {'voting_date': 'today'}
+        )
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('voting_date', res.json())
+
+    def test_admin_can_not_vote(self):
+        self.client.login(username=self.admin.username, password='password')
+        res = self.create_vote_using_api(menu=self.menu)
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(res.json(), {'detail': 'Not an employee.'})
+
+    def test_employee_can_vote_once_per_day(self):
+        self.client.login(username=self.employee.username, password='password')
+        res1 = self.create_vote_using_api(menu=self.menu)
+        res2 = self.create_vote_using_api(menu=self.menu)
+        self.client.logout()
+        self.menu.refresh_from_db()
+
+        self.assertEqual(res1.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res2.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res2.json(), ['You have already voted.'])
+        self.assertEqual(Vote.objects.count(), 1)
+        self.assertEqual(self.menu.num_of_votes, 1)
+
+
+class BenchmarkAPIStacksTest(APITransactionTestCase):
+    """ Test module for the sync and async stacks benchmark command. """
+
+    def test_sync_lists_bypass_the_response_cache(self):
+        setUpObj = SetUpModel()
+        employee = setUpObj.create_employee_type_user()
+        setUpObj.create_menu(
+            restaurant=setUpObj.create_restaurant(
+                owner=setUpObj.create_restaurant_owner_type_user()
+            ),
+            upload_date=datetime.now().date()
+        )
+
+        stats = response_cache_stats(['menus', 'results'])
+        stdout = mock.Mock()
+        call_command(
+            'benchmark_api_stacks', '--username', employee.username,
+            '--requests', '4', '--concurrency', '2', '--votes', '0',
+            stdout=stdout
+        )
+
+        output = ''.join(call.args[0] for call in stdout.write.call_args_list)
+        for endpoint in ('menus', 'result'):
+            for stack in ('sync', 'async'):
+                self.assertRegex(output, rf'{endpoint}\s+{stack}\s+[\d.]+')
+        self.assertNotIn('vote', output)
+        self.assertEqual(response_cache_stats(['menus', 'results']), stats)
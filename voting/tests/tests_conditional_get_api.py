@@ -0,0 +1,112 @@
+from datetime import datetime
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.tests.base_setup_model import SetUpModel
+
+
+class ConditionalGetAPITest(APITransactionTestCase):
+    """ Test module for ETag and Last-Modified of the voting APIs. """
+
+    def setUp(self):
+        self.setUpObj = SetUpModel()
+        self.owner = self.setUpObj.create_restaurant_owner_type_user()
+        self.employee = self.setUpObj.create_employee_type_user()
+        self.restaurant = self.setUpObj.create_restaurant(owner=self.owner)
+        self.upload_date = datetime.now().date()
+        self.menu = self.setUpObj.create_menu(
+            restaurant=self.restaurant,
+            upload_date=self.upload_date
+        )
+        self.menu_list_url = reverse('api:voting-api-v1:menu-list-create')
+        self.client.login(
+            username=self.employee.username,
+            password='password'
+        )
+
+    def tearDown(self):
+        self.client.logout()
+
+    def test_matching_etag_is_not_modified(self):
+        res = self.client.get(self.menu_list_url)
+        etag = res['ETag']
+
+        # Session, user and the validator query; no menus are loaded.
+        with self.assertNumQueries(3):
+            res = self.client.get(
+                self.menu_list_url, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+
+    def test_query_params_change_the_etag(self):
+        res = self.client.get(self.menu_list_url)
+        res = self.client.get(
+            self.menu_list_url,
+            {'upload_date': self.upload_date},
+            HTTP_IF_NONE_MATCH=res['ETag']
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_vote_changes_the_menu_list_etag(self):
+        etag = self.client.get(self.menu_list_url)['ETag']
+        self.client.post(
+            reverse('api:voting-api-v1:vote-list-create'),
+            {'menu': self.menu.id, 'voting_date': self.upload_date}
+        )
+        res = self.client.get(self.menu_list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['num_of_votes'], 1)
+
+    def test_deleted_menu_changes_the_menu_list_etag(self):
+        self.setUpObj.create_menu(
+            restaurant=self.setUpObj.create_restaurant(
+                owner=self.owner, name='Another Restaurant'
+            ),
+            upload_date=self.upload_date
+        )
+        etag = self.client.get(self.menu_list_url)['ETag']
+        self.menu.delete()
+        res = self.client.get(self.menu_list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_detail_is_not_modified_since_last_modified(self):
+        url = reverse('api:voting-api-v1:menu-rud', args=[self.menu.id])
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=res['Last-Modified']
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_modified_after_the_date_is_sent_again(self):
+        url = reverse(
+            'api:voting-api-v1:restaurant-rud', args=[self.restaurant.id]
+        )
+        res = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(0))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['id'], self.restaurant.id)
+
+    def test_etags_are_per_user(self):
+        etag = self.client.get(
+            reverse('api:voting-api-v1:vote-list-create')
+        )['ETag']
+        other = self.setUpObj.create_employee_type_user(
+            username='other_employee'
+        )
+        self.client.logout()
+        self.client.login(username=other.username, password='password')
+        res = self.client.get(
+            reverse('api:voting-api-v1:vote-list-create'),
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from unittest import mock
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.models import DailyRestaurantVotes, Result
+from voting.tests.base_setup_model import SetUpModel
+from voting.utils import update_result
+
+
+class DailyRestaurantVotesAPITest(APITransactionTestCase):
+    """ Test module for the daily vote rollup and its analytics API. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.admin = setUpObj.create_admin_type_user()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee1 = setUpObj.create_employee_type_user()
+        self.employee2 = setUpObj.create_employee_type_user(username='emp2')
+        self.restaurant1 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.dates = [
+            datetime(2022, 5, 1).date() + timedelta(days=i) for i in range(2)
+        ]
+        for voting_date in self.dates:
+            menu1 = setUpObj.create_menu(
+                restaurant=self.restaurant1,
+                upload_date=voting_date
+            )
+            menu2 = setUpObj.create_menu(
+                restaurant=self.restaurant2,
+                upload_date=voting_date
+            )
+            setUpObj.create_vote(
+                employee=self.employee1,
+                menu=menu2,
+                voting_date=voting_date
+            )
+            setUpObj.create_vote(
+                employee=self.employee2,
+                menu=menu2 if voting_date == self.dates[0] else menu1,
+                voting_date=voting_date
+            )
+
+    def get_daily_votes_using_api(self, **params):
+        return self.client.get(
+            reverse('api:voting-api-v1:analytics-restaurant-votes'),
+            params
+        )
+
+    def rollup(self):
+        return list(
+            DailyRestaurantVotes.objects
+            .order_by('voting_date', 'rank')
+            .values_list(
+                'voting_date', 'restaurant', 'num_of_votes', 'rank',
+                'is_winner'
+            )
+        )
+
+    def test_publishing_result_rolls_up_the_day(self):
+        update_result(self.dates[0])
+
+        self.assertEqual(self.rollup(), [
+            (self.dates[0], self.restaurant2.pk, 2, 1, True),
+            (self.dates[0], self.restaurant1.pk, 0, 2, False),
+        ])
+
+    def test_deleting_result_clears_the_winner(self):
+        update_result(self.dates[0])
+
+        Result.objects.get(voting_date=self.dates[0]).delete()
+
+        self.assertEqual(self.rollup(), [
+            (self.dates[0], self.restaurant2.pk, 2, 1, False),
+            (self.dates[0], self.restaurant1.pk, 0, 2, False),
+        ])
+
+    def test_backfill_matches_publishing(self):
+        for voting_date in self.dates:
+            update_result(voting_date)
+        expected = self.rollup()
+        DailyRestaurantVotes.objects.all().delete()
+
+        call_command('backfill_daily_votes', stdout=mock.Mock())
+
+        self.assertEqual(self.rollup(), expected)
+
+    def test_only_admin_can_get_daily_votes(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        res = self.get_daily_votes_using_api()
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_can_get_trend_of_a_restaurant(self):
+        for voting_date in self.dates:
+            update_result(voting_date)
+        self.client.login(username=self.admin.username, password='password')
+        res = self.get_daily_votes_using_api(
+            restaurant=self.restaurant1.pk,
+            voting_date__gte=self.dates[1]
+        )
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['num_of_votes'], 1)
+        self.assertEqual(res.data['results'][0]['rank'], 1)
+
+    def test_daily_votes_are_paged(self):
+        for voting_date in self.dates:
+            update_result(voting_date)
+        self.client.login(username=self.admin.username, password='password')
+        res = self.get_daily_votes_using_api(page_size=1)
+        rows = res.data['results']
+        while res.data['links']['next']:
+            res = self.client.get(res.data['links']['next'])
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            rows += res.data['results']
+        self.client.logout()
+
+        self.assertEqual(
+            [(row['restaurant'], row['voting_date']) for row in rows],
+            [
+                (restaurant.pk, voting_date.isoformat())
+                for restaurant in (self.restaurant1, self.restaurant2)
+                for voting_date in self.dates
+            ]
+        )
@@ -0,0 +1,125 @@
+from datetime import datetime
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.tests.base_setup_model import SetUpModel
+
+
+class DynamicFieldsAPITest(APITransactionTestCase):
+    """ Test module for the fields and expand query parameters. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee = setUpObj.create_employee_type_user()
+        self.restaurant = setUpObj.create_restaurant(owner=self.owner)
+        self.upload_date = datetime.now().date()
+        self.menu = setUpObj.create_menu(
+            restaurant=self.restaurant,
+            upload_date=self.upload_date
+        )
+        self.vote = setUpObj.create_vote(
+            employee=self.employee,
+            menu=self.menu,
+            voting_date=self.upload_date
+        )
+        self.client.login(
+            username=self.employee.username,
+            password='password'
+        )
+
+    def tearDown(self):
+        self.client.logout()
+
+    def get_menus(self, **params):
+        res = self.client.get(
+            reverse('api:voting-api-v1:menu-list-create'), params
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data['results']
+
+    def test_whole_tree_is_rendered_by_default(self):
+        menu, = self.get_menus()
+
+        self.assertEqual(menu['restaurant']['id'], self.restaurant.id)
+        self.assertEqual(menu['restaurant']['owner']['id'], self.owner.id)
+
+    def test_fields_keep_only_the_listed_fields(self):
+        menu, = self.get_menus(fields='id,num_of_votes')
+
+        self.assertEqual(
+            menu, {'id': self.menu.id, 'num_of_votes': 1}
+        )
+
+    def test_nested_fields_are_listed_with_dots(self):
+        menu, = self.get_menus(fields='id,restaurant.name')
+
+        self.assertEqual(menu, {
+            'id': self.menu.id,
+            'restaurant': {'name': self.restaurant.name}
+        })
+
+    def test_unexpanded_relations_are_primary_keys(self):
+        menu, = self.get_menus(expand='restaurant')
+
+        self.assertEqual(menu['restaurant']['owner'], self.owner.id)
+
+        menu, = self.get_menus(expand='')
+        self.assertEqual(menu['restaurant'], self.restaurant.id)
+
+    def test_unexpanded_relations_are_not_queried(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_menus(expand='')
+
+        self.assertFalse(any(
+            'voting_restaurant' in query['sql']
+            for query in queries.captured_queries
+        ))
+
+    def test_vote_expands_menu_only(self):
+        res = self.client.get(
+            reverse('api:voting-api-v1:vote-list-create'),
+            {'expand': 'menu', 'fields': 'id,menu.id,menu.restaurant'}
+        )
+
+        vote, = res.data['results']
+        self.assertEqual(vote, {
+            'id': self.vote.id,
+            'menu': {'id': self.menu.id, 'restaurant': self.restaurant.id}
+        })
+
+    def test_writes_ignore_fields_and_expand(self):
+        other_employee = SetUpModel().create_employee_type_user(
+            username='test_employee_2'
+        )
+        self.client.login(
+            username=other_employee.username, password='password'
+        )
+        res = self.client.post(
+            reverse('api:voting-api-v1:vote-list-create') + '?fields=id',
+            data={'menu': self.menu.id, 'voting_date': self.upload_date}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['menu'], self.menu.id)
+        self.assertIn('voting_date', res.data)
+
+        restaurant = SetUpModel().create_restaurant(
+            owner=self.owner, name='Restaurant 2'
+        )
+        self.client.login(username=self.owner.username, password='password')
+        res = self.client.post(
+            reverse('api:voting-api-v1:menu-list-create')
+            + '?fields=id&expand=',
+            data={
+                'restaurant': restaurant.id,
+                'menu_image': SetUpModel().create_file(),
+                'upload_date': self.upload_date
+            }
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['restaurant'], restaurant.id)
+        self.assertIn('menu_image', res.data)
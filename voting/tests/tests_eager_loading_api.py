@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.models import Result
+from voting.tests.base_setup_model import SetUpModel
+
+
+class EagerLoadingAPITest(APITransactionTestCase):
+    """ Test module for the query count of nested list endpoints. """
+
+    def setUp(self):
+        self.setUpObj = SetUpModel()
+        self.owner = self.setUpObj.create_restaurant_owner_type_user()
+        self.employee = self.setUpObj.create_employee_type_user()
+        self.first_date = datetime(2022, 5, 1).date()
+        self.add_day(0)
+
+    def add_day(self, days):
+        """ Adds a menu of a new restaurant, a vote and a result. """
+        voting_date = self.first_date + timedelta(days=days)
+        owner = self.setUpObj.create_restaurant_owner_type_user(
+            username=f'owner{days}'
+        )
+        menu = self.setUpObj.create_menu(
+            restaurant=self.setUpObj.create_restaurant(
+                owner=owner,
+                name=f'Restaurant {days}'
+            ),
+            upload_date=self.first_date
+        )
+        self.setUpObj.create_vote(
+            employee=self.employee,
+            menu=menu,
+            voting_date=voting_date
+        )
+        Result.objects.create(
+            voting_date=voting_date,
+            winning_menu=menu,
+            is_voting_stopped=True
+        )
+
+    def assertConstantQueries(self, url):
+        self.client.login(
+            username=self.employee.username,
+            password='password'
+        )
+        with CaptureQueriesContext(connection) as few_rows:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+        for days in range(1, 4):
+            self.add_day(days)
+        with CaptureQueriesContext(connection) as many_rows:
+            res = self.client.get(url)
+        self.client.logout()
+
+        self.assertEqual(len(res.data['results']), 4)
+        self.assertEqual(len(few_rows), len(many_rows))
+
+    def test_menu_list_queries_do_not_grow_with_rows(self):
+        self.assertConstantQueries(
+            reverse('api:voting-api-v1:menu-list-create')
+        )
+
+    def test_vote_list_queries_do_not_grow_with_rows(self):
+        self.assertConstantQueries(
+            reverse('api:voting-api-v1:vote-list-create')
+        )
+
+    def test_result_list_queries_do_not_grow_with_rows(self):
+        self.assertConstantQueries(reverse('api:voting-api-v1:result'))
@@ -0,0 +1,43 @@
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+from voting.models import Menu, Result, Vote
+
+
+class ExplainVotingQueriesTest(TransactionTestCase):
+    """ Test module for the explain_voting_queries command. """
+
+    def explain(self, *args):
+        stdout = mock.Mock()
+        call_command('explain_voting_queries', *args, stdout=stdout)
+        return ''.join(call.args[0] for call in stdout.write.call_args_list)
+
+    def test_seed_builds_a_consistent_dataset(self):
+        self.explain(
+            '--seed', '--employees', '30', '--restaurants', '3',
+            '--days', '4'
+        )
+
+        self.assertEqual(Vote.objects.count(), 120)
+        self.assertEqual(Menu.objects.count(), 12)
+        self.assertEqual(
+            Result.objects.filter(is_voting_stopped=True).count(), 3
+        )
+        for menu in Menu.objects.all():
+            self.assertEqual(menu.num_of_votes, menu.votes.count())
+
+    def test_compare_explains_with_and_without_the_indexes(self):
+        output = self.explain(
+            '--seed', '--employees', '10', '--restaurants', '2',
+            '--days', '2', '--compare'
+        )
+
+        self.assertIn('== menus of a day (without indexes)', output)
+        self.assertIn('menu_date_votes_idx', output)
+        # The indexes are back after the comparison.
+        self.assertIn('menu_date_votes_idx', self.explain())
+
+    def test_nothing_to_explain(self):
+        with self.assertRaises(CommandError):
+            self.explain()
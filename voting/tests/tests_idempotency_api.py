@@ -0,0 +1,123 @@
+from datetime import datetime
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.models import Menu, Vote
+from voting.tests.base_setup_model import SetUpModel
+
+
+class IdempotencyKeyAPITest(APITransactionTestCase):
+    """ Test module for retrying create APIs with an Idempotency-Key. """
+
+    def setUp(self):
+        caches['idempotency'].clear()
+        setUpObj = SetUpModel()
+        self.file = setUpObj.create_file()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee1 = setUpObj.create_employee_type_user()
+        self.employee2 = setUpObj.create_employee_type_user(username='emp2')
+        self.restaurant1 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.voting_date = datetime.now().date()
+        self.menu1 = setUpObj.create_menu(
+            restaurant=self.restaurant1,
+            upload_date=self.voting_date
+        )
+
+    def create_vote_using_api(self, menu, key):
+        payload = {
+            'menu': menu.pk,
+            'voting_date': self.voting_date
+        }
+        return self.client.post(
+            reverse('api:voting-api-v1:vote-list-create'),
+            data=payload,
+            HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retried_vote_is_replayed(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        res1 = self.create_vote_using_api(self.menu1, 'key-1')
+        res2 = self.create_vote_using_api(self.menu1, 'key-1')
+        self.client.logout()
+        self.menu1.refresh_from_db()
+
+        self.assertEqual(res1.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res2.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res1.data, res2.data)
+        self.assertEqual(res2['Idempotent-Replayed'], 'true')
+        self.assertEqual(Vote.objects.count(), 1)
+        self.assertEqual(self.menu1.num_of_votes, 1)
+
+    def test_key_is_scoped_per_user(self):
+        for employee in [self.employee1, self.employee2]:
+            self.client.login(username=employee.username, password='password')
+            res = self.create_vote_using_api(self.menu1, 'key-1')
+            self.client.logout()
+
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Vote.objects.count(), 2)
+
+    def test_key_can_not_be_reused_with_another_payload(self):
+        menu2 = SetUpModel().create_menu(
+            restaurant=self.restaurant2,
+            upload_date=self.voting_date
+        )
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        self.create_vote_using_api(self.menu1, 'key-1')
+        res = self.create_vote_using_api(menu2, 'key-1')
+        self.client.logout()
+
+        self.assertEqual(
+            res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    def test_failed_request_is_not_stored(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        self.create_vote_using_api(self.menu1, 'key-1')
+        res = self.create_vote_using_api(self.menu1, 'key-2')
+        retry_res = self.create_vote_using_api(self.menu1, 'key-2')
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry_res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('Idempotent-Replayed', retry_res)
+
+    def test_retried_menu_upload_is_replayed(self):
+        self.client.login(username=self.owner.username, password='password')
+        responses = []
+        for _ in range(2):
+            self.file.seek(0)
+            responses.append(self.client.post(
+                reverse('api:voting-api-v1:menu-list-create'),
+                data={
+                    'restaurant': self.restaurant2.pk,
+                    'menu_image': self.file,
+                    'upload_date': self.voting_date
+                },
+                HTTP_IDEMPOTENCY_KEY='menu-key'
+            ))
+        self.client.logout()
+
+        self.assertEqual(responses[0].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(responses[1].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(responses[0].data, responses[1].data)
+        self.assertEqual(
+            Menu.objects.filter(restaurant=self.restaurant2).count(), 1
+        )
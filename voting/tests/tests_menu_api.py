@@ -61,7 +61,7 @@ class MenuListCreateAPITest(APITransactionTestCase):
         )
         self.client.logout()
         total_menu = Menu.objects.all().count()
-        self.assertEqual(len(res.data), total_menu)
+        self.assertEqual(len(res.data['results']), total_menu)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
     # Tests regarding POST api
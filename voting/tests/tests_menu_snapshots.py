@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.models import Menu
+from voting.snapshots import get_menu_snapshot
+from voting.tests.base_setup_model import SetUpModel
+
+
+class MenuSnapshotTest(APITransactionTestCase):
+    """ Test module for the per-date snapshots of the menu list. """
+
+    def setUp(self):
+        self.setUpObj = SetUpModel()
+        self.owner = self.setUpObj.create_restaurant_owner_type_user()
+        self.employee = self.setUpObj.create_employee_type_user()
+        self.upload_date = datetime.now().date()
+        self.menus = [
+            self.setUpObj.create_menu(
+                restaurant=self.setUpObj.create_restaurant(
+                    owner=self.owner, name=f'Restaurant {i}'
+                ),
+                upload_date=self.upload_date
+            )
+            for i in range(3)
+        ]
+        self.url = reverse('api:voting-api-v1:menu-list-create')
+        self.client.login(
+            username=self.employee.username,
+            password='password'
+        )
+
+    def tearDown(self):
+        self.client.logout()
+
+    def vote(self, menu):
+        res = self.client.post(
+            reverse('api:voting-api-v1:vote-list-create'),
+            {'menu': menu.id, 'voting_date': self.upload_date}
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_snapshot_matches_the_serializer(self):
+        snapshot = self.client.get(self.url, {'upload_date': self.upload_date})
+        serialized = self.client.get(self.url, {
+            'upload_date': self.upload_date,
+            'fields': 'id,restaurant,menu_image,num_of_votes,upload_date'
+        })
+
+        self.assertEqual(snapshot.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            snapshot.data['results'], serialized.data['results']
+        )
+
+    def test_snapshot_is_read_without_queries(self):
+        get_menu_snapshot(self.upload_date)
+
+        with self.assertNumQueries(0):
+            menus = get_menu_snapshot(self.upload_date)
+        self.assertEqual(
+            [menu['id'] for menu in menus],
+            [menu.id for menu in self.menus]
+        )
+
+    def test_vote_rebuilds_the_snapshot_of_its_day(self):
+        get_menu_snapshot(self.upload_date)
+        self.vote(self.menus[2])
+
+        with self.assertNumQueries(2):
+            menus = get_menu_snapshot(self.upload_date)
+        self.assertEqual(menus[0]['id'], self.menus[2].id)
+        self.assertEqual(menus[0]['num_of_votes'], 1)
+
+    def test_vote_keeps_the_snapshots_of_other_days(self):
+        yesterday = self.upload_date - timedelta(days=1)
+        get_menu_snapshot(yesterday)
+        self.vote(self.menus[0])
+
+        with self.assertNumQueries(0):
+            get_menu_snapshot(yesterday)
+
+    def test_new_menu_invalidates_the_snapshot(self):
+        get_menu_snapshot(self.upload_date)
+        menu = self.setUpObj.create_menu(
+            restaurant=self.setUpObj.create_restaurant(
+                owner=self.owner, name='Another Restaurant'
+            ),
+            upload_date=self.upload_date
+        )
+
+        menus = get_menu_snapshot(self.upload_date)
+        self.assertIn(menu.id, [menu['id'] for menu in menus])
+
+    def test_conditional_fetch_uses_the_snapshot_version(self):
+        etag = self.client.get(self.url, {'upload_date': self.upload_date})[
+            'ETag'
+        ]
+
+        # Session and user only, the validators come from the cache.
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                self.url,
+                {'upload_date': self.upload_date},
+                HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.vote(self.menus[0])
+        res = self.client.get(
+            self.url,
+            {'upload_date': self.upload_date},
+            HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['num_of_votes'], 1)
+
+    def test_snapshot_pages_follow_the_menu_ordering(self):
+        self.vote(self.menus[1])
+        ids = []
+        res = self.client.get(
+            self.url, {'upload_date': self.upload_date, 'page_size': 1}
+        )
+        while True:
+            ids += [menu['id'] for menu in res.data['results']]
+            if not res.data['links']['next']:
+                break
+            res = self.client.get(res.data['links']['next'])
+
+        self.assertEqual(
+            ids, list(Menu.objects.values_list('id', flat=True))
+        )
+        res = self.client.get(res.data['links']['previous'])
+        self.assertEqual(
+            [menu['id'] for menu in res.data['results']], ids[1:2]
+        )
@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import datetime
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.models import Menu
+from voting.tests.base_setup_model import SetUpModel
+
+
+class KeysetPaginationAPITest(APITransactionTestCase):
+    """ Test module for the keyset pagination of list APIs. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee = setUpObj.create_employee_type_user()
+        self.upload_date = datetime.now().date()
+        for i, num_of_votes in enumerate([1, 3, 1, 0, 3]):
+            menu = setUpObj.create_menu(
+                restaurant=setUpObj.create_restaurant(
+                    owner=self.owner,
+                    name=f'Restaurant {i}'
+                ),
+                upload_date=self.upload_date
+            )
+            Menu.objects.filter(pk=menu.pk).update(num_of_votes=num_of_votes)
+        self.client.login(
+            username=self.employee.username,
+            password='password'
+        )
+
+    def tearDown(self):
+        self.client.logout()
+
+    def get_menus(self, url=None, **params):
+        return self.client.get(
+            url or reverse('api:voting-api-v1:menu-list-create'), params
+        )
+
+    def menu_ids(self, res):
+        return [menu['id'] for menu in res.data['results']]
+
+    def test_pages_follow_the_menu_ordering(self):
+        ids = []
+        res = self.get_menus(page_size=2)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += self.menu_ids(res)
+            if not res.data['links']['next']:
+                break
+            res = self.get_menus(res.data['links']['next'])
+
+        self.assertEqual(
+            ids, list(Menu.objects.values_list('id', flat=True))
+        )
+
+    def test_previous_link_returns_the_previous_page(self):
+        first_page = self.get_menus(page_size=2)
+        second_page = self.get_menus(first_page.data['links']['next'])
+        res = self.get_menus(second_page.data['links']['previous'])
+
+        self.assertEqual(self.menu_ids(res), self.menu_ids(first_page))
+        self.assertIsNone(first_page.data['links']['previous'])
+
+    def test_count_is_only_returned_on_request(self):
+        self.assertNotIn('count', self.get_menus().data)
+        self.assertEqual(self.get_menus(count='true').data['count'], 5)
+
+    def test_invalid_cursor_is_rejected(self):
+        res = self.get_menus(cursor='not-a-cursor')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_of_the_wrong_types_is_rejected(self):
+        position = ['x'] * len(Menu._meta.ordering)
+        cursor = base64.urlsafe_b64encode(
+            json.dumps({'p': position, 'r': 0}).encode()
+        ).decode()
+        restaurant = Menu.objects.first().restaurant_id
+
+        for params in [{}, {'restaurant': restaurant}]:
+            res = self.get_menus(cursor=cursor, **params)
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,116 @@
+from datetime import datetime
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITransactionTestCase
+from voting.api.v1.projections import MenuProjection, RestaurantProjection
+from voting.api.v1.serializers import MenuSerializer, RestaurantSerializer
+from voting.models import Menu, Restaurant
+from voting.tests.base_setup_model import SetUpModel
+
+
+class ProjectionParityTest(APITransactionTestCase):
+    """
+    Test module for the values() read path of the restaurant and menu
+    lists, which must render exactly what the serializers render.
+    """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.employee = setUpObj.create_employee_type_user()
+        owners = [
+            setUpObj.create_restaurant_owner_type_user(),
+            setUpObj.create_restaurant_owner_type_user(username='owner_2'),
+        ]
+        self.upload_date = datetime.now().date()
+        restaurants = [
+            setUpObj.create_restaurant(
+                owner=owners[i % 2], name=f'Restaurant {i}'
+            )
+            for i in range(3)
+        ]
+        restaurants[1].address = 'Street 1'
+        restaurants[1].contact_no = '0123456789'
+        restaurants[1].save()
+        setUpObj.create_winning_streak(restaurants[1], self.upload_date, 2)
+        for restaurant, num_of_votes in zip(restaurants, [2, 0, 2]):
+            menu = setUpObj.create_menu(
+                restaurant=restaurant,
+                upload_date=self.upload_date
+            )
+            Menu.objects.filter(pk=menu.pk).update(num_of_votes=num_of_votes)
+        Menu.objects.filter(pk=menu.pk).update(menu_image='')
+        self.client.login(
+            username=self.employee.username,
+            password='password'
+        )
+
+    def tearDown(self):
+        self.client.logout()
+
+    def get_request(self):
+        request = Request(APIRequestFactory().get('/'))
+        request.user = self.employee
+        return request
+
+    def test_restaurants_match_the_serializer(self):
+        request = self.get_request()
+        queryset = Restaurant.objects.with_winning_streak()
+
+        self.assertEqual(
+            RestaurantProjection(request).rows(
+                RestaurantProjection(request).values(queryset)
+            ),
+            RestaurantSerializer(
+                queryset, many=True, context={'request': request}
+            ).data
+        )
+
+    def test_menus_match_the_serializer(self):
+        request = self.get_request()
+        queryset = Menu.objects.select_related('restaurant__owner')
+
+        self.assertEqual(
+            MenuProjection(request).rows(
+                MenuProjection(request).values(queryset)
+            ),
+            MenuSerializer(
+                queryset, many=True, context={'request': request}
+            ).data
+        )
+
+    def test_list_apis_match_the_serializer(self):
+        # Listing every field by name goes through the serializer.
+        for url, fields in [
+            (
+                reverse('api:voting-api-v1:menu-list-create'),
+                'id,restaurant,menu_image,num_of_votes,upload_date'
+            ),
+            (
+                reverse('api:voting-api-v1:restaurant-list-create'),
+                'id,owner,name,address,contact_no,winning_streak'
+            ),
+        ]:
+            projected = self.client.get(url, {'page_size': 100})
+            serialized = self.client.get(
+                url, {'page_size': 100, 'fields': fields}
+            )
+
+            self.assertEqual(projected.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                projected.data['results'], serialized.data['results']
+            )
+
+    def test_projected_pages_follow_the_menu_ordering(self):
+        url = reverse('api:voting-api-v1:menu-list-create')
+        ids = []
+        res = self.client.get(url, {'page_size': 1})
+        while True:
+            ids += [menu['id'] for menu in res.data['results']]
+            if not res.data['links']['next']:
+                break
+            res = self.client.get(res.data['links']['next'])
+
+        self.assertEqual(
+            ids, list(Menu.objects.values_list('id', flat=True))
+        )
@@ -0,0 +1,94 @@
+import datetime
+import io
+from decimal import Decimal
+from unittest import mock
+from core.api.parsers import ORJSONParser
+from core.api.renderers import ORJSONRenderer
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITransactionTestCase
+from voting.tests.base_setup_model import SetUpModel
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """ Test module for the orjson renderer and parser. """
+
+    def assertSameAsStock(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type)
+        )
+
+    def test_output_matches_the_stock_renderer(self):
+        self.assertSameAsStock({
+            'id': 1,
+            'date': datetime.date(2022, 4, 26),
+            'created': timezone.make_aware(
+                datetime.datetime(2022, 4, 26, 12, 30, 15, 123456),
+                timezone.utc
+            ),
+            'time': datetime.time(12, 30, 15, 123456),
+            'price': Decimal('10.50'),
+            'detail': gettext_lazy('Not found.'),
+            'name': 'Café \u2028 \u2029',
+            'ids': {1: [1, 2]},
+            'menu_image': 'http://testserver/media/menu_images/test.jpeg',
+            'nothing': None,
+        })
+
+    def test_indent_and_big_integers_use_the_stock_renderer(self):
+        self.assertSameAsStock({'id': 1}, 'application/json; indent=4')
+        self.assertSameAsStock({'id': 2 ** 70})
+
+    def test_none_renders_nothing(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_parser_reads_json(self):
+        data = ORJSONParser().parse(
+            io.BytesIO('{"name": "Café", "ids": [1, 2]}'.encode())
+        )
+
+        self.assertEqual(data, {'name': 'Café', 'ids': [1, 2]})
+
+    def test_parser_rejects_invalid_json(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
+
+
+class BenchmarkRenderersTest(APITransactionTestCase):
+    """ Test module for the renderer benchmark command. """
+
+    def test_benchmark_reports_both_renderers(self):
+        setUpObj = SetUpModel()
+        employee = setUpObj.create_employee_type_user()
+        menu = setUpObj.create_menu(
+            restaurant=setUpObj.create_restaurant(
+                owner=setUpObj.create_restaurant_owner_type_user()
+            ),
+            upload_date=timezone.localdate()
+        )
+        self.client.login(username=employee.username, password='password')
+        res = self.client.post(
+            reverse('api:voting-api-v1:vote-list-create'),
+            {'menu': menu.id, 'voting_date': timezone.localdate()},
+            format='json'
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        stdout, stderr = mock.Mock(), mock.Mock()
+        call_command(
+            'benchmark_renderers', '--username', employee.username,
+            '--iterations', '10', stdout=stdout, stderr=stderr
+        )
+
+        output = ''.join(call.args[0] for call in stdout.write.call_args_list)
+        for payload in ('menus', 'votes'):
+            for renderer in ('stock', 'orjson'):
+                self.assertRegex(output, rf'{payload}\s+{renderer}\s+\d+')
+        stderr.write.assert_not_called()
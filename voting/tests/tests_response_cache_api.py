@@ -0,0 +1,136 @@
+from datetime import datetime
+from core.api.response_cache import response_cache_stats
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.tests.base_setup_model import SetUpModel
+
+
+class ResponseCacheAPITest(APITransactionTestCase):
+    """ Test module for the cached restaurant, menu and result lists. """
+
+    def setUp(self):
+        self.setUpObj = SetUpModel()
+        self.owner = self.setUpObj.create_restaurant_owner_type_user()
+        self.employee = self.setUpObj.create_employee_type_user()
+        self.admin = self.setUpObj.create_admin_type_user()
+        self.restaurant = self.setUpObj.create_restaurant(owner=self.owner)
+        self.upload_date = datetime.now().date()
+        self.menu = self.setUpObj.create_menu(
+            restaurant=self.restaurant,
+            upload_date=self.upload_date
+        )
+        self.client.login(
+            username=self.employee.username,
+            password='password'
+        )
+
+    def tearDown(self):
+        self.client.logout()
+
+    def get_menus(self, **params):
+        return self.client.get(
+            reverse('api:voting-api-v1:menu-list-create'),
+            {'upload_date': self.upload_date, **params}
+        )
+
+    def test_repeated_list_is_served_from_the_cache(self):
+        first = self.get_menus()
+        second = self.get_menus()
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.get_menus()
+        res = self.get_menus(page_size=1)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+    def test_vote_invalidates_the_menu_list(self):
+        self.get_menus()
+        self.client.post(
+            reverse('api:voting-api-v1:vote-list-create'),
+            {'menu': self.menu.id, 'voting_date': self.upload_date}
+        )
+        res = self.get_menus()
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(res.data['results'][0]['num_of_votes'], 1)
+
+    def test_new_menu_invalidates_the_menu_list(self):
+        self.get_menus()
+        self.setUpObj.create_menu(
+            restaurant=self.setUpObj.create_restaurant(
+                owner=self.owner, name='Another Restaurant'
+            ),
+            upload_date=self.upload_date
+        )
+        res = self.get_menus()
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_publishing_invalidates_the_result_and_restaurant_lists(self):
+        self.setUpObj.create_vote(
+            employee=self.employee,
+            menu=self.menu,
+            voting_date=self.upload_date
+        )
+        result_url = reverse('api:voting-api-v1:result')
+        restaurant_url = reverse('api:voting-api-v1:restaurant-list-create')
+        self.client.get(result_url)
+        self.client.get(restaurant_url)
+
+        self.client.logout()
+        self.client.login(username=self.admin.username, password='password')
+        self.client.post(
+            reverse('api:voting-api-v1:publish-result'),
+            {'stop_voting': True, 'voting_date': self.upload_date}
+        )
+        results = self.client.get(result_url)
+        restaurants = self.client.get(restaurant_url)
+
+        self.assertEqual(results['X-Cache'], 'MISS')
+        self.assertEqual(len(results.data['results']), 1)
+        self.assertEqual(restaurants['X-Cache'], 'MISS')
+        self.assertEqual(restaurants.data['results'][0]['winning_streak'], 1)
+
+    def test_owner_change_invalidates_the_lists(self):
+        url = reverse('api:voting-api-v1:restaurant-list-create')
+        self.client.logout()
+        self.client.login(username=self.owner.username, password='password')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        res = self.client.patch(
+            reverse('api:user-api-v1:profile'), {'first_name': 'Changed'}
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(url)
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(
+            res.data['results'][0]['owner']['first_name'], 'Changed'
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_200_OK)
+
+    def test_login_keeps_the_lists_cached(self):
+        self.get_menus()
+        self.client.logout()
+        self.client.login(username=self.owner.username, password='password')
+
+        self.assertEqual(self.get_menus()['X-Cache'], 'HIT')
+
+    def test_hits_and_misses_are_counted(self):
+        before = response_cache_stats(['menus'])['menus']
+        self.get_menus()
+        self.get_menus()
+        self.get_menus()
+        after = response_cache_stats(['menus'])['menus']
+
+        self.assertEqual(after['miss'] - before['miss'], 1)
+        self.assertEqual(after['hit'] - before['hit'], 2)
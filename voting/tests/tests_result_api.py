@@ -11,6 +11,7 @@ class ResultAPITest(APITransactionTestCase):
 
     def setUp(self):
         setUpObj = SetUpModel()
+        self.setUpObj = setUpObj
         self.admin = setUpObj.create_admin_type_user()
         self.owner = setUpObj.create_restaurant_owner_type_user()
         self.employee = setUpObj.create_employee_type_user()
@@ -64,7 +65,7 @@ class ResultAPITest(APITransactionTestCase):
         self.client.logout()
         total_results = Result.objects.all().count()
 
-        self.assertEqual(len(res.data), total_results)
+        self.assertEqual(len(res.data['results']), total_results)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
     # Tests regarding POST api
@@ -120,8 +121,9 @@ class ResultAPITest(APITransactionTestCase):
             username=self.admin.username,
             password='password'
         )
-        self.restaurant1.winning_streak = 3
-        self.restaurant1.save()
+        self.setUpObj.create_winning_streak(
+            self.restaurant1, self.voting_date, 3
+        )
         res = self.publish_result_using_api(date=self.voting_date)
         self.client.logout()
         self.restaurant1.refresh_from_db()
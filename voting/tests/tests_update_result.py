@@ -0,0 +1,280 @@
+from datetime import datetime, timedelta
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from voting.models import Restaurant, Result
+from voting.tests.base_setup_model import SetUpModel
+from voting.utils import recompute_results, update_result
+
+
+class UpdateResultTests(TestCase):
+    """ Test module for publishing the result of a day. """
+
+    def setUp(self):
+        self.setUpObj = SetUpModel()
+        self.owner = self.setUpObj.create_restaurant_owner_type_user()
+        self.employee = self.setUpObj.create_employee_type_user()
+        self.voting_date = datetime.now().date()
+
+    def create_menus(self, count, name_prefix):
+        menus = []
+        for i in range(count):
+            restaurant = self.setUpObj.create_restaurant(
+                owner=self.owner,
+                name=f'{name_prefix} {i}'
+            )
+            menus.append(self.setUpObj.create_menu(
+                restaurant=restaurant,
+                upload_date=self.voting_date
+            ))
+        return menus
+
+    def test_update_result_picks_menu_with_most_votes(self):
+        menus = self.create_menus(3, 'Restaurant')
+        self.setUpObj.create_vote(
+            employee=self.employee,
+            menu=menus[1],
+            voting_date=self.voting_date
+        )
+
+        success, result = update_result(self.voting_date)
+
+        self.assertTrue(success)
+        self.assertEqual(result.winning_menu, menus[1])
+        self.assertTrue(result.is_voting_stopped)
+        menus[1].restaurant.refresh_from_db()
+        self.assertEqual(menus[1].restaurant.winning_streak, 1)
+
+    def test_update_result_skips_restaurant_on_a_streak(self):
+        menus = self.create_menus(2, 'Restaurant')
+        self.setUpObj.create_winning_streak(
+            menus[0].restaurant, self.voting_date, 3
+        )
+
+        success, result = update_result(self.voting_date)
+
+        self.assertEqual(result.winning_menu, menus[1])
+        menus[0].restaurant.refresh_from_db()
+        self.assertEqual(menus[0].restaurant.winning_streak, 0)
+
+    def test_update_result_without_menus_has_no_winner(self):
+        success, result = update_result(self.voting_date)
+
+        self.assertFalse(success)
+        self.assertFalse(Result.objects.get(pk=result.pk).is_voting_stopped)
+
+    def test_update_result_query_count_does_not_grow_with_menus(self):
+        self.create_menus(2, 'Few')
+        with CaptureQueriesContext(connection) as few_menus:
+            update_result(self.voting_date)
+
+        self.voting_date = datetime(2000, 1, 1).date()
+        self.create_menus(5, 'Many')
+        with CaptureQueriesContext(connection) as many_menus:
+            update_result(self.voting_date)
+
+        self.assertEqual(len(few_menus), len(many_menus))
+
+    def test_publishing_twice_counts_the_streak_once(self):
+        menus = self.create_menus(2, 'Restaurant')
+        update_result(self.voting_date)
+
+        with self.assertNumQueries(1):
+            success, result = update_result(self.voting_date)
+
+        self.assertTrue(success)
+        self.assertEqual(result.winning_menu, menus[0])
+        menus[0].restaurant.refresh_from_db()
+        self.assertEqual(menus[0].restaurant.winning_streak, 1)
+
+
+class RecomputeResultsTests(TestCase):
+    """ Test module for recomputing results over a date range. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee = setUpObj.create_employee_type_user()
+        self.restaurant1 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.dates = [
+            datetime(2022, 5, 1).date() + timedelta(days=i) for i in range(5)
+        ]
+        for voting_date in self.dates:
+            menu = setUpObj.create_menu(
+                restaurant=self.restaurant1,
+                upload_date=voting_date
+            )
+            setUpObj.create_menu(
+                restaurant=self.restaurant2,
+                upload_date=voting_date
+            )
+            setUpObj.create_vote(
+                employee=self.employee,
+                menu=menu,
+                voting_date=voting_date
+            )
+
+    def published(self):
+        return (
+            list(
+                Result.objects.order_by('voting_date')
+                .values_list(
+                    'voting_date', 'winning_menu', 'is_voting_stopped',
+                    'winning_streak'
+                )
+            ),
+            list(
+                Restaurant.objects.with_winning_streak()
+                .values_list('id', 'winning_streak')
+            )
+        )
+
+    def test_recompute_matches_publishing_day_by_day(self):
+        for voting_date in self.dates:
+            update_result(voting_date)
+        expected = self.published()
+        Result.objects.filter(voting_date__gte=self.dates[2]).delete()
+        Result.objects.update(
+            winning_menu=None, is_voting_stopped=False, winning_streak=7
+        )
+
+        num_of_days = recompute_results(self.dates[0], self.dates[-1])
+
+        self.assertEqual(num_of_days, len(self.dates))
+        self.assertEqual(self.published(), expected)
+        self.assertEqual(expected[1], [
+            (self.restaurant1.pk, 1), (self.restaurant2.pk, 0)
+        ])
+
+    def test_recompute_keeps_stored_winners_outside_the_range(self):
+        for voting_date in self.dates:
+            update_result(voting_date)
+        expected = self.published()
+        Result.objects.filter(
+            voting_date__gte=self.dates[3]
+        ).update(winning_streak=0)
+
+        call_command(
+            'recompute_results',
+            '--start', self.dates[3].isoformat(),
+            '--end', self.dates[3].isoformat(),
+            stdout=mock.Mock()
+        )
+
+        self.assertEqual(self.published(), expected)
+
+    def test_recompute_command_refuses_today(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                'recompute_results',
+                '--start', self.dates[0].isoformat(),
+                '--end', datetime.now().date().isoformat(),
+                stdout=mock.Mock()
+            )
+
+        self.assertFalse(
+            Result.objects.filter(voting_date=datetime.now().date()).exists()
+        )
+
+    def test_recompute_leaves_the_days_of_archived_votes_alone(self):
+        for voting_date in self.dates:
+            update_result(voting_date)
+        Result.objects.update(winning_streak=7)
+
+        with mock.patch(
+            'voting.utils.votes_retained_since', return_value=self.dates[3]
+        ):
+            num_of_days = recompute_results(self.dates[0], self.dates[-1])
+
+        self.assertEqual(num_of_days, 2)
+        self.assertEqual(
+            list(
+                Result.objects.filter(voting_date__lt=self.dates[3])
+                .values_list('winning_streak', flat=True)
+            ),
+            [7, 7, 7]
+        )
+
+    def test_recompute_command_refuses_archived_days(self):
+        with mock.patch(
+            'voting.management.commands.recompute_results'
+            '.votes_retained_since',
+            return_value=self.dates[3]
+        ):
+            with self.assertRaises(CommandError):
+                call_command(
+                    'recompute_results',
+                    '--start', self.dates[0].isoformat(),
+                    '--end', self.dates[-1].isoformat(),
+                    stdout=mock.Mock()
+                )
+
+
+class WinningStreakTests(TestCase):
+    """ Test module for streaks derived from the published results. """
+
+    def setUp(self):
+        self.setUpObj = SetUpModel()
+        self.owner = self.setUpObj.create_restaurant_owner_type_user()
+        self.restaurant1 = self.setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = self.setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.voting_date = datetime(2022, 5, 10).date()
+        self.setUpObj.create_winning_streak(
+            self.restaurant1, self.voting_date, 3
+        )
+
+    def test_streak_follows_consecutive_results(self):
+        self.assertEqual(self.restaurant1.winning_streak, 3)
+        self.assertEqual(self.restaurant2.winning_streak, 0)
+
+    def test_editing_a_past_result_rebuilds_later_streaks(self):
+        result = Result.objects.get(
+            voting_date=self.voting_date - timedelta(days=2)
+        )
+        result.winning_menu = self.setUpObj.create_menu(
+            self.restaurant2, result.voting_date
+        )
+        result.save()
+
+        self.assertEqual(self.restaurant1.winning_streak, 1)
+        self.assertEqual(
+            list(
+                Result.objects.order_by('voting_date')
+                .values_list('winning_streak', flat=True)
+            ),
+            [1, 1, 1]
+        )
+
+    def test_deleting_a_result_rebuilds_later_streaks(self):
+        Result.objects.get(
+            voting_date=self.voting_date - timedelta(days=3)
+        ).delete()
+
+        self.assertEqual(self.restaurant1.winning_streak, 2)
+
+    def test_listing_restaurants_reads_streaks_in_one_query(self):
+        with self.assertNumQueries(1):
+            streaks = dict(
+                (restaurant.pk, restaurant.winning_streak)
+                for restaurant in Restaurant.objects.with_winning_streak()
+            )
+
+        self.assertEqual(
+            streaks, {self.restaurant1.pk: 3, self.restaurant2.pk: 0}
+        )
@@ -72,7 +72,7 @@ class VoteListCreateAPITest(APITransactionTestCase):
         )
         self.client.logout()
         total_votes = Vote.objects.filter(employee=self.employee1).count()
-        self.assertEqual(len(res.data), total_votes)
+        self.assertEqual(len(res.data['results']), total_votes)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
     # Tests regarding POST api
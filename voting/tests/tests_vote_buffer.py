@@ -0,0 +1,191 @@
+import tempfile
+from datetime import datetime
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from django.conf import settings
+from voting.buffer import VoteBuffer, get_vote_buffer
+from voting.models import Result, Vote
+from voting.tests.base_setup_model import SetUpModel
+
+buffer_dir = tempfile.TemporaryDirectory()
+
+
+@override_settings(
+    VOTING_WRITE_BEHIND=True,
+    VOTING_WRITE_BEHIND_FLUSH_INTERVAL=0
+)
+class VoteBufferAPITest(APITransactionTestCase):
+    """ Test module for voting through the write-behind buffer. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.admin = setUpObj.create_admin_type_user()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee1 = setUpObj.create_employee_type_user()
+        self.employee2 = setUpObj.create_employee_type_user(username='emp2')
+        self.restaurant1 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.voting_date = datetime.now().date()
+        self.menu1 = setUpObj.create_menu(
+            restaurant=self.restaurant1,
+            upload_date=self.voting_date
+        )
+        self.menu2 = setUpObj.create_menu(
+            restaurant=self.restaurant2,
+            upload_date=self.voting_date
+        )
+        buffer_path = f'{buffer_dir.name}/{self._testMethodName}.sqlite3'
+        settings_override = override_settings(
+            VOTING_WRITE_BEHIND_PATH=buffer_path
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_vote_using_api(self, menu):
+        payload = {
+            'menu': menu.pk,
+            'voting_date': self.voting_date
+        }
+        return self.client.post(
+            reverse('api:voting-api-v1:vote-list-create'),
+            data=payload
+        )
+
+    def publish_result_using_api(self):
+        payload = {
+            'stop_voting': True,
+            'voting_date': self.voting_date
+        }
+        return self.client.post(
+            reverse('api:voting-api-v1:publish-result'),
+            data=payload
+        )
+
+    def test_vote_is_accepted_without_writing_it(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        res = self.create_vote_using_api(menu=self.menu1)
+        self.client.logout()
+        self.menu1.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(Vote.objects.exists())
+        self.assertEqual(self.menu1.num_of_votes, 0)
+        self.assertEqual(get_vote_buffer().pending(), 1)
+
+    def test_employee_can_vote_once_per_day(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        res1 = self.create_vote_using_api(menu=self.menu1)
+        res2 = self.create_vote_using_api(menu=self.menu2)
+        self.client.logout()
+
+        self.assertEqual(res1.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res2.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_flush_writes_votes_and_counters(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        self.create_vote_using_api(menu=self.menu2)
+        self.client.logout()
+        flushed = get_vote_buffer().flush_all()
+        self.menu2.refresh_from_db()
+
+        self.assertEqual(flushed, 1)
+        self.assertEqual(get_vote_buffer().pending(), 0)
+        self.assertEqual(self.menu2.num_of_votes, 1)
+        self.assertTrue(
+            Vote.objects.filter(employee=self.employee1).exists()
+        )
+
+    def test_publishing_result_flushes_buffer_first(self):
+        for employee in [self.employee1, self.employee2]:
+            self.client.login(
+                username=employee.username,
+                password='password'
+            )
+            self.create_vote_using_api(menu=self.menu2)
+            self.client.logout()
+        self.client.login(username=self.admin.username, password='password')
+        res = self.publish_result_using_api()
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['winner']['id'], self.menu2.pk)
+        self.assertEqual(Vote.objects.count(), 2)
+
+    def test_employee_can_vote_again_after_deleting_the_vote(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        self.create_vote_using_api(menu=self.menu1)
+        get_vote_buffer().flush_all()
+        vote = Vote.objects.get(employee=self.employee1)
+        res1 = self.client.delete(
+            reverse('api:voting-api-v1:vote-rud', kwargs={'pk': vote.pk})
+        )
+        res2 = self.create_vote_using_api(menu=self.menu2)
+        self.client.logout()
+
+        self.assertEqual(res1.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(res2.status_code, status.HTTP_202_ACCEPTED)
+
+    def test_votes_flushed_after_voting_stopped_are_dropped(self):
+        self.client.login(
+            username=self.employee1.username,
+            password='password'
+        )
+        self.create_vote_using_api(menu=self.menu1)
+        self.client.logout()
+        Result.objects.create(
+            voting_date=self.voting_date,
+            winning_menu=self.menu2,
+            is_voting_stopped=True
+        )
+
+        flushed = get_vote_buffer().flush_all()
+        self.menu1.refresh_from_db()
+
+        self.assertEqual(flushed, 1)
+        self.assertFalse(Vote.objects.exists())
+        self.assertEqual(self.menu1.num_of_votes, 0)
+
+    def test_flushed_vote_is_a_duplicate_in_every_process(self):
+        worker1 = VoteBuffer(settings.VOTING_WRITE_BEHIND_PATH)
+        worker2 = VoteBuffer(settings.VOTING_WRITE_BEHIND_PATH)
+
+        self.assertTrue(worker1.append(
+            self.employee1.pk, self.menu1.pk, self.voting_date
+        ))
+        worker1.flush_all()
+
+        self.assertFalse(worker2.append(
+            self.employee1.pk, self.menu2.pk, self.voting_date
+        ))
+        self.assertEqual(worker2.pending(), 0)
+
+    def test_vote_written_without_the_buffer_is_a_duplicate(self):
+        Vote.objects.create(
+            employee=self.employee1,
+            menu=self.menu1,
+            voting_date=self.voting_date
+        )
+
+        self.assertFalse(get_vote_buffer().append(
+            self.employee1.pk, self.menu2.pk, self.voting_date
+        ))
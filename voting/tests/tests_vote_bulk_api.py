@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from voting.models import Vote
+from voting.state import is_voting_stopped
+from voting.tests.base_setup_model import SetUpModel
+
+
+class VoteBulkCreateAPITest(APITransactionTestCase):
+    """ Test module for bulk create API of the Vote model. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.admin = setUpObj.create_admin_type_user()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee1 = setUpObj.create_employee_type_user()
+        self.employee2 = setUpObj.create_employee_type_user(username='emp2')
+        self.employee3 = setUpObj.create_employee_type_user(username='emp3')
+        self.restaurant1 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.voting_date = datetime.now().date()
+        self.menu1 = setUpObj.create_menu(
+            restaurant=self.restaurant1,
+            upload_date=self.voting_date
+        )
+        self.menu2 = setUpObj.create_menu(
+            restaurant=self.restaurant2,
+            upload_date=self.voting_date
+        )
+        self.vote1 = setUpObj.create_vote(
+            employee=self.employee1,
+            menu=self.menu1,
+            voting_date=self.voting_date
+        )
+        self.result = setUpObj.create_result(self.voting_date)
+
+    def vote_item(self, employee, menu, date=None):
+        return {
+            'employee': employee.pk,
+            'menu': menu.pk,
+            'voting_date': str(date or self.voting_date)
+        }
+
+    def bulk_create_votes_using_api(self, votes):
+        return self.client.post(
+            reverse('api:voting-api-v1:vote-bulk-create'),
+            data={'votes': votes},
+            format='json'
+        )
+
+    def test_employee_can_not_bulk_vote(self):
+        self.client.login(
+            username=self.employee2.username,
+            password='password'
+        )
+        res = self.bulk_create_votes_using_api(
+            [self.vote_item(self.employee2, self.menu1)]
+        )
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_admin_can_bulk_vote(self):
+        self.client.login(username=self.admin.username, password='password')
+        res = self.bulk_create_votes_using_api([
+            self.vote_item(self.employee2, self.menu1),
+            self.vote_item(self.employee3, self.menu1),
+        ])
+        self.client.logout()
+        self.menu1.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['created'], 2)
+        self.assertEqual(self.menu1.num_of_votes, 3)
+        self.assertEqual(
+            [item['id'] for item in res.data['results']],
+            list(
+                Vote.objects
+                .filter(employee__in=[self.employee2, self.employee3])
+                .order_by('employee_id')
+                .values_list('id', flat=True)
+            )
+        )
+
+    def test_bulk_vote_reports_each_rejected_item(self):
+        self.client.login(username=self.admin.username, password='password')
+        res = self.bulk_create_votes_using_api([
+            self.vote_item(self.employee2, self.menu2),
+            self.vote_item(self.employee2, self.menu1),
+            self.vote_item(self.employee1, self.menu2),
+            self.vote_item(
+                self.employee3,
+                self.menu2,
+                self.voting_date + timedelta(days=1)
+            ),
+            self.vote_item(self.owner, self.menu2),
+        ])
+        self.client.logout()
+        self.menu1.refresh_from_db()
+        self.menu2.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [item['status'] for item in res.data['results']],
+            ['created', 'rejected', 'rejected', 'rejected', 'rejected']
+        )
+        self.assertEqual(
+            res.data['results'][1]['error'], 'You have already voted.'
+        )
+        self.assertEqual(
+            res.data['results'][2]['error'], 'You have already voted.'
+        )
+        self.assertEqual(self.menu1.num_of_votes, 1)
+        self.assertEqual(self.menu2.num_of_votes, 1)
+
+    def test_can_not_bulk_vote_after_voting_is_stopped(self):
+        self.result.winning_menu = self.menu1
+        self.result.stop_voting()
+        self.client.login(username=self.admin.username, password='password')
+        res = self.bulk_create_votes_using_api(
+            [self.vote_item(self.employee2, self.menu2)]
+        )
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            res.data['results'][0]['error'],
+            'Sorry! Voting is stopped for today.'
+        )
+        self.assertFalse(Vote.objects.filter(employee=self.employee2).exists())
+
+    def test_bulk_vote_query_count_does_not_grow_with_batch_size(self):
+        setUpObj = SetUpModel()
+        employees = [
+            setUpObj.create_employee_type_user(username=f'bulk_emp{i}')
+            for i in range(4)
+        ]
+        self.client.login(username=self.admin.username, password='password')
+        # Both batches read the voting state from the cache.
+        is_voting_stopped(self.voting_date)
+        with CaptureQueriesContext(connection) as small_batch:
+            self.bulk_create_votes_using_api(
+                [self.vote_item(employees[0], self.menu1)]
+            )
+        with CaptureQueriesContext(connection) as large_batch:
+            res = self.bulk_create_votes_using_api([
+                self.vote_item(employee, self.menu2)
+                for employee in employees[1:]
+            ])
+        self.client.logout()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(small_batch), len(large_batch))
@@ -0,0 +1,73 @@
+import unittest
+from datetime import datetime, timedelta
+from django.db import connection
+from django.test import TestCase
+from voting.models import Vote
+from voting.services import (
+    ALREADY_VOTED_MESSAGE, VOTING_DATE_MISMATCH_MESSAGE,
+    VOTING_STOPPED_MESSAGE, cast_vote
+)
+from voting.tests.base_setup_model import SetUpModel
+
+
+class CastVoteTests(TestCase):
+    """ Test module for casting a single vote through the service. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee1 = setUpObj.create_employee_type_user()
+        self.employee2 = setUpObj.create_employee_type_user(username='emp2')
+        self.restaurant = setUpObj.create_restaurant(owner=self.owner)
+        self.voting_date = datetime.now().date()
+        self.menu = setUpObj.create_menu(
+            restaurant=self.restaurant,
+            upload_date=self.voting_date
+        )
+        self.result = setUpObj.create_result(self.voting_date)
+
+    def test_cast_vote_creates_vote_and_counts_it(self):
+        vote, error = cast_vote(self.employee1, self.menu, self.voting_date)
+
+        self.assertIsNone(error)
+        self.assertEqual(
+            Vote.objects.get(employee=self.employee1).pk, vote.pk
+        )
+        self.menu.refresh_from_db()
+        self.assertEqual(self.menu.num_of_votes, 1)
+
+    def test_cast_vote_rejects_second_vote(self):
+        cast_vote(self.employee1, self.menu, self.voting_date)
+        vote, error = cast_vote(self.employee1, self.menu, self.voting_date)
+
+        self.assertIsNone(vote)
+        self.assertEqual(error, ALREADY_VOTED_MESSAGE)
+        self.menu.refresh_from_db()
+        self.assertEqual(self.menu.num_of_votes, 1)
+
+    def test_cast_vote_rejects_other_date(self):
+        vote, error = cast_vote(
+            self.employee1, self.menu, self.voting_date + timedelta(days=1)
+        )
+
+        self.assertIsNone(vote)
+        self.assertEqual(error, VOTING_DATE_MISMATCH_MESSAGE)
+
+    def test_cast_vote_rejects_vote_after_voting_stopped(self):
+        self.result.winning_menu = self.menu
+        self.result.stop_voting()
+
+        vote, error = cast_vote(self.employee2, self.menu, self.voting_date)
+
+        self.assertIsNone(vote)
+        self.assertEqual(error, VOTING_STOPPED_MESSAGE)
+        self.assertFalse(Vote.objects.exists())
+
+    @unittest.skipUnless(
+        connection.vendor == 'postgresql', 'single statement cast only'
+    )
+    def test_cast_vote_is_one_query(self):
+        with self.assertNumQueries(1):
+            cast_vote(self.employee1, self.menu, self.voting_date)
+        with self.assertNumQueries(1):
+            cast_vote(self.employee1, self.menu, self.voting_date)
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from voting.models import Menu, Vote
+from voting.services import reconcile_vote_counts
+from voting.tests.base_setup_model import SetUpModel
+
+
+class VoteCounterTests(TestCase):
+    """ Test module for keeping Menu.num_of_votes in step with votes. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.setUpObj = setUpObj
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee1 = setUpObj.create_employee_type_user()
+        self.employee2 = setUpObj.create_employee_type_user(username='emp2')
+        self.restaurant1 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.voting_date = datetime.now().date()
+        self.menu1 = setUpObj.create_menu(
+            restaurant=self.restaurant1,
+            upload_date=self.voting_date
+        )
+        self.menu2 = setUpObj.create_menu(
+            restaurant=self.restaurant2,
+            upload_date=self.voting_date
+        )
+        self.vote1 = setUpObj.create_vote(
+            employee=self.employee1,
+            menu=self.menu1,
+            voting_date=self.voting_date
+        )
+        self.vote2 = setUpObj.create_vote(
+            employee=self.employee2,
+            menu=self.menu1,
+            voting_date=self.voting_date
+        )
+
+    def assertNumOfVotes(self, menu1_votes, menu2_votes):
+        self.menu1.refresh_from_db()
+        self.menu2.refresh_from_db()
+        self.assertEqual(self.menu1.num_of_votes, menu1_votes)
+        self.assertEqual(self.menu2.num_of_votes, menu2_votes)
+
+    def test_changing_vote_does_not_reread_the_vote(self):
+        vote = Vote.objects.get(pk=self.vote1.pk)
+        vote.menu = self.menu2
+        with CaptureQueriesContext(connection) as queries:
+            vote.save()
+
+        self.assertFalse(
+            [q for q in queries if q['sql'].startswith('SELECT')]
+        )
+        self.assertNumOfVotes(1, 1)
+
+    def test_deleting_vote_decrements_num_of_votes(self):
+        self.vote1.delete()
+
+        self.assertNumOfVotes(1, 0)
+
+    def test_queryset_update_moves_votes(self):
+        Vote.objects.filter(menu=self.menu1).update(menu=self.menu2)
+
+        self.assertNumOfVotes(0, 2)
+
+    def test_queryset_delete_decrements_num_of_votes(self):
+        Vote.objects.filter(employee=self.employee1).delete()
+
+        self.assertNumOfVotes(1, 0)
+
+    def test_bulk_create_increments_num_of_votes(self):
+        employee3 = self.setUpObj.create_employee_type_user(username='emp3')
+        employee4 = self.setUpObj.create_employee_type_user(username='emp4')
+        Vote.objects.bulk_create([
+            Vote(
+                employee=employee,
+                menu=self.menu2,
+                voting_date=self.voting_date
+            )
+            for employee in [employee3, employee4]
+        ])
+
+        self.assertNumOfVotes(2, 2)
+
+    def test_bulk_create_can_not_ignore_conflicts(self):
+        self.assertRaises(
+            ValueError, lambda: (
+                Vote.objects.bulk_create([], ignore_conflicts=True)
+            )
+        )
+
+    def test_bulk_update_moves_votes(self):
+        self.vote1.menu = self.menu2
+        self.vote2.menu = self.menu2
+        Vote.objects.bulk_update([self.vote1, self.vote2], ['menu'])
+
+        self.assertNumOfVotes(0, 2)
+
+    def test_deleting_employee_takes_back_his_votes(self):
+        self.employee1.delete()
+
+        self.assertNumOfVotes(1, 0)
+
+    def test_deleting_vote_does_not_take_counter_below_zero(self):
+        Menu.objects.filter(pk=self.menu1.pk).update(num_of_votes=0)
+        self.vote1.delete()
+
+        self.assertNumOfVotes(0, 0)
+
+    def test_reconcile_fixes_drifted_counters(self):
+        Menu.objects.filter(pk=self.menu1.pk).update(num_of_votes=5)
+        Menu.objects.filter(pk=self.menu2.pk).update(num_of_votes=1)
+
+        drifts = list(reconcile_vote_counts(chunk_size=1))
+
+        self.assertEqual(
+            [(drift.menu_id, drift.stored, drift.actual) for drift in drifts],
+            [(self.menu1.pk, 5, 2), (self.menu2.pk, 1, 0)]
+        )
+        self.assertNumOfVotes(2, 0)
+
+    def test_reconcile_dry_run_changes_nothing(self):
+        Menu.objects.filter(pk=self.menu1.pk).update(num_of_votes=5)
+
+        call_command(
+            'reconcile_vote_counts', '--dry-run', stdout=mock.Mock()
+        )
+
+        self.assertNumOfVotes(5, 0)
+
+    def test_reconcile_only_checks_the_date_window(self):
+        Menu.objects.filter(pk=self.menu1.pk).update(num_of_votes=5)
+
+        drifts = list(reconcile_vote_counts(
+            start=self.voting_date + timedelta(days=1)
+        ))
+
+        self.assertEqual(drifts, [])
+        self.assertNumOfVotes(5, 0)
+
+    def test_reconcile_skips_the_months_of_archived_votes(self):
+        Menu.objects.filter(pk=self.menu1.pk).update(num_of_votes=5)
+
+        with mock.patch(
+            'voting.services.votes_retained_since',
+            return_value=self.voting_date + timedelta(days=1)
+        ):
+            drifts = list(reconcile_vote_counts())
+
+        self.assertEqual(drifts, [])
+        self.assertNumOfVotes(5, 0)
@@ -0,0 +1,65 @@
+import datetime
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from voting.partitions import (
+    VotePartition, add_months, create_vote_partitions,
+    expired_vote_partitions, vote_partition_name, vote_partitions,
+    votes_retained_since
+)
+
+
+def month_partition(year, month):
+    start = datetime.date(year, month, 1)
+    return VotePartition(
+        vote_partition_name(start), start, add_months(start, 1)
+    )
+
+
+class VotePartitionsTest(TestCase):
+    """ Test module for the monthly vote partitions. """
+
+    def test_add_months_moves_to_the_first_day_across_years(self):
+        self.assertEqual(
+            add_months(datetime.date(2022, 11, 17), 0),
+            datetime.date(2022, 11, 1)
+        )
+        self.assertEqual(
+            add_months(datetime.date(2022, 11, 17), 3),
+            datetime.date(2023, 2, 1)
+        )
+        self.assertEqual(
+            add_months(datetime.date(2022, 1, 31), -13),
+            datetime.date(2020, 12, 1)
+        )
+
+    def test_partitions_are_named_after_their_month(self):
+        self.assertEqual(
+            vote_partition_name(datetime.date(2022, 4, 1)),
+            'voting_vote_2022_04'
+        )
+
+    def test_only_months_past_the_retention_expire(self):
+        partitions = [
+            month_partition(2022, month) for month in range(1, 13)
+        ]
+
+        expired = expired_vote_partitions(
+            partitions, 3, today=datetime.date(2022, 6, 15)
+        )
+
+        self.assertEqual(
+            [partition.name for partition in expired],
+            ['voting_vote_2022_01', 'voting_vote_2022_02']
+        )
+
+    def test_votes_are_not_partitioned_on_other_databases(self):
+        self.assertEqual(vote_partitions(), [])
+        self.assertIsNone(votes_retained_since())
+        self.assertEqual(create_vote_partitions(), [])
+
+    def test_commands_need_a_partitioned_vote_table(self):
+        for command in ['create_vote_partitions', 'archive_vote_partitions']:
+            with self.assertRaises(CommandError):
+                call_command(command, stdout=mock.Mock())
@@ -0,0 +1,77 @@
+from datetime import datetime
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from voting.models import MenuVoteShard, Vote
+from voting.services import reconcile_vote_counts
+from voting.tests.base_setup_model import SetUpModel
+from voting.utils import update_result
+
+
+@override_settings(VOTING_COUNTER_SHARDS=4)
+class VoteShardTests(TestCase):
+    """ Test module for sharded vote counters of hot menus. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employees = [
+            setUpObj.create_employee_type_user(username=f'emp{i}')
+            for i in range(6)
+        ]
+        self.restaurant1 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 1'
+                    )
+        self.restaurant2 = setUpObj.create_restaurant(
+                        owner=self.owner,
+                        name='Restaurant 2'
+                    )
+        self.voting_date = datetime.now().date()
+        self.menu1 = setUpObj.create_menu(
+            restaurant=self.restaurant1,
+            upload_date=self.voting_date
+        )
+        self.menu2 = setUpObj.create_menu(
+            restaurant=self.restaurant2,
+            upload_date=self.voting_date
+        )
+        self.votes = [
+            setUpObj.create_vote(
+                employee=employee,
+                menu=self.menu2 if i < 4 else self.menu1,
+                voting_date=self.voting_date
+            )
+            for i, employee in enumerate(self.employees)
+        ]
+
+    def test_votes_are_spread_over_shards(self):
+        self.menu2.refresh_from_db()
+
+        self.assertEqual(self.menu2.num_of_votes, 0)
+        self.assertEqual(
+            MenuVoteShard.objects.filter(menu=self.menu2).count(), 4
+        )
+
+    def test_folding_moves_shards_into_menu(self):
+        Vote.objects.filter(pk=self.votes[0].pk).delete()
+        stdout = StringIO()
+        call_command('fold_vote_shards', stdout=stdout)
+        self.menu1.refresh_from_db()
+        self.menu2.refresh_from_db()
+
+        self.assertEqual(self.menu1.num_of_votes, 2)
+        self.assertEqual(self.menu2.num_of_votes, 3)
+        self.assertFalse(
+            MenuVoteShard.objects.exclude(num_of_votes=0).exists()
+        )
+        self.assertEqual(stdout.getvalue(), 'Folded votes of 2 menus.\n')
+
+    def test_publishing_result_sees_sharded_votes(self):
+        success, result = update_result(self.voting_date)
+
+        self.assertTrue(success)
+        self.assertEqual(result.winning_menu, self.menu2)
+
+    def test_reconcile_counts_votes_in_shards(self):
+        self.assertEqual(list(reconcile_vote_counts()), [])
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from voting.models import Result, Vote
+from voting import state
+from voting.services import VOTING_STOPPED_MESSAGE
+from voting.state import (
+    get_voting_state, is_voting_stopped, voting_state_changed
+)
+from voting.tests.base_setup_model import SetUpModel
+from voting.utils import update_result
+
+
+class VotingStateTests(TransactionTestCase):
+    """ Test module for the cached per-day voting state. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee = setUpObj.create_employee_type_user()
+        self.restaurant = setUpObj.create_restaurant(owner=self.owner)
+        self.voting_date = datetime.now().date()
+        self.menu = setUpObj.create_menu(
+            restaurant=self.restaurant,
+            upload_date=self.voting_date
+        )
+        self.result = setUpObj.create_result(self.voting_date)
+
+    def test_state_is_read_from_the_database_once(self):
+        self.assertFalse(is_voting_stopped(self.voting_date))
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(10):
+                self.assertFalse(is_voting_stopped(self.voting_date))
+        self.assertEqual(len(queries), 0)
+
+    def test_stopping_voting_invalidates_the_state(self):
+        self.assertFalse(is_voting_stopped(self.voting_date))
+        self.result.winning_menu = self.menu
+        self.result.stop_voting()
+
+        state = get_voting_state(self.voting_date)
+        self.assertTrue(state.is_voting_stopped)
+        self.assertEqual(state.winning_menu_id, self.menu.pk)
+
+    def test_read_racing_an_invalidation_is_not_served(self):
+        add = state.cache.add
+
+        def invalidate_then_add(*args, **kwargs):
+            Result.objects.filter(pk=self.result.pk).update(
+                is_voting_stopped=True
+            )
+            state.invalidate_voting_state(self.voting_date)
+            return add(*args, **kwargs)
+
+        with mock.patch.object(
+            state.cache, 'add', side_effect=invalidate_then_add
+        ):
+            self.assertFalse(is_voting_stopped(self.voting_date))
+        # As once the local copy expired.
+        state._local_states.clear()
+
+        self.assertTrue(is_voting_stopped(self.voting_date))
+
+    def test_deleting_result_invalidates_the_state(self):
+        self.result.winning_menu = self.menu
+        self.result.stop_voting()
+        self.assertTrue(is_voting_stopped(self.voting_date))
+
+        Result.objects.get(pk=self.result.pk).delete()
+        self.assertFalse(is_voting_stopped(self.voting_date))
+
+    def test_update_result_sends_voting_state_changed(self):
+        Vote.objects.create(
+            employee=self.employee,
+            menu=self.menu,
+            voting_date=self.voting_date
+        )
+        handler = mock.Mock()
+        voting_state_changed.connect(handler)
+        self.addCleanup(voting_state_changed.disconnect, handler)
+
+        update_result(self.voting_date)
+
+        handler.assert_called_with(
+            signal=voting_state_changed,
+            sender=None,
+            voting_date=self.voting_date
+        )
+        self.assertTrue(is_voting_stopped(self.voting_date))
+
+    @override_settings(VOTING_CUTOFF_TIME='00:00')
+    def test_voting_is_stopped_after_cutoff_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertTrue(is_voting_stopped(self.voting_date))
+        self.assertFalse(
+            is_voting_stopped(self.voting_date + timedelta(days=1))
+        )
+
+    @override_settings(VOTING_CUTOFF_TIME='00:00')
+    def test_scheduler_publishes_result_after_cutoff(self):
+        call_command('run_voting_scheduler', once=True, stdout=mock.Mock())
+
+        result = Result.objects.get(voting_date=self.voting_date)
+        self.assertTrue(result.is_voting_stopped)
+        self.assertEqual(result.winning_menu, self.menu)
+
+    @override_settings(
+        VOTING_CUTOFF_TIME='00:00', VOTING_WARM_HOSTS=['testserver']
+    )
+    def test_scheduler_warms_the_lists_of_the_day(self):
+        employee = SetUpModel().create_employee_type_user(username='emp2')
+        call_command('run_voting_scheduler', once=True, stdout=mock.Mock())
+
+        self.client.login(username=employee.username, password='password')
+        for url, params in [
+            (
+                reverse('api:voting-api-v1:result'),
+                {'voting_date': self.voting_date.isoformat()}
+            ),
+            (
+                reverse('api:voting-api-v1:menu-list-create'),
+                {'upload_date': self.voting_date.isoformat()}
+            ),
+        ]:
+            res = self.client.get(url, params)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(res['X-Cache'], 'HIT')
+
+
+class VotingStateAPITest(APITransactionTestCase):
+    """ Test module for casting votes against the cached voting state. """
+
+    def setUp(self):
+        setUpObj = SetUpModel()
+        self.admin = setUpObj.create_admin_type_user()
+        self.owner = setUpObj.create_restaurant_owner_type_user()
+        self.employee1 = setUpObj.create_employee_type_user()
+        self.employee2 = setUpObj.create_employee_type_user(username='emp2')
+        self.restaurant = setUpObj.create_restaurant(owner=self.owner)
+        self.voting_date = datetime.now().date()
+        self.menu = setUpObj.create_menu(
+            restaurant=self.restaurant,
+            upload_date=self.voting_date
+        )
+
+    def vote(self, employee):
+        self.client.login(username=employee.username, password='password')
+        response = self.client.post(
+            reverse('api:voting-api-v1:vote-list-create'),
+            data={'menu': self.menu.pk, 'voting_date': self.voting_date}
+        )
+        self.client.logout()
+        return response
+
+    def test_vote_is_rejected_right_after_result_is_published(self):
+        res = self.vote(self.employee1)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.client.login(username=self.admin.username, password='password')
+        self.client.post(
+            reverse('api:voting-api-v1:publish-result'),
+            data={'voting_date': self.voting_date, 'stop_voting': True}
+        )
+        self.client.logout()
+
+        res = self.vote(self.employee2)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(res.data['detail'], VOTING_STOPPED_MESSAGE)
+
+    def test_casting_a_vote_does_not_create_a_result(self):
+        self.vote(self.employee1)
+        self.assertFalse(Result.objects.exists())
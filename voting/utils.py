@@ -1,28 +1,246 @@
-from voting.models import Menu, Result
+import datetime
+
+from core.api.response_cache import invalidate_cached_responses
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from voting.buffer import flush_vote_buffer, holding_vote_buffer
+from voting.models import (
+    DailyRestaurantVotes, Menu, Restaurant, Result, next_winning_streak
+)
+from voting.partitions import votes_retained_since
+from voting.services import fold_vote_shards
+from voting.snapshots import invalidate_menu_snapshots
+from voting.state import invalidate_voting_state
+
+
+# A restaurant that won this many days in a row cannot win the next day.
+MAX_WINNING_STREAK = 3
+
+
+def pick_winner(ranked_menus):
+    """
+    Applies the streak rule to the best two menus of a day, ranked by
+    votes. Returns ``(winning_menu, skipped_menu)``: the top menu wins
+    unless its restaurant reached ``MAX_WINNING_STREAK`` and there is a
+    runner-up, in which case the top menu is skipped.
+    """
+    if not ranked_menus:
+        return None, None
+    top = ranked_menus[0]
+    if (
+        top.restaurant.winning_streak >= MAX_WINNING_STREAK
+        and len(ranked_menus) > 1
+    ):
+        return ranked_menus[1], top
+    return top, None
+
+
+def _attach_winning_run(ranked_menus, run):
+    """
+    Sets the streak each ranked menu's restaurant had after the published
+    result ``run`` stands for, i.e. as of the day being decided.
+    """
+    restaurant_id, streak = run
+    for menu in ranked_menus:
+        menu.restaurant.winning_streak = (
+            streak if menu.restaurant_id == restaurant_id else 0
+        )
 
 
 def update_result(voting_date):
-    result_updated = False
-    result, _ = Result.objects.get_or_create(voting_date=voting_date)
+    """
+    Publishes the result of ``voting_date``, once.
+
+    The day's ``Result`` row is locked first, so concurrent publications
+    of the same day run one after the other; the ranking and stopping the
+    voting then commit together, and ``Result.save`` extends the winning
+    streaks. Whoever gets the lock after the result was published, and any
+    later call, returns the stored winner without recomputing it.
+    The number of queries does not depend on the number of menus.
+    """
+    result = (
+        Result.objects
+        .filter(voting_date=voting_date, is_voting_stopped=True)
+        .select_related('winning_menu')
+        .first()
+    )
+    if result is not None:
+        return result.winning_menu is not None, result
+
+    flush_vote_buffer()
+    with holding_vote_buffer(), transaction.atomic():
+        result, _ = (
+            Result.objects
+            .select_for_update()
+            .get_or_create(voting_date=voting_date)
+        )
+        if result.is_voting_stopped:
+            # Published while we were waiting for the lock.
+            return result.winning_menu_id is not None, result
+        # Votes buffered since the first flush; later ones find the day
+        # stopped when they are flushed.
+        flush_vote_buffer()
+        fold_vote_shards(upload_date=voting_date)
+        ranked_menus = list(
+            Menu.objects
+            .filter(upload_date=voting_date)
+            .select_related('restaurant')[:2]
+        )
+        _attach_winning_run(
+            ranked_menus, Result.objects.winning_run(before=voting_date)
+        )
+        winning_menu, _ = pick_winner(ranked_menus)
+        if winning_menu is not None:
+            result.winning_menu = winning_menu
+            result.stop_voting()
+            rollup_daily_votes(voting_date, voting_date)
+        invalidate_voting_state(voting_date)
+
+    return winning_menu is not None, result
+
+
+def recompute_results(start, end, chunk_days=31, batch_size=500):
+    """
+    Recomputes the ``Result`` of every day from ``start`` to ``end``.
+
+    Days are replayed in chronological order, ``chunk_days`` at a time
+    with one query for the menus and their vote counts, starting from the
+    winning streak of the last result before ``start``. Results are
+    written with ``bulk_create``/``bulk_update`` in one transaction, then
+    the streaks of the results after ``end`` are brought in line.
+    Returns the number of days in the range that have a result.
+
+    Days whose votes were archived are left alone: their menus no longer
+    have the votes to rank them by.
+    """
+    retained_since = votes_retained_since()
+    if retained_since and start < retained_since:
+        start = retained_since
+    if start > end:
+        return 0
+    now = timezone.now()
+    new_results, changed_results = [], []
+
+    with transaction.atomic():
+        run = Result.objects.winning_run(before=start)
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(
+                chunk_start + datetime.timedelta(days=chunk_days - 1), end
+            )
+            menus_per_day = _ranked_menus(chunk_start, chunk_end)
+            results = Result.objects.filter(
+                voting_date__range=(chunk_start, chunk_end)
+            ).in_bulk(field_name='voting_date')
+            for voting_date in sorted(set(menus_per_day) | set(results)):
+                ranked_menus = menus_per_day.get(voting_date, [])
+                _attach_winning_run(ranked_menus, run)
+                winning_menu, _ = pick_winner(ranked_menus)
+                result = results.get(voting_date)
+                if result is None:
+                    if winning_menu is None:
+                        continue
+                    result = Result(voting_date=voting_date)
+                    new_results.append(result)
+                else:
+                    changed_results.append(result)
+                result.winning_menu = winning_menu
+                result.is_voting_stopped = winning_menu is not None
+                result.modified_date = now
+                if winning_menu is None:
+                    result.winning_streak = 0
+                else:
+                    result.winning_streak = next_winning_streak(
+                        run, winning_menu.restaurant_id
+                    )
+                    run = (winning_menu.restaurant_id, result.winning_streak)
+            chunk_start = chunk_end + datetime.timedelta(days=1)
+
+        Result.objects.bulk_create(new_results, batch_size=batch_size)
+        Result.objects.bulk_update(
+            changed_results,
+            [
+                'winning_menu', 'is_voting_stopped', 'winning_streak',
+                'modified_date'
+            ],
+            batch_size=batch_size
+        )
+        Result.objects.rebuild_winning_streaks(
+            end + datetime.timedelta(days=1), run=run
+        )
+        rollup_daily_votes(start, end, chunk_days, batch_size)
+        for result in new_results + changed_results:
+            invalidate_voting_state(result.voting_date)
+        # bulk_create/bulk_update send no signals.
+        invalidate_cached_responses('restaurants', 'menus', 'results')
+        invalidate_menu_snapshots()
+    return len(new_results) + len(changed_results)
+
+
+def _ranked_menus(start, end):
+    """
+    Returns ``{upload_date: [menu, ...]}`` with each day's menus ranked by
+    the votes they actually have, best first.
+    """
     menus = (
         Menu.objects
-        .filter(upload_date=voting_date)
-        .select_related('restaurant')
+        .filter(upload_date__range=(start, end))
+        .annotate(vote_count=Count('votes'))
+        .order_by('upload_date', '-vote_count', 'id')
+        .only('id', 'restaurant_id', 'upload_date')
     )
-    if menus.count() > 0:
-        if (
-            menus[0].restaurant.winning_streak >= 3
-            and menus.count() > 1
+    menus_per_day = {}
+    for menu in menus:
+        menu.restaurant = Restaurant(pk=menu.restaurant_id)
+        menus_per_day.setdefault(menu.upload_date, []).append(menu)
+    return menus_per_day
+
+
+def rollup_daily_votes(start, end, chunk_days=31, batch_size=500):
+    """
+    Rebuilds the ``DailyRestaurantVotes`` rows of ``start`` to ``end``
+    from the menus' vote counters and the published winners, one chunk of
+    ``chunk_days`` days at a time. Returns the number of rows written.
+    """
+    num_of_rows = 0
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(
+            chunk_start + datetime.timedelta(days=chunk_days - 1), end
+        )
+        winners = dict(
+            Result.objects
+            .filter(
+                voting_date__range=(chunk_start, chunk_end),
+                is_voting_stopped=True
+            )
+            .values_list('voting_date', 'winning_menu__restaurant_id')
+        )
+        rows = []
+        rank, previous_date = 0, None
+        for restaurant_id, upload_date, num_of_votes in (
+            Menu.objects
+            .filter(upload_date__range=(chunk_start, chunk_end))
+            .order_by('upload_date', '-num_of_votes', 'id')
+            .values_list('restaurant_id', 'upload_date', 'num_of_votes')
         ):
-            menus[0].restaurant.reset_winning_streak()
-            result.winning_menu = menus[1]
-            menus[1].restaurant.increment_winning_streak()
-        else:
-            result.winning_menu = menus[0]
-            menus[0].restaurant.increment_winning_streak()
-        result.stop_voting()
-        result_updated = True
-    else:
-        result_updated = False
-
-    return result_updated, result
+            rank = rank + 1 if upload_date == previous_date else 1
+            previous_date = upload_date
+            rows.append(DailyRestaurantVotes(
+                restaurant_id=restaurant_id,
+                voting_date=upload_date,
+                num_of_votes=num_of_votes,
+                rank=rank,
+                is_winner=winners.get(upload_date) == restaurant_id
+            ))
+        with transaction.atomic():
+            DailyRestaurantVotes.objects.filter(
+                voting_date__range=(chunk_start, chunk_end)
+            ).delete()
+            DailyRestaurantVotes.objects.bulk_create(
+                rows, batch_size=batch_size
+            )
+        num_of_rows += len(rows)
+        chunk_start = chunk_end + datetime.timedelta(days=1)
+    return num_of_rows